@@ -34,6 +34,9 @@ def get_cfg(cfg):
 def build_system(cfg):
     from src.base.coordinator import Coordinator
 
+    Coordinator.build_executor(executor_config=cfg.executor)
+    Coordinator.build_llm(llm_config=cfg.llm)
+
     planner_agent = Coordinator.build_agent(agent_config=cfg.agent.planner)
     retriever_agent = Coordinator.build_agent(agent_config=cfg.agent.retriever)
     coding_agent = Coordinator.build_agent(agent_config=cfg.agent.coding)
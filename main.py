@@ -13,6 +13,9 @@ find_load_env()
 
 @hydra.main(config_path="configs", config_name="job", version_base=None)
 def main(cfg: DictConfig):
+    Coordinator.build_executor(executor_config=cfg.executor)
+    Coordinator.build_llm(llm_config=cfg.llm)
+
     planner_agent = Coordinator.build_agent(agent_config=cfg.agent.planner)
     retriever_agent = Coordinator.build_agent(agent_config=cfg.agent.retriever)
     coding_agent = Coordinator.build_agent(agent_config=cfg.agent.coding)
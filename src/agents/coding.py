@@ -5,7 +5,7 @@
 import logging
 import os
 from copy import deepcopy
-from typing import Union
+from typing import ClassVar, Optional, Union
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import (
@@ -19,11 +19,13 @@ from langgraph.types import Command, Send
 from typing_extensions import override, Any
 
 from ..base.agent import AgentAsNode
-from ..base.mapping import register
+from ..base.mapping import register, fetch_schema
 from ..base.tool import execute_script, write_script
 from ..base.utils import DirectionRouter
-from ..utils.exception import ScriptWithError, ExceedFixErrorAttempts
+from ..executor import OPEN_BLEND_TEMPLATE, blend_file_for
+from ..utils.exception import ScriptWithError, ExceedFixErrorAttempts, InvalidEdit, PatchNotApplied
 from ..utils.file import load_prompt_template_file
+from ..utils.patch import apply_edits
 from ..utils.types import InputT, OutputT
 
 logger = logging.getLogger(__name__)
@@ -33,6 +35,8 @@ logger = logging.getLogger(__name__)
 class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
     """The Coding Agent class"""
 
+    edit_output_schema: ClassVar[dict] = {'type': 'structured_output', 'name': 'coding_edit'}
+
     @override
     def __init__(
             self,
@@ -53,6 +57,12 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
             # templates
             template_file: str = None,
             fix_error_attempts: int = None,
+            execution: dict = None,
+            save_blend: bool = None,
+            checkpoint_subtasks: bool = None,
+            edit_scripts: bool = None,
+            edit_min_similarity: float = 0.85,
+            batch_solutions: bool = None,
             **kwargs
     ):
         super().__init__(
@@ -80,6 +90,21 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
 
         self.fix_error_attempts = fix_error_attempts
         self.fix_error_tries = 0
+        # limits of executing a generated script, e.g. {'timeout': 60, 'max_rss_mb': 4096}
+        self.execution = dict(execution or {})
+        # save the scene of an error-free script, reused by critic and verification renders
+        self.save_blend = save_blend
+        # generate subtask k+1 as an increment executed on top of the saved scene of subtask k
+        self.checkpoint_subtasks = checkpoint_subtasks
+        # 'improve' and 'fix' return edits of the current script, instead of the whole script
+        self.edit_scripts = edit_scripts
+        self.edit_min_similarity = edit_min_similarity
+        self.edit_chat_model = None
+        if self.use_model and self.edit_scripts:
+            self.edit_chat_model = self._create_chat_model(self.model_name, [fetch_schema(self.edit_output_schema)])
+        self.edit_stats = {'edits': 0, 'fuzzy': 0, 'rewrites': 0}
+        # apply all solutions of an 'improve' call at once, bisect the group when its script has an error
+        self.batch_solutions = batch_solutions
 
         self.copy_state = dict()
 
@@ -93,6 +118,54 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
             **kwargs
     ) -> Union[dict, Command, Send, OutputT]:
         """"""
+        command = self._start_call(state)
+        if command is not None:
+            return command
+
+        # operate on each query (or group of solutions)
+        while True:
+            try:
+                # while generating and executing a script, the error message could be raised
+                script, messages = self._generate(state)
+                break
+            except ScriptWithError as e:
+                if not self._bisect_solutions(state):
+                    return self._on_script_error(state, e)
+
+        return self._finish_query(script, messages)
+
+    @override
+    async def acall(
+            self,
+            state: InputT | dict,
+            runtime: RunnableConfig = None,
+            context: RunnableConfig = None,
+            config: RunnableConfig = None,
+            **kwargs
+    ) -> Union[dict, Command, Send, OutputT]:
+        """"""
+        command = self._start_call(state)
+        if command is not None:
+            return command
+
+        # operate on each query (or group of solutions)
+        while True:
+            try:
+                # while generating and executing a script, the error message could be raised
+                script, messages = await self._agenerate(state)
+                break
+            except ScriptWithError as e:
+                if not self._bisect_solutions(state):
+                    return self._on_script_error(state, e)
+
+        return self._finish_query(script, messages)
+
+    def _start_call(self, state) -> Optional[Send]:
+        """Store the state of an official call, and ask for documents when there are none
+
+        Returns: None | Send
+            The call to the retriever, None when the query can be generated
+        """
         logger.info(self.opening_symbols)
         logger.info(f"Number of messages: {len(state['messages'])}")
 
@@ -107,6 +180,7 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
             self.copy_state.pop('has_docs', None)
             self.copy_state['num_queries'] = len(state['queries'])
             self.copy_state['query_offset'] = 0
+            self.copy_state['batch_size'] = self._initial_batch_size(state)
             self.copy_state['previous_scripts'] = []
             self.get_retrieved_docs = False
         else:
@@ -128,42 +202,61 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
             self.get_retrieved_docs = True
         # inner call this agent must pass above blocks
         # -------------------------------------------------------------------
-        # operate on each query
-        try:
-            # while generating and executing a script, the error message could be raised
-            if state['coding_task'] == 'generate':
-                formatted_prompt = self._prepare_generate_prompt(state)
-            elif state['coding_task'] == "improve":
-                assert 'current_script' in state
-                formatted_prompt = self._prepare_improve_prompt(state)
-            else:
-                assert 'current_script' in state
-                formatted_prompt = self._prepare_fix_prompt(state)
-
-            script, messages = self._generate(formatted_prompt)
-            # ------------error-free--------------------
-            # the generated script is error-free,
-            # it is also an ending point for recursive calls
-            self.copy_state['previous_scripts'].append(script)
-            self.copy_state['current_script'] = script
-            self.copy_state['query_offset'] += 1
-            self.copy_state['messages'] = messages
-
-        except ScriptWithError as e:
-            logger.info('‼️ ‼️ ‼️ ‼️ ‼️ ‼️ ⚠️ ⚠️ ⚠️ ⚠️ ⚠️️ Catch error. Call Retriever ⚠️ ⚠️ ⚠️ ⚠️ ⚠️️ ‼️‼️‼️‼️‼️‼️')
-            self.fix_error_tries += 1
-
-            # Stop graph when over attempts fix error
-            if self.fix_error_tries > self.fix_error_attempts:
-                logger.info(f"Number of tries to fix error exceed allowed attempts ({self.fix_error_attempts})")
-                state['msg'] = f'Cannot fix error after {self.fix_error_attempts}. Try again',
-                raise ExceedFixErrorAttempts(state=state)
-
-            """Recall Coding Agent if catch command when executing script
-            Before fix code, call Retriever Agent to get relevant documents
-            `e.command` is a command call retriever with command and command script.
-            """
-            return e.command
+        return None
+
+    def _initial_batch_size(self, state) -> int:
+        """Number of queries generated at once, all solutions of an 'improve' call in batch mode"""
+        if self.batch_solutions and state['coding_task'] == 'improve':
+            return max(1, len(state['queries']))
+        return 1
+
+    def _bisect_solutions(self, state) -> bool:
+        """Halve the group of solutions whose script has an error, to retry its first half.
+
+        Returns: bool
+            False when the group is a single solution, its error is fixed as usual
+        """
+        batch_size = self.copy_state.get('batch_size', 1)
+        if state['coding_task'] != 'improve' or batch_size <= 1:
+            return False
+
+        self.copy_state['batch_size'] = batch_size // 2
+        logger.info(f"The script of {batch_size} solutions has an error, "
+                    f"retry the first {self.copy_state['batch_size']} of them")
+        return True
+
+    def _on_script_error(self, state, e: ScriptWithError) -> Command:
+        logger.info('‼️ ‼️ ‼️ ‼️ ‼️ ‼️ ⚠️ ⚠️ ⚠️ ⚠️ ⚠️️ Catch error. Call Retriever ⚠️ ⚠️ ⚠️ ⚠️ ⚠️️ ‼️‼️‼️‼️‼️‼️')
+        self.fix_error_tries += 1
+
+        # Stop graph when over attempts fix error
+        if self.fix_error_tries > self.fix_error_attempts:
+            logger.info(f"Number of tries to fix error exceed allowed attempts ({self.fix_error_attempts})")
+            state['msg'] = f'Cannot fix error after {self.fix_error_attempts}. Try again',
+            raise ExceedFixErrorAttempts(state=state)
+
+        """Recall Coding Agent if catch command when executing script
+        Before fix code, call Retriever Agent to get relevant documents
+        `e.command` is a command call retriever with command and command script.
+        """
+        return e.command
+
+    def _finish_query(self, script, messages) -> Command:
+        """Store the error-free script of the current query, then move to the next query or node"""
+        # ------------error-free--------------------
+        # the generated script is error-free,
+        # it is also an ending point for recursive calls
+        incremental = self._is_incremental()
+        self.copy_state['previous_scripts'].append(script)
+        if incremental:
+            # an increment only holds the code of its subtask, the scene is the result of all of them
+            script = self._join_scripts(self.copy_state['previous_scripts'])
+        self.copy_state['current_script'] = script
+        self.copy_state['query_offset'] += self.copy_state.get('batch_size', 1)
+        self.copy_state['messages'] = messages
+        if self._initial_batch_size(self.copy_state) > 1:
+            # the remaining solutions are tried at once again
+            self.copy_state['batch_size'] = max(1, self.copy_state['num_queries'] - self.copy_state['query_offset'])
 
         # reset fix error tries after each query
         self.fix_error_tries = 0
@@ -224,8 +317,8 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
         return formatted_prompt
 
     @override
-    def _prepare_chat_template(self, human_template, *args, **kwargs):
-        return ChatPromptTemplate([self.system_template, human_template])
+    def _prepare_chat_template(self, human_template, *args, system_template=None, **kwargs):
+        return ChatPromptTemplate([system_template or self.system_template, human_template])
 
     @override
     def _prepare_message_templates(self, *args, **kwargs):
@@ -234,6 +327,11 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
             template=template_dict['system_template'],
             template_format='f-string'
         )
+        # increments run on top of the scene of the previous subtasks, without cleaning it nor a main()
+        self.incremental_system_template = SystemMessagePromptTemplate.from_template(
+            template=template_dict.get('incremental_system_template', template_dict['system_template']),
+            template_format='f-string'
+        )
         self.human_generate_template = HumanMessagePromptTemplate.from_template(
             template=template_dict['human_generate_template'],
             template_format="f-string"
@@ -246,9 +344,25 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
             template=template_dict['human_improve_template'],
             template_format="f-string",
         )
+        self.human_generate_incremental_template = HumanMessagePromptTemplate.from_template(
+            template=template_dict.get('human_generate_incremental_template', template_dict['human_generate_template']),
+            template_format="f-string"
+        )
+        self.human_fix_edit_template = HumanMessagePromptTemplate.from_template(
+            template=template_dict.get('human_fix_edit_template', template_dict['human_fix_template']),
+            template_format='f-string',
+        )
+        self.human_improve_edit_template = HumanMessagePromptTemplate.from_template(
+            template=template_dict.get('human_improve_edit_template', template_dict['human_improve_template']),
+            template_format="f-string",
+        )
 
     def _prepare_generate_prompt(self, state):
-        chat_template = self._prepare_chat_template(self.human_generate_template)
+        if self._is_incremental():
+            chat_template = self._prepare_chat_template(
+                self.human_generate_incremental_template, system_template=self.incremental_system_template)
+        else:
+            chat_template = self._prepare_chat_template(self.human_generate_template)
 
         # that's called only when coding_task is 'generate
         # when queries, from both of 'state' and 'copy_state', are subtasks
@@ -267,8 +381,20 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
         # ---------------------------------------------------
         return formatted_prompt
 
-    def _prepare_fix_prompt(self, state):
-        chat_template = self._prepare_chat_template(self.human_fix_template)
+    def _prepare_edit_prompt(self, state):
+        """Prompt asking for edits of the current script, None when the task generates the whole script"""
+        if self.edit_chat_model is None or state['coding_task'] not in ('improve', 'fix'):
+            return None
+        if state['coding_task'] == 'improve':
+            return self._prepare_improve_prompt(state, self.human_improve_edit_template)
+        return self._prepare_fix_prompt(state, self.human_fix_edit_template)
+
+    def _prepare_fix_prompt(self, state, human_template=None):
+        # the error of an increment is fixed in the increment, still executed on top of the scene
+        chat_template = self._prepare_chat_template(
+            human_template or self.human_fix_template,
+            system_template=self.incremental_system_template if self._is_incremental() else None
+        )
 
         logger.info(f"{state['coding_task']}: {self.fix_error_tries}(tries)/{self.fix_error_attempts}(attempts)")
         logger.info(f"error: {state['queries'][0]}")
@@ -281,14 +407,21 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
         # ---------------------------------------------------
         return formatted_prompt
 
-    def _prepare_improve_prompt(self, state):
-        chat_template = self._prepare_chat_template(self.human_improve_template)
-
-        query = state['queries'][self.copy_state['query_offset']]
-        docs = state['retrieved_docs'][self.copy_state['query_offset']]
-
-        logger.info(
-            f"{state['coding_task']}: solution {1 + self.copy_state['query_offset']}/{self.copy_state['num_queries']}")
+    def _prepare_improve_prompt(self, state, human_template=None):
+        chat_template = self._prepare_chat_template(human_template or self.human_improve_template)
+
+        offset = self.copy_state['query_offset']
+        batch_size = self.copy_state.get('batch_size', 1)
+        if batch_size > 1:
+            # all solutions of the group are applied in one script
+            indices = range(offset, min(offset + batch_size, len(state['queries'])))
+            query = '\n'.join(f"{n + 1}. {state['queries'][i]}" for n, i in enumerate(indices))
+            docs = '\n'.join(f"{n + 1}. {state['retrieved_docs'][i]}" for n, i in enumerate(indices))
+            logger.info(f"{state['coding_task']}: solutions {1 + offset}-{indices[-1] + 1}/{self.copy_state['num_queries']}")
+        else:
+            query = state['queries'][offset]
+            docs = state['retrieved_docs'][offset]
+            logger.info(f"{state['coding_task']}: solution {1 + offset}/{self.copy_state['num_queries']}")
         logger.info(f"solution: {query}")
         # ---------------------------------------------------
         formatted_prompt = chat_template.invoke({
@@ -299,41 +432,153 @@ class CodingAgent(AgentAsNode, node_name='Coding', use_model=True):
         # ---------------------------------------------------
         return formatted_prompt
 
-    def _generate(self, formatted_prompt):
-        while True:
-            # ---------------------------Actual generation------------------------------
-            generated_script, messages = self.chat_model_call(formatted_prompt)
-            # --------------------------------------------------------------------------
+    def _generate(self, state):
+        # ---------------------------Actual generation------------------------------
+        generated_script, messages, cache_key = self._write_script(state)
+        # --------------------------------------------------------------------------
+        # call tool to execute script
+        error = execute_script.invoke(self._prepare_execution(generated_script))
 
-            # call tool to write script
-            write_script.invoke({
-                "script": generated_script,
-                "file_path": self.check_error_file
-            })
+        return self._check_execution(generated_script, messages, error, cache_key)
 
-            # call tool to execute script
-            error = execute_script.invoke({'script': self.check_error_file})
-            tool_message = self.create_tool_message(content=error, _id='call_execute_script')
-            messages.append(tool_message)
+    async def _agenerate(self, state):
+        # ---------------------------Actual generation------------------------------
+        generated_script, messages, cache_key = await self._awrite_script(state)
+        # --------------------------------------------------------------------------
+        # call tool to execute script, without blocking the event loop
+        error = await execute_script.ainvoke(self._prepare_execution(generated_script))
 
-            """Log conversation"""
-            self.log_conversation(logger, messages)
-            logger.info(self._used_token_prep())
+        return self._check_execution(generated_script, messages, error, cache_key)
 
-            # no error yielded
-            if 'no error' in error.lower():
-                return generated_script, messages
-            else:
-                # raise the call to 'retriever' agent to fix error
-                raise ScriptWithError(command=DirectionRouter.goto(
-                    state={
-                        'current_script': generated_script,
-                        'coding_task': 'fix',
-                        'queries': [error, ],
-                        'messages': messages
-                    },
-                    node='retriever', method='command'
-                ))
+    def _write_script(self, state):
+        """Edit the current script for 'improve' and 'fix', otherwise, or when the edits do not apply,
+        generate the whole script
+
+        Returns:
+            The script, the messages and the cache key of the response
+        """
+        edit_prompt = self._prepare_edit_prompt(state)
+        if edit_prompt is not None:
+            edits, messages, cache_key = self.chat_model_call(
+                edit_prompt, chat_model=self.edit_chat_model, return_cache_key=True)
+            script = self._apply_edits(state['current_script'], edits, cache_key)
+            if script is not None:
+                return script, messages, cache_key
+
+        return self.chat_model_call(self._prepare_prompt(state), return_cache_key=True)
+
+    async def _awrite_script(self, state):
+        """Async version of ``_write_script``"""
+        edit_prompt = self._prepare_edit_prompt(state)
+        if edit_prompt is not None:
+            edits, messages, cache_key = await self.achat_model_call(
+                edit_prompt, chat_model=self.edit_chat_model, return_cache_key=True)
+            script = self._apply_edits(state['current_script'], edits, cache_key)
+            if script is not None:
+                return script, messages, cache_key
+
+        return await self.achat_model_call(self._prepare_prompt(state), return_cache_key=True)
+
+    def _apply_edits(self, current_script, edits, cache_key=None) -> Optional[str]:
+        """The current script with the edits applied, None when they do not apply"""
+        try:
+            if not edits:
+                raise PatchNotApplied("No edits")
+            script, n_fuzzy = apply_edits(current_script, edits, min_similarity=self.edit_min_similarity)
+        except (PatchNotApplied, InvalidEdit) as e:
+            # e.g. an edit matching nowhere, or edits which are not search/replace pairs
+            logger.info(f"Edits do not apply ({e}), generate the whole script")
+            self._forget_response(cache_key)
+            self.edit_stats['rewrites'] += 1
+            return None
+
+        self.edit_stats['edits'] += 1
+        self.edit_stats['fuzzy'] += n_fuzzy
+        logger.info(f"Apply {len(edits)} edits ({n_fuzzy} fuzzy matched) to the current script. {self.edit_stats}")
+        return script
+
+    def _prepare_execution(self, generated_script) -> dict:
+        """Write the script checking ``generated_script`` for errors
+
+        Returns: dict
+            Input of the ``execute_script`` tool
+        """
+        check_script, full_script, line_offset = self._prepare_check_script(generated_script)
+        # call tool to write script
+        write_script.invoke({
+            "script": check_script,
+            "file_path": self.check_error_file
+        })
+
+        return {
+            'script': self.check_error_file,
+            'save_blend': blend_file_for(full_script) if self.save_blend or self.checkpoint_subtasks else None,
+            # errors are reported against the generated script, not the code executed before it
+            'line_offset': line_offset,
+            **self.execution
+        }
+
+    def _check_execution(self, generated_script, messages, error, cache_key=None):
+        tool_message = self.create_tool_message(content=error, _id='call_execute_script')
+        messages.append(tool_message)
+
+        """Log conversation"""
+        self.log_conversation(logger, messages)
+        logger.info(self._used_token_prep())
+
+        # no error yielded
+        if 'no error' in error.lower():
+            return generated_script, messages
+        else:
+            # the same prompt must not replay a script with error
+            self._forget_response(cache_key)
+            # raise the call to 'retriever' agent to fix error
+            raise ScriptWithError(command=DirectionRouter.goto(
+                state={
+                    'current_script': generated_script,
+                    'coding_task': 'fix',
+                    'queries': [error, ],
+                    'messages': messages
+                },
+                node='retriever', method='command'
+            ))
+
+    def _is_incremental(self):
+        """Whether the current subtask is generated as an increment on top of the previous ones"""
+        return bool(
+            self.checkpoint_subtasks
+            and self.copy_state.get('coding_task') == 'generate'
+            and self.copy_state.get('previous_scripts')
+        )
+
+    def _prepare_check_script(self, script):
+        """Build the script executed to check ``script`` for errors.
+
+        For an increment, it is executed on top of the checkpoint (the saved scene of the previous subtasks).
+        When the checkpoint is missing (e.g. pruned), all subtasks are replayed from scratch.
+
+        Returns:
+            the script to execute, the full script whose scene is saved and the number of lines executed before
+            ``script``
+        """
+        if not self._is_incremental():
+            return script, script, 0
+
+        previous_script = self._join_scripts(self.copy_state['previous_scripts'])
+        full_script = self._join_scripts(self.copy_state['previous_scripts'] + [script])
+        checkpoint = blend_file_for(previous_script)
+        if os.path.isfile(checkpoint):
+            logger.info(f"Execute the increment on top of checkpoint '{checkpoint}'")
+            os.utime(checkpoint)
+            prefix = OPEN_BLEND_TEMPLATE.format(blend_file=os.path.abspath(checkpoint)) + '\n'
+            return prefix + script, full_script, prefix.count('\n')
+
+        logger.info('Checkpoint of previous subtasks not found, replay the full script')
+        return full_script, full_script, self._join_scripts(self.copy_state['previous_scripts'] + ['']).count('\n')
+
+    @staticmethod
+    def _join_scripts(scripts):
+        return '\n\n'.join(scripts)
 
     def _dump_scripts(self, scripts):
         if not scripts:
@@ -2,27 +2,42 @@
 #  Copyright (c) 2025
 #  Minh NGUYEN <vnguyen9@lakeheadu.ca>
 #
+import asyncio
 import glob
+import json
 import logging
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, ClassVar, Iterator, Optional
 
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate, SystemMessagePromptTemplate
 from langgraph.config import RunnableConfig
 from typing_extensions import override
 
 from ..base.agent import AgentAsNode, register
+from ..base.mapping import fetch_schema
 from ..base.utils import DirectionRouter
+from ..executor import OPEN_BLEND_TEMPLATE, blend_file_for, get_render_cache, render_key, submit_script
 from ..utils.constants import (
     DEFAULT_CAMERA_SETTING_FILE,
     DEFAULT_CAPTURE_IMAGE_FILE,
+    DEFAULT_SCENE_SUMMARY_SCRIPT_FILE,
+    SCENE_SUMMARY_FILE,
     SAVE_CRITIC_DIR,
-    DEFAULT_CAMERA_TEMPLATE_FILE
+    DEFAULT_CAMERA_TEMPLATE_FILE,
+    DEFAULT_RENDER_PROFILE
 )
 from ..utils.exception import NoRenderImages
-from ..utils.file import load_image_content
-from ..utils.file import write_script, execute_file
+from ..utils.file import is_image_complete
+from ..utils.image import load_image_payload
+from ..utils.file import load_prompt_template_file, write_script
+from ..utils.process import POLL_INTERVAL
 from ..utils.types import InputT, OutputT
 
 logger = logging.getLogger(__name__)
@@ -32,6 +47,9 @@ logger = logging.getLogger(__name__)
 class CriticAgent(AgentAsNode, node_name='Critic'):
     """The Critic Agent class"""
 
+    summary_output_schema: ClassVar[dict] = {'type': 'structured_output', 'name': 'summary_critic'}
+    """Output schema of the text model reviewing scene summaries"""
+
     def __init__(
             self,
             metadata: dict = None,
@@ -53,6 +71,16 @@ class CriticAgent(AgentAsNode, node_name='Critic'):
             capture_image_file: str = None,
             max_critics: int = None,
             n_rendered_images: Optional[int] = None,
+            execution: dict = None,
+            reuse_blend: bool = None,
+            render_profile: dict = None,
+            final_render_profile: dict = None,
+            max_concurrency: int = None,
+            multi_view: bool = None,
+            image_payload: dict = None,
+            summary_mode: bool = None,
+            summary_model_name: str = None,
+            scene_summary_file: str = None,
             **kwargs
     ):
         super().__init__(
@@ -81,6 +109,30 @@ class CriticAgent(AgentAsNode, node_name='Critic'):
 
         self.max_critics = max_critics
         self.n_rendered_images = n_rendered_images
+        # limits of executing a render script, e.g. {'timeout': 600, 'max_rss_mb': 8192}
+        self.execution = dict(execution or {})
+        # load the scene saved by the coding agent instead of re-executing the creation script
+        self.reuse_blend = reuse_blend
+        # fast preview settings of the renders to critique, e.g. {'engine': 'BLENDER_WORKBENCH', 'resolution_x': 960}
+        self.render_profile = {**DEFAULT_RENDER_PROFILE, **(render_profile or {})}
+        # full quality settings, only for the images returned to the user
+        self.final_render_profile = final_render_profile
+        # number of images critiqued at the same time, calls still go through the rate limiter of the chat model
+        self.max_concurrency = max_concurrency or 1
+        # send all views in one request instead of one request per view
+        self.multi_view = multi_view
+        # how images are prepared for the model, e.g. {'max_side': 1024, 'format': 'JPEG', 'quality': 85}
+        self.image_payload = dict(image_payload or {})
+        # review a text summary of the scene with a cheap text model first, only some views go to the vision model
+        self.summary_mode = summary_mode
+        self.scene_summary_file = scene_summary_file if scene_summary_file else DEFAULT_SCENE_SUMMARY_SCRIPT_FILE
+        self.summary_chat_model = None
+        if self.summary_mode:
+            self.summary_chat_model = self._create_chat_model(
+                summary_model_name or self.model_name, [fetch_schema(self.summary_output_schema)])
+        # the render cache is shared by the process, its hits and misses are counted per session of this agent
+        self.render_cache_hits = 0
+        self.render_cache_misses = 0
         self._make_dirs()
 
     @override
@@ -97,44 +149,57 @@ class CriticAgent(AgentAsNode, node_name='Critic'):
 
         script = state['current_script']
         logger.info("Setup camera to capture images")
-        ready_render_script, save_dir = self._process_script(script)
+        validating_prompt = state.get('validating_prompt', None) or self.validating_prompt
+        logger.info(f"Validating prompt: {validating_prompt}")
 
-        rendered_image_paths = self._run_to_get_rendered_images(ready_render_script, save_dir)[:self.n_rendered_images]
-        if not rendered_image_paths:
-            state['msg'] = f"No image rendered by Critic Agent. Let's try again with a new task."
-            raise NoRenderImages(state=state)
+        if self.summary_mode:
+            rendered_image_paths, critics_solutions_dict, conversation = \
+                self._critique_summary_first(script, validating_prompt)
+        elif self.multi_view:
+            rendered_image_paths, critics_solutions_dict, conversation = \
+                self._critique_all_views(script, validating_prompt)
+        else:
+            rendered_image_paths, critics_solutions_dict, conversation = \
+                self._critique_each_view(script, validating_prompt)
 
-        logger.info(f"Rendered images: {rendered_image_paths}")
+        return self._finish_critique(state, rendered_image_paths, critics_solutions_dict, conversation)
+
+    @override
+    async def acall(
+            self,
+            state: InputT | dict,
+            runtime: RunnableConfig = None,
+            context: RunnableConfig = None,
+            config: RunnableConfig = None,
+            **kwargs
+    ) -> DirectionRouter | OutputT:
+        """"""
+        logger.info(self.opening_symbols)
+
+        script = state['current_script']
+        logger.info("Setup camera to capture images")
         validating_prompt = state.get('validating_prompt', None) or self.validating_prompt
         logger.info(f"Validating prompt: {validating_prompt}")
 
-        critics_solutions_dict = dict()
-        conversation = []
-        solutions = []
-        for i, image in enumerate(rendered_image_paths):
-            # -----------------------------------------------
-            formatted_prompt = self.chat_template.invoke({
-                'image': load_image_content(image),
-                'validating_prompt': validating_prompt,
-                'max_critics': self.max_critics,
-            })
-            response, _messages = self.chat_model_call(formatted_prompt)
-            # -----------------------------------------------
-            critics_solutions_dict[i] = response
-            solutions.extend([d['solution'] for d in response])
-            # -----------------------------------------------
-            logger.info(f"image ({i + 1}/{len(rendered_image_paths)}): {image} - 🟣 🟣 🟣 {len(response)} critics 🟣 🟣 🟣")
+        if self.summary_mode:
+            rendered_image_paths, critics_solutions_dict, conversation = \
+                await self._acritique_summary_first(script, validating_prompt)
+        elif self.multi_view:
+            rendered_image_paths, critics_solutions_dict, conversation = \
+                await self._acritique_all_views(script, validating_prompt)
+        else:
+            rendered_image_paths, critics_solutions_dict, conversation = \
+                await self._acritique_each_view(script, validating_prompt)
 
-            # display image paths in conversation instead of base64 content
-            to_log_messages = [
-                *self.chat_template.invoke({
-                    'image': image,
-                    'validating_prompt': validating_prompt,
-                    'max_critics': self.max_critics,
-                }).to_messages(),
-                _messages[-1]
-            ]
-            conversation = self._extend_conversation(his_conversation=conversation, messages=to_log_messages)
+        return self._finish_critique(state, rendered_image_paths, critics_solutions_dict, conversation)
+
+    def _finish_critique(self, state, rendered_image_paths: list[str], critics_solutions_dict: dict, conversation):
+        solutions = [d['solution'] for response in critics_solutions_dict.values() for d in response]
+
+        if not rendered_image_paths:
+            state['msg'] = f"No image rendered by Critic Agent. Let's try again with a new task."
+            raise NoRenderImages(state=state)
+        logger.info(f"Rendered images: {rendered_image_paths}")
 
         logger.info(f"Solutions by Critic: {len(solutions)} -- {solutions}")
 
@@ -153,10 +218,362 @@ class CriticAgent(AgentAsNode, node_name='Critic'):
 
         return DirectionRouter.goto(state=update_state, node='coding', method='command')
 
+    def _critique_each_view(self, script: str, validating_prompt: str) -> (list[str], dict, list):
+        """Critique every rendered image in its own request
+
+        Returns:
+            rendered images, critics and solutions keyed by view index, conversation
+        """
+        rendered_image_paths = []
+        critics_solutions_dict = dict()
+        conversation = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='critic') as executor:
+            # critique every image as soon as it is rendered, while the next cameras are still rendering
+            futures = []
+            for image in islice(self._stream_rendered_images(script), self.n_rendered_images):
+                rendered_image_paths.append(image)
+                futures.append(executor.submit(self._critique_image, image, validating_prompt))
+
+            # assemble in camera order
+            for i, (image, future) in enumerate(zip(rendered_image_paths, futures)):
+                response, to_log_messages = future.result()
+                critics_solutions_dict[i] = response
+                logger.info(f"image ({i + 1}/{len(rendered_image_paths)}): {image} - 🟣 🟣 🟣 {len(response)} critics 🟣 🟣 🟣")
+                conversation = self._extend_conversation(his_conversation=conversation, messages=to_log_messages)
+
+        return rendered_image_paths, critics_solutions_dict, conversation
+
+    async def _acritique_each_view(self, script: str, validating_prompt: str) -> (list[str], dict, list):
+        """Async version of ``_critique_each_view``"""
+        rendered_image_paths = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = []
+        # critique every image as soon as it is rendered, while the next cameras are still rendering
+        async for image in self._astream_rendered_images(script):
+            rendered_image_paths.append(image)
+            tasks.append(asyncio.create_task(self._acritique_image(image, validating_prompt, semaphore)))
+            if self.n_rendered_images and len(rendered_image_paths) >= self.n_rendered_images:
+                break
+
+        critics_solutions_dict = dict()
+        conversation = []
+        # assemble in camera order
+        for i, (image, (response, to_log_messages)) in enumerate(zip(rendered_image_paths, await asyncio.gather(*tasks))):
+            critics_solutions_dict[i] = response
+            logger.info(f"image ({i + 1}/{len(rendered_image_paths)}): {image} - 🟣 🟣 🟣 {len(response)} critics 🟣 🟣 🟣")
+            conversation = self._extend_conversation(his_conversation=conversation, messages=to_log_messages)
+
+        return rendered_image_paths, critics_solutions_dict, conversation
+
+    def _critique_all_views(self, script: str, validating_prompt: str) -> (list[str], dict, list):
+        """Critique all rendered images in a single request, every critic is tagged by its view index
+
+        Returns:
+            rendered images, critics and solutions keyed by view index, conversation
+        """
+        rendered_image_paths = self._render(script)[:self.n_rendered_images]
+        if not rendered_image_paths:
+            return rendered_image_paths, dict(), []
+
+        critics_solutions_dict, conversation = self._critique_views_at_once(
+            rendered_image_paths, range(len(rendered_image_paths)), validating_prompt)
+        return rendered_image_paths, critics_solutions_dict, conversation
+
+    async def _acritique_all_views(self, script: str, validating_prompt: str) -> (list[str], dict, list):
+        """Async version of ``_critique_all_views``"""
+        rendered_image_paths = (await self._arender(script))[:self.n_rendered_images]
+        if not rendered_image_paths:
+            return rendered_image_paths, dict(), []
+
+        critics_solutions_dict, conversation = await self._acritique_views_at_once(
+            rendered_image_paths, range(len(rendered_image_paths)), validating_prompt)
+        return rendered_image_paths, critics_solutions_dict, conversation
+
+    def _critique_summary_first(self, script: str, validating_prompt: str) -> (list[str], dict, list):
+        """Review the scene summary with the text model, then critique on images only the views it escalates
+
+        Returns:
+            rendered images, critics and solutions keyed by view index, conversation
+        """
+        rendered_image_paths = self._render(script)[:self.n_rendered_images]
+        if not rendered_image_paths:
+            return rendered_image_paths, dict(), []
+
+        formatted_prompt = self._prepare_summary_prompt(rendered_image_paths, validating_prompt)
+        review, conversation = None, []
+        if formatted_prompt is not None:
+            # -----------------------------------------------
+            review, conversation = self.chat_model_call(formatted_prompt, chat_model=self.summary_chat_model)
+            # -----------------------------------------------
+        critics_solutions_dict, escalate_views = self._collect_summary_review(review, len(rendered_image_paths))
+
+        if escalate_views:
+            if self.multi_view:
+                image_critics, image_conversation = self._critique_views_at_once(
+                    rendered_image_paths, escalate_views, validating_prompt)
+            else:
+                image_critics, image_conversation = self._critique_views_concurrently(
+                    rendered_image_paths, escalate_views, validating_prompt)
+            for i in escalate_views:
+                critics_solutions_dict[i].extend(image_critics.get(i, []))
+            conversation = self._extend_conversation(his_conversation=conversation, messages=image_conversation)
+
+        return rendered_image_paths, critics_solutions_dict, conversation
+
+    async def _acritique_summary_first(self, script: str, validating_prompt: str) -> (list[str], dict, list):
+        """Async version of ``_critique_summary_first``"""
+        rendered_image_paths = (await self._arender(script))[:self.n_rendered_images]
+        if not rendered_image_paths:
+            return rendered_image_paths, dict(), []
+
+        formatted_prompt = self._prepare_summary_prompt(rendered_image_paths, validating_prompt)
+        review, conversation = None, []
+        if formatted_prompt is not None:
+            # -----------------------------------------------
+            review, conversation = await self.achat_model_call(formatted_prompt, chat_model=self.summary_chat_model)
+            # -----------------------------------------------
+        critics_solutions_dict, escalate_views = self._collect_summary_review(review, len(rendered_image_paths))
+
+        if escalate_views:
+            if self.multi_view:
+                image_critics, image_conversation = await self._acritique_views_at_once(
+                    rendered_image_paths, escalate_views, validating_prompt)
+            else:
+                image_critics, image_conversation = await self._acritique_views_concurrently(
+                    rendered_image_paths, escalate_views, validating_prompt)
+            for i in escalate_views:
+                critics_solutions_dict[i].extend(image_critics.get(i, []))
+            conversation = self._extend_conversation(his_conversation=conversation, messages=image_conversation)
+
+        return rendered_image_paths, critics_solutions_dict, conversation
+
+    def _prepare_summary_prompt(self, images: list[str], validating_prompt: str) -> Optional[ChatPromptValue]:
+        """The prompt reviewing the scene summary, None when there is no summary"""
+        scene_summary = self._load_scene_summary(images)
+        if scene_summary is None:
+            logger.warning("No scene summary, critique all views on images")
+            return None
+
+        return self.summary_chat_template.invoke({
+            'scene_summary': scene_summary,
+            'validating_prompt': validating_prompt,
+            'max_critics': self.max_critics,
+        })
+
+    def _collect_summary_review(self, review: Optional[dict], n_views: int) -> (dict, list[int]):
+        """Critics by view index and views escalated to images, all views are escalated without any review"""
+        if review is None:
+            critics_solutions_dict = {i: [] for i in range(n_views)}
+            escalate_views = list(range(n_views))
+        else:
+            # views neither critiqued nor escalated are judged fine from the summary
+            critics_solutions_dict = {i: [] for i in range(n_views)}
+            critics_solutions_dict.update(self._group_by_view(review['critic_solution_list'], range(n_views)))
+            escalate_views = sorted({v for v in review['escalate_views'] if isinstance(v, int) and 0 <= v < n_views})
+        logger.info(f"Critics from the scene summary: "
+                    f"{sum(len(v) for v in critics_solutions_dict.values())}, views escalated to images: {escalate_views}")
+
+        return critics_solutions_dict, escalate_views
+
+    def _critique_views_concurrently(self, images: list[str], indices, validating_prompt: str) -> (dict, list):
+        """Critique the images of ``indices``, one request per image
+
+        Returns:
+            critics and solutions keyed by view index, conversation
+        """
+        critics_solutions_dict = dict()
+        conversation = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='critic') as executor:
+            futures = {i: executor.submit(self._critique_image, images[i], validating_prompt) for i in indices}
+            # assemble in camera order
+            for i, future in futures.items():
+                response, to_log_messages = future.result()
+                critics_solutions_dict[i] = response
+                logger.info(f"image ({i + 1}/{len(images)}): {images[i]} - 🟣 🟣 🟣 {len(response)} critics 🟣 🟣 🟣")
+                conversation = self._extend_conversation(his_conversation=conversation, messages=to_log_messages)
+
+        return critics_solutions_dict, conversation
+
+    async def _acritique_views_concurrently(self, images: list[str], indices, validating_prompt: str) \
+            -> (dict, list):
+        """Async version of ``_critique_views_concurrently``"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._acritique_image(images[i], validating_prompt, semaphore) for i in indices))
+
+        critics_solutions_dict = dict()
+        conversation = []
+        # assemble in camera order
+        for i, (response, to_log_messages) in zip(indices, results):
+            critics_solutions_dict[i] = response
+            logger.info(f"image ({i + 1}/{len(images)}): {images[i]} - 🟣 🟣 🟣 {len(response)} critics 🟣 🟣 🟣")
+            conversation = self._extend_conversation(his_conversation=conversation, messages=to_log_messages)
+
+        return critics_solutions_dict, conversation
+
+    def _critique_views_at_once(self, images: list[str], indices, validating_prompt: str) -> (dict, list):
+        """Critique the images of ``indices`` in a single request
+
+        Returns:
+            critics and solutions keyed by view index, conversation
+        """
+        text, views = self._prepare_multi_view_request(images, indices, validating_prompt)
+        # -----------------------------------------------
+        response, _messages = self.chat_model_call(self._prepare_multi_view_prompt(text, views))
+        # -----------------------------------------------
+        critics_solutions_dict, conversation = self._collect_multi_view_critique(
+            images, indices, text, views, response, _messages)
+
+        missing = [i for i in indices if i not in critics_solutions_dict]
+        if missing:
+            # views the model did not answer for are critiqued on their own
+            missing_critics, missing_conversation = self._critique_views_concurrently(images, missing, validating_prompt)
+            critics_solutions_dict.update(missing_critics)
+            conversation = self._extend_conversation(his_conversation=conversation, messages=missing_conversation)
+        return dict(sorted(critics_solutions_dict.items())), conversation
+
+    async def _acritique_views_at_once(self, images: list[str], indices, validating_prompt: str) -> (dict, list):
+        """Async version of ``_critique_views_at_once``"""
+        text, views = self._prepare_multi_view_request(images, indices, validating_prompt)
+        # -----------------------------------------------
+        response, _messages = await self.achat_model_call(self._prepare_multi_view_prompt(text, views))
+        # -----------------------------------------------
+        critics_solutions_dict, conversation = self._collect_multi_view_critique(
+            images, indices, text, views, response, _messages)
+
+        missing = [i for i in indices if i not in critics_solutions_dict]
+        if missing:
+            # views the model did not answer for are critiqued on their own
+            missing_critics, missing_conversation = await self._acritique_views_concurrently(
+                images, missing, validating_prompt)
+            critics_solutions_dict.update(missing_critics)
+            conversation = self._extend_conversation(his_conversation=conversation, messages=missing_conversation)
+        return dict(sorted(critics_solutions_dict.items())), conversation
+
+    def _prepare_multi_view_request(self, images: list[str], indices, validating_prompt: str) \
+            -> (str, list[tuple[str, str]]):
+        text = self.human_multi_view_template.format(
+            n_views=len(indices),
+            view_indices=', '.join(str(i) for i in indices),
+            validating_prompt=validating_prompt,
+            max_critics=self.max_critics,
+        )
+        views = [(f"View {i}:", images[i]) for i in indices]
+        return text, views
+
+    def _collect_multi_view_critique(self, images: list[str], indices, text: str, views: list[tuple[str, str]],
+                                     response: list[dict], _messages: list) -> (dict, list):
+        critics_solutions_dict = self._group_by_view(response, indices)
+        for i in indices:
+            if i not in critics_solutions_dict:
+                logger.warning(f"image ({i + 1}/{len(images)}): {images[i]} - no answer, critique it on its own")
+                continue
+            logger.info(f"image ({i + 1}/{len(images)}): {images[i]} - 🟣 🟣 🟣 "
+                        f"{len(critics_solutions_dict[i])} critics 🟣 🟣 🟣")
+
+        # display image paths in conversation instead of base64 content
+        conversation = [*self._prepare_multi_view_prompt(text, views, load=False).to_messages(), _messages[-1]]
+        return critics_solutions_dict, conversation
+
+    @staticmethod
+    def _load_scene_summary(images: list[str]) -> Optional[str]:
+        """The scene summary written next to rendered images"""
+        if not images:
+            return None
+        try:
+            with open(os.path.join(os.path.dirname(images[0]), SCENE_SUMMARY_FILE), mode='r') as f:
+                # compact, it is sent to the model
+                return json.dumps(json.load(f), separators=(',', ':'))
+        except (OSError, ValueError):
+            return None
+
+    def _prepare_multi_view_prompt(self, text: str, views: list[tuple[str, str]], load: bool = True) \
+            -> ChatPromptValue:
+        """A single human message holding the text, then every image after its label
+
+        Args:
+            text (str): Instruction of the request
+            views (list[tuple[str, str]]): (label, image path) pairs
+            load (bool): Send the base64 content of images, otherwise their paths (to log)
+        """
+        content = [{'type': 'text', 'text': text}]
+        for label, image in views:
+            url = self._load_image(image) if load else image
+            content.append({'type': 'text', 'text': label})
+            content.append({'type': 'image_url', 'image_url': {'url': url}})
+
+        return ChatPromptValue(messages=[self.system_template.format(), HumanMessage(content=content)])
+
+    @staticmethod
+    def _group_by_view(response: list[dict], views) -> dict[int, list[dict]]:
+        """Group a multi view response by the view index of every item.
+        Items without a view of ``views`` are dropped, views without any item are missing from the result
+        """
+        grouped = dict()
+        for d in response:
+            view = d.pop('view', None)
+            if not isinstance(view, int) or view not in views:
+                logger.warning(f"Invalid view index {view} of {d}, drop it")
+                continue
+            grouped.setdefault(view, []).append(d)
+
+        return grouped
+
+    def _critique_image(self, image: str, validating_prompt: str) -> (list[dict], list):
+        """Critique one rendered image
+
+        Returns:
+            critics and solutions, messages to log (image path instead of base64 content)
+        """
+        # -----------------------------------------------
+        formatted_prompt = self._prepare_critique_prompt(image, validating_prompt)
+        response, _messages = self.chat_model_call(formatted_prompt)
+        # -----------------------------------------------
+        # display image paths in conversation instead of base64 content
+        to_log_messages = [*self._prepare_critique_prompt(image, validating_prompt, load=False).to_messages(),
+                           _messages[-1]]
+        return response, to_log_messages
+
+    async def _acritique_image(self, image: str, validating_prompt: str, semaphore: asyncio.Semaphore) \
+            -> (list[dict], list):
+        """Async version of ``_critique_image``, at most ``max_concurrency`` requests at the same time"""
+        async with semaphore:
+            # -----------------------------------------------
+            formatted_prompt = self._prepare_critique_prompt(image, validating_prompt)
+            response, _messages = await self.achat_model_call(formatted_prompt)
+            # -----------------------------------------------
+        to_log_messages = [*self._prepare_critique_prompt(image, validating_prompt, load=False).to_messages(),
+                           _messages[-1]]
+        return response, to_log_messages
+
+    def _prepare_critique_prompt(self, image: str, validating_prompt: str, load: bool = True) -> ChatPromptValue:
+        return self.chat_template.invoke({
+            'image': self._load_image(image) if load else image,
+            'validating_prompt': validating_prompt,
+            'max_critics': self.max_critics,
+        })
+
+    def _load_image(self, image: str) -> str:
+        """The data URL of an image sent to the model"""
+        return load_image_payload(image, **self.image_payload)
+
+    @override
+    def _prepare_message_templates(self, *args, **kwargs):
+        super()._prepare_message_templates(*args, **kwargs)
+        template_dict = load_prompt_template_file(self.template_file)
+        self.human_multi_view_template = template_dict.get('human_multi_view_template', None)
+        self.summary_chat_template = None
+        if 'human_summary_template' in template_dict:
+            self.summary_chat_template = ChatPromptTemplate([
+                SystemMessagePromptTemplate.from_template(
+                    template=template_dict['summary_system_template'], template_format='f-string'),
+                HumanMessagePromptTemplate.from_template(
+                    template=template_dict['human_summary_template'], template_format='f-string'),
+            ])
+
     def check_critic_fixes(self, critic_fixes: list[dict]):
         raise NotImplementedError
 
-    def _process_script(self, script):
+    def _process_script(self, script, render_profile: dict = None):
         with open(self.camera_setting_file, mode='r') as f:
             camera_setting = f.read()
         with open(self.capture_image_file, mode='r') as f:
@@ -167,25 +584,161 @@ class CriticAgent(AgentAsNode, node_name='Critic'):
 
         camera_setting = camera_setting.replace("{{camera_template_file}}", self.camera_template_file)
         camera_setting = camera_setting.replace("{{save_dir}}", save_dir)
+        camera_setting = camera_setting.replace("{{render_profile}}", repr(render_profile or self.render_profile))
+
+        blend_file = blend_file_for(script) if self.reuse_blend else None
+        if blend_file and os.path.isfile(blend_file):
+            logger.info(f"Reuse the scene saved in '{blend_file}'")
+            # keep it as recently used
+            os.utime(blend_file)
+            creation = OPEN_BLEND_TEMPLATE.format(blend_file=os.path.abspath(blend_file))
+        else:
+            creation = script
 
         combined_script = self.combined_script_template.format(
-            creation=script,
+            creation=creation,
             camera_setting=camera_setting,
             capture=capture
         )
+        if self.summary_mode:
+            # after capturing, a failure of the summary never loses images
+            with open(self.scene_summary_file, mode='r') as f:
+                scene_summary = f.read()
+            scene_summary = scene_summary.replace(
+                "{{scene_summary_file}}", os.path.join(save_dir, SCENE_SUMMARY_FILE))
+            combined_script += "\n\n" + scene_summary
 
         return combined_script, save_dir
 
-    def _run_to_get_rendered_images(self, script: str, save_dir):
+    def _render(self, script: str, render_profile: dict = None) -> list[str]:
+        """Render images of a creation script and wait for all of them
+
+        Returns: list[str]
+            sorted image paths
+        """
+        return list(self._stream_rendered_images(script, render_profile=render_profile))
+
+    async def _arender(self, script: str, render_profile: dict = None) -> list[str]:
+        """Async version of ``_render``"""
+        return [image async for image in self._astream_rendered_images(script, render_profile=render_profile)]
+
+    def _stream_rendered_images(self, script: str, render_profile: dict = None) -> Iterator[str]:
+        """Render images of a creation script, or take them from the render cache.
+        Every image is yielded, in camera order, as soon as it is completely written.
+
+        Args:
+            script (str): The creation script
+            render_profile (dict): Render settings. Default to ``render_profile`` of the agent
+        """
+        cached_images, future, save_dir = self._start_render(script, render_profile=render_profile)
+        if future is None:
+            yield from cached_images
+            return
+
+        yielded = set()
+        while True:
+            done = future.done()
+            yield from self._collect_rendered_images(save_dir, done, yielded)
+            if done:
+                return
+            time.sleep(POLL_INTERVAL)
+
+    async def _astream_rendered_images(self, script: str, render_profile: dict = None) -> AsyncIterator[str]:
+        """Async version of ``_stream_rendered_images``, the event loop is not blocked while rendering"""
+        cached_images, future, save_dir = self._start_render(script, render_profile=render_profile)
+        if future is None:
+            for image in cached_images:
+                yield image
+            return
+
+        yielded = set()
+        while True:
+            done = future.done()
+            for image in self._collect_rendered_images(save_dir, done, yielded):
+                yield image
+            if done:
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def _start_render(self, script: str, render_profile: dict = None) -> (list[str], Optional[Future], str):
+        """Take images from the render cache, or submit the render
+
+        Returns:
+            cached images, the future of the render (None on a cache hit), directory of images
+        """
+        render_profile = render_profile or self.render_profile
+        ready_render_script, save_dir = self._process_script(script, render_profile=render_profile)
+
+        cache = get_render_cache()
+        cache_key = None
+        if cache is not None:
+            with open(self.camera_template_file, mode='r') as f:
+                # entries rendered with and without the scene summary differ
+                cache_key = render_key(script, f.read(), {**render_profile, 'scene_summary': bool(self.summary_mode)})
+            rendered_image_paths = cache.get(cache_key, save_dir)
+            if rendered_image_paths:
+                self.render_cache_hits += 1
+            else:
+                self.render_cache_misses += 1
+            logger.info(f"Render cache {'hit' if rendered_image_paths else 'miss'}, "
+                        f"{self._render_cache_prep()} (process: {cache.stats()})")
+            if rendered_image_paths:
+                # the scene summary is cached with images
+                return [path for path in rendered_image_paths if path.endswith('.png')], None, save_dir
+
+        return [], self._submit_render(ready_render_script, save_dir, cache_key=cache_key), save_dir
+
+    @staticmethod
+    def _collect_rendered_images(save_dir: str, done: bool, yielded: set) -> list[str]:
+        """Images completely written since the last collection, in camera order"""
+        images = []
+        for image in sorted(glob.glob(fr"{save_dir}/*.png")):
+            if image in yielded:
+                continue
+            # cameras are rendered one by one, wait for the current one to keep the order
+            if not done and not is_image_complete(image):
+                break
+            yielded.add(image)
+            images.append(image)
+
+        return images
+
+    def _submit_render(self, script: str, save_dir: str, cache_key: str = None) -> Future:
         logger.info(f'Write rendered-ready script to "{self.anchor_script_path}"')
         write_script(script, self.anchor_script_path)
         logger.info(f"Execute '{self.anchor_script_path}' to capture images.")
-        execute_file(script_path=self.anchor_script_path)
+        future = submit_script(script_path=self.anchor_script_path, **self.execution)
+        # the render may still be running when the caller stops consuming images
+        future.add_done_callback(lambda f: self._on_render_done(f, save_dir, cache_key))
+        return future
+
+    @staticmethod
+    def _on_render_done(future: Future, save_dir: str, cache_key: str = None):
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"Render failed: {e}")
+            return
+        if result['killed'] or result['returncode'] != 0 or result.get('exception'):
+            logger.warning(result['error'])
+            # images of a killed or crashed render may be incomplete
+            return
 
-        rendered_image_paths = glob.glob(fr"{save_dir}/*.png")
-        rendered_image_paths.sort()
+        rendered_files = sorted(glob.glob(fr"{save_dir}/*.png"))
+        scene_summary_path = os.path.join(save_dir, SCENE_SUMMARY_FILE)
+        if rendered_files and os.path.isfile(scene_summary_path):
+            rendered_files.append(scene_summary_path)
+        if cache_key and rendered_files:
+            get_render_cache().put(cache_key, rendered_files)
 
-        return rendered_image_paths
+    def _render_cache_prep(self) -> str:
+        lookups = self.render_cache_hits + self.render_cache_misses
+        hit_rate = self.render_cache_hits / lookups if lookups else 0.
+        return f"session hit rate: {hit_rate:.0%} ({self.render_cache_hits} hits, {self.render_cache_misses} misses)"
+
+    @override
+    def _used_token_prep(self):
+        return f"{super()._used_token_prep()}, Render cache: {self._render_cache_prep()}"
 
     def _make_dirs(self):
         par = Path(self.anchor_script_path).parent
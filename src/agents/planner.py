@@ -94,3 +94,16 @@ class PlannerAgent(AgentAsNode, node_name='Planner', use_model=True):
 
         # direct 'coding' agent to generate scripts
         return DirectionRouter.goto(state=update_state, node='coding', method='command')
+
+    @override
+    async def acall(
+            self,
+            state: PlannerState | dict,
+            runtime: RunnableConfig = None,
+            context: RunnableConfig = None,
+            config: RunnableConfig = None,
+            **kwargs
+    ) -> OutputT | Command[Literal['coding']]:
+        """"""
+        # no I/O while the subtasks are not delegated by the chat model
+        return self.__call__(state, runtime, context, config, **kwargs)
@@ -2,18 +2,26 @@
 #  Copyright (c) 2025
 #  Minh NGUYEN <vnguyen9@lakeheadu.ca>
 #
+import asyncio
 import logging
-from typing import Any, Literal, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, ClassVar, Literal, Union
 
+import numpy as np
 from langchain_community.embeddings import GPT4AllEmbeddings
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+from langchain_core.documents import Document
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 from langgraph.config import RunnableConfig
 from langgraph.runtime import Runtime
 from langgraph.types import Command
 from typing_extensions import override
 
 from ..base.agent import AgentAsNode, register
+from ..base.mapping import fetch_schema
 from ..base.utils import DirectionRouter
+from ..utils.file import load_prompt_template_file
 from ..utils.types import InputT, OutputT
 
 logger = logging.getLogger(__name__)
@@ -23,6 +31,8 @@ logger = logging.getLogger(__name__)
 class RetrieverAgent(AgentAsNode, node_name="Retriever", use_model=True):
     """The Retriever Agent class"""
 
+    batch_output_schema: ClassVar[dict] = {'type': 'structured_output', 'name': 'retriever_batch'}
+
     def __init__(
             self,
             metadata: dict = None,
@@ -34,6 +44,8 @@ class RetrieverAgent(AgentAsNode, node_name="Retriever", use_model=True):
             n_docs: int = None,
             db_path: str = None,
             template_file: str = None,
+            batch_summaries: bool = None,
+            max_concurrency: int = None,
             **kwargs
     ):
         super().__init__(
@@ -46,6 +58,12 @@ class RetrieverAgent(AgentAsNode, node_name="Retriever", use_model=True):
             **kwargs,
         )
         self._prepare_chat_template()
+        # summarize all queries in a single call, otherwise ``max_concurrency`` calls at the same time
+        self.batch_summaries = batch_summaries
+        self.max_concurrency = max_concurrency or 1
+        self.batch_chat_model = None
+        if self.use_model and self.batch_summaries:
+            self.batch_chat_model = self._create_chat_model(self.model_name, [fetch_schema(self.batch_output_schema)])
 
         gpt4all_kwargs = {'allow_download': 'True'}
         self.embedding = GPT4AllEmbeddings(
@@ -56,6 +74,7 @@ class RetrieverAgent(AgentAsNode, node_name="Retriever", use_model=True):
 
         logger.info(f'Load vectorstore in "{db_path}"')
         self.db_path = db_path
+        self.n_docs = n_docs
         self.db = FAISS.load_local(
             folder_path=self.db_path,
             embeddings=self.embedding,
@@ -68,6 +87,21 @@ class RetrieverAgent(AgentAsNode, node_name="Retriever", use_model=True):
 
         # self.chain = RunnableLambda(self._retrieve) | self.chat_template | self.chat_model
 
+    @override
+    def _prepare_message_templates(self, *args, **kwargs):
+        super()._prepare_message_templates(*args, **kwargs)
+        templates_dict = load_prompt_template_file(self.template_file)
+        self.batch_chat_template = ChatPromptTemplate(
+            messages=[
+                self.system_template,
+                HumanMessagePromptTemplate.from_template(
+                    template=templates_dict.get('human_batch_template', """{queries}"""),
+                    template_format='f-string',
+                ),
+            ],
+            template_format='f-string',
+        )
+
     @override
     def __call__(
             self,
@@ -80,21 +114,124 @@ class RetrieverAgent(AgentAsNode, node_name="Retriever", use_model=True):
         """"""
         logger.info(self.opening_symbols)
 
-        conversation = []
+        queries = state['queries']
+        docs_list = self._retrieve_all(state)
+
         retrieved_docs: dict[int, list] = dict()
+        conversation = []
+        if self._summarizes_at_once(queries):
+            summaries, _messages = self.chat_model_call(
+                self._prepare_batch_prompt(queries, docs_list), chat_model=self.batch_chat_model)
+            retrieved_docs = self._collect_batch_summaries(summaries, len(queries))
+            conversation = self._extend_conversation(messages=_messages, his_conversation=conversation)
+
+        # queries are independent, the ones missing from a single call are summarized on their own
+        missing = [i for i in range(len(queries)) if i not in retrieved_docs]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='retriever') as executor:
+            results = list(executor.map(lambda i: self._summarize(queries[i], docs_list[i]), missing))
 
-        for i, query in enumerate(state['queries']):
-            separator = '\n' if state['coding_task'] == 'fix' else ''
-            logger.info(f"query {i + 1}/{len(state['queries'])}: {separator}{query}")
-            docs = self.retrieving_engine.invoke(query)
-            # -------------------------------------------------
-            formatted_template = self.chat_template.invoke({'query': query, 'retrieved_docs': docs})
-            summary, _messages = self.chat_model_call(formatted_template)
-            # -------------------------------------------------
+        for i, (summary, _messages) in zip(missing, results):
             retrieved_docs[i] = summary
+            conversation = self._extend_conversation(messages=_messages, his_conversation=conversation)
+
+        return self._finish_retrieval(state, dict(sorted(retrieved_docs.items())), conversation)
+
+    @override
+    async def acall(
+            self,
+            state: InputT | dict,
+            runtime: Runtime[RunnableConfig] = None,
+            context: Runtime[RunnableConfig] = None,
+            config: RunnableConfig = None,
+            **kwargs
+    ) -> Union[OutputT, Command[Literal['coding']], OutputT]:
+        """"""
+        logger.info(self.opening_symbols)
+
+        queries = state['queries']
+        # embedding and searching are CPU bound
+        docs_list = await asyncio.to_thread(self._retrieve_all, state)
 
+        retrieved_docs: dict[int, list] = dict()
+        conversation = []
+        if self._summarizes_at_once(queries):
+            summaries, _messages = await self.achat_model_call(
+                self._prepare_batch_prompt(queries, docs_list), chat_model=self.batch_chat_model)
+            retrieved_docs = self._collect_batch_summaries(summaries, len(queries))
             conversation = self._extend_conversation(messages=_messages, his_conversation=conversation)
 
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def summarize(i):
+            async with semaphore:
+                return await self._asummarize(queries[i], docs_list[i])
+
+        # queries are independent, summarize them concurrently
+        missing = [i for i in range(len(queries)) if i not in retrieved_docs]
+        results = await asyncio.gather(*(summarize(i) for i in missing))
+
+        for i, (summary, _messages) in zip(missing, results):
+            retrieved_docs[i] = summary
+            conversation = self._extend_conversation(messages=_messages, his_conversation=conversation)
+
+        return self._finish_retrieval(state, dict(sorted(retrieved_docs.items())), conversation)
+
+    def _retrieve_all(self, state) -> list[list[Document]]:
+        """Retrieve the documents of all queries, embedded in one batch and searched together in the index"""
+        queries = state['queries']
+        separator = '\n' if state['coding_task'] == 'fix' else ''
+        for i, query in enumerate(queries):
+            logger.info(f"query {i + 1}/{len(queries)}: {separator}{query}")
+        if not queries:
+            return []
+
+        vectors = np.asarray(self.embedding.embed_documents(list(queries)), dtype=np.float32)
+        if self.db._normalize_L2:
+            dependable_faiss_import().normalize_L2(vectors)
+        _, indices = self.db.index.search(vectors, self.n_docs)
+
+        docs_list = []
+        for row in indices:
+            # -1 when the index has fewer documents than requested
+            docs = [self.db.docstore.search(self.db.index_to_docstore_id[j]) for j in row if j != -1]
+            docs_list.append([doc for doc in docs if isinstance(doc, Document)])
+        return docs_list
+
+    def _summarizes_at_once(self, queries) -> bool:
+        return self.batch_chat_model is not None and len(queries) > 1
+
+    def _prepare_batch_prompt(self, queries, docs_list):
+        queries_string = '\n'.join(
+            f"  - Index: {i}\n    - Query: {query}\n    - Retrieved docs: {docs}"
+            for i, (query, docs) in enumerate(zip(queries, docs_list))
+        )
+        return self.batch_chat_template.invoke({'queries': queries_string})
+
+    def _collect_batch_summaries(self, summaries, n_queries) -> dict[int, str]:
+        """Summaries of a single call keyed by query index, invalid indices are dropped"""
+        retrieved_docs = dict()
+        for summary in summaries or []:
+            try:
+                index = int(summary['index'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < n_queries and index not in retrieved_docs:
+                retrieved_docs[index] = summary.get('summary', '')
+
+        if len(retrieved_docs) < n_queries:
+            logger.info(f"{n_queries - len(retrieved_docs)} queries are missing from the single summary call, "
+                        f"summarize them on their own")
+        return retrieved_docs
+
+    def _summarize(self, query, docs):
+        formatted_template = self.chat_template.invoke({'query': query, 'retrieved_docs': docs})
+        return self.chat_model_call(formatted_template)
+
+    async def _asummarize(self, query, docs):
+        formatted_template = self.chat_template.invoke({'query': query, 'retrieved_docs': docs})
+        return await self.achat_model_call(formatted_template)
+
+    def _finish_retrieval(self, state, retrieved_docs: dict[int, list], conversation: list):
         self._finish_session(logger, conversation)
 
         update_state = {
@@ -59,6 +59,19 @@ class UserAgent(AgentAsNode, node_name="User", use_model=False):
 
         return DirectionRouter.goto(state=state, node=next_node, method='command')
 
+    @override
+    async def acall(
+            self,
+            state: InputT | dict,
+            runtime: RunnableConfig = None,
+            context: RunnableConfig = None,
+            config: RunnableConfig = None,
+            **kwargs
+    ) -> OutputT:
+        """"""
+        # the interrupt does not block, the graph returns and is resumed with the additional prompt
+        return self.__call__(state, runtime, context, config, **kwargs)
+
     @override
     def _prepare_message_templates(self, *args, **kwargs):
         ...
@@ -2,11 +2,14 @@
 #  Copyright (c) 2025
 #  Minh NGUYEN <vnguyen9@lakeheadu.ca>
 #
+import asyncio
 import logging
 from collections import defaultdict
-from typing import Sequence, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, ClassVar, Sequence, Optional
 
 from langchain_core.language_models import BaseChatModel
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import (
     HumanMessagePromptTemplate,
     SystemMessagePromptTemplate,
@@ -19,16 +22,23 @@ from .critic import CriticAgent
 from ..base.agent import AgentAsNode, register
 from ..base.utils import DirectionRouter
 from ..utils.exception import NoRenderImages
-from ..utils.file import load_image_content, load_prompt_template_file
+from ..utils.file import load_prompt_template_file
+from ..utils.image import image_diff
 from ..utils.types import InputT, OutputT
 
 logger = logging.getLogger(__name__)
 
+UNCHANGED_NOTE = " (the previous attempt did not change anything visible in this view)"
+"""Appended to the solution of a critic unresolved by rule"""
+
 
 @register(type="agent", name='verification')
 class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
     """The Verification Agent class"""
 
+    summary_output_schema: ClassVar[dict] = {'type': 'structured_output', 'name': 'summary_verification'}
+    """Output schema of the text model comparing scene summaries"""
+
     def __init__(
             self,
             metadata: dict = None,
@@ -44,6 +54,8 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
             save_rendered_dir: str = None,
             anchor_script_path: str = None,
             verification_attempts: int = None,
+            satisfied_quorum: int = None,
+            unchanged_threshold: dict = None,
             camera_setting_file: str = None,
             camera_template_file: str = None,
             # templates
@@ -71,6 +83,10 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
 
         self.verification_attempts = verification_attempts
         self.verification_tries: int = 0
+        # accept the modification once this number of pairs are satisfied, cancel outstanding calls
+        self.satisfied_quorum = satisfied_quorum
+        # a pair within {'mad': <float>, 'hash_distance': <int>} is unchanged, handled without calling the model
+        self.unchanged_threshold = unchanged_threshold
 
     @override
     def __call__(
@@ -87,11 +103,52 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
         # script after fixing
         current_script = state['current_script']
         logger.info("Setup camera to capture fixes images")
-        processed_script, save_dir = self._process_script(current_script)
+        rendered_images = state['rendered_images']
+
+        modified_rendered_images = self._render(current_script)[:len(rendered_images)]
+        self._check_modified_images(state, rendered_images, modified_rendered_images)
+
+        solutions, messages, critics_solutions = self._verify(state, rendered_images, modified_rendered_images)
+        next_node = self._next_node(state, solutions)
+
+        final_images = modified_rendered_images
+        if next_node == 'user' and self.final_render_profile:
+            final_images = self._render_final_images(current_script, len(rendered_images)) or final_images
 
+        return self._finish_verification(
+            state, next_node, solutions, messages, critics_solutions, modified_rendered_images, final_images)
+
+    @override
+    async def acall(
+            self,
+            state: InputT | dict,
+            runtime: RunnableConfig = None,
+            context: RunnableConfig = None,
+            config: RunnableConfig = None,
+            **kwargs
+    ) -> OutputT:
+        """"""
+        logger.info(self.opening_symbols)
+
+        # script after fixing
+        current_script = state['current_script']
+        logger.info("Setup camera to capture fixes images")
         rendered_images = state['rendered_images']
 
-        modified_rendered_images = self._run_to_get_rendered_images(processed_script, save_dir)[:len(rendered_images)]
+        modified_rendered_images = (await self._arender(current_script))[:len(rendered_images)]
+        self._check_modified_images(state, rendered_images, modified_rendered_images)
+
+        solutions, messages, critics_solutions = await self._averify(state, rendered_images, modified_rendered_images)
+        next_node = self._next_node(state, solutions)
+
+        final_images = modified_rendered_images
+        if next_node == 'user' and self.final_render_profile:
+            final_images = await self._arender_final_images(current_script, len(rendered_images)) or final_images
+
+        return self._finish_verification(
+            state, next_node, solutions, messages, critics_solutions, modified_rendered_images, final_images)
+
+    def _check_modified_images(self, state, rendered_images: Sequence[str], modified_rendered_images: Sequence[str]):
         logger.info(f"Images BEFORE: {rendered_images}")
         logger.info(f"Images AFTER: {modified_rendered_images}")
 
@@ -101,8 +158,9 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
             state['msg'] = f"No image rendered by Verification Agent. Let's try again with a new task"
             raise NoRenderImages(state=state)
 
-        solutions, messages, critics_solutions = self._verify(state, rendered_images, modified_rendered_images)
+        state['image_diffs'] = self._diff_images(rendered_images, modified_rendered_images)
 
+    def _next_node(self, state, solutions: list[str]) -> str:
         logger.info(f"Solutions by Verification: {len(solutions)} -- {solutions}")
         if solutions:
             # if still have solutions
@@ -121,6 +179,18 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
             next_node = 'user'
             self.verification_tries = 0
 
+        return next_node
+
+    def _finish_verification(
+            self,
+            state,
+            next_node: str,
+            solutions: list[str],
+            messages: Sequence,
+            critics_solutions: Optional[dict],
+            modified_rendered_images: Sequence[str],
+            final_images: Sequence[str]
+    ):
         self._finish_session(logger, messages)
 
         update_state = {
@@ -134,30 +204,352 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
             'critics_solutions': critics_solutions,
             # Used by User Agent to terminate and return final results
             'rendered_images': modified_rendered_images,
+            'final_images': final_images,
+            'image_diffs': state['image_diffs'],
             'messages': messages,
             'msg': state.get('msg', '')
         }
 
         return DirectionRouter.goto(state=update_state, node=next_node, method='command')
 
+    def _render_final_images(self, script: str, n_images: int) -> list[str]:
+        """Render the images returned to the user with the full quality profile"""
+        logger.info("Render final images with the full quality profile")
+        final_images = self._render(script, render_profile=self.final_render_profile)[:n_images]
+        if not final_images:
+            logger.warning("No final image rendered, use the preview images")
+        return final_images
+
+    async def _arender_final_images(self, script: str, n_images: int) -> list[str]:
+        """Async version of ``_render_final_images``"""
+        logger.info("Render final images with the full quality profile")
+        final_images = (await self._arender(script, render_profile=self.final_render_profile))[:n_images]
+        if not final_images:
+            logger.warning("No final image rendered, use the preview images")
+        return final_images
+
     def _verify(
             self,
             state: InputT,
             rendered_images: Sequence[str],
             modified_rendered_images: Sequence[str]
+    ) -> (list[str], Sequence, Optional[dict]):
+        if self._verifies_summaries(state):
+            summary_result = self._verify_summaries(state, rendered_images, modified_rendered_images)
+            # views decided from the summaries are not verified on images
+            state['summary_decided_views'] = summary_result[3]
+            image_result = self._verify_images(state, rendered_images, modified_rendered_images)
+            return self._merge_summary_verification(summary_result, image_result)
+
+        return self._verify_images(state, rendered_images, modified_rendered_images)
+
+    async def _averify(
+            self,
+            state: InputT,
+            rendered_images: Sequence[str],
+            modified_rendered_images: Sequence[str]
+    ) -> (list[str], Sequence, Optional[dict]):
+        """Async version of ``_verify``"""
+        if self._verifies_summaries(state):
+            summary_result = await self._averify_summaries(state, rendered_images, modified_rendered_images)
+            # views decided from the summaries are not verified on images
+            state['summary_decided_views'] = summary_result[3]
+            image_result = await self._averify_images(state, rendered_images, modified_rendered_images)
+            return self._merge_summary_verification(summary_result, image_result)
+
+        return await self._averify_images(state, rendered_images, modified_rendered_images)
+
+    def _verifies_summaries(self, state) -> bool:
+        return bool(self.summary_mode and (state.get('additional_prompt', None) or state['critics_solutions']))
+
+    def _merge_summary_verification(self, summary_result: tuple, image_result: tuple) \
+            -> (list[str], Sequence, Optional[dict]):
+        summary_solutions, summary_conversation, summary_critics, _ = summary_result
+        solutions, conversation, critics_solutions = image_result
+
+        if critics_solutions is not None:
+            for i, critics in summary_critics.items():
+                critics_solutions[i].extend(critics)
+        solutions = summary_solutions + [solution for solution in solutions if solution not in summary_solutions]
+        conversation = self._extend_conversation(his_conversation=summary_conversation, messages=conversation)
+        return solutions, conversation, critics_solutions
+
+    def _verify_images(
+            self,
+            state: InputT,
+            rendered_images: Sequence[str],
+            modified_rendered_images: Sequence[str]
     ) -> (list[str], Sequence, Optional[dict]):
         # This point out that the verification agent has solved all issues,
         # meaning that, when additional prompt is typed, there are no longer any critics.
         # Just in expectation
         if state.get('additional_prompt', None):
             # no critics solutions
+            if self.multi_view:
+                return self._verify_prompt_all_views(state, rendered_images, modified_rendered_images)
             return self._verify_prompt(state, rendered_images, modified_rendered_images)
         if state['critics_solutions']:
             # The agent is still solving issues
+            if self.multi_view:
+                return self._verify_critic_all_views(state, rendered_images, modified_rendered_images)
             return self._verify_critic(state, rendered_images, modified_rendered_images)
 
         return None
 
+    async def _averify_images(
+            self,
+            state: InputT,
+            rendered_images: Sequence[str],
+            modified_rendered_images: Sequence[str]
+    ) -> (list[str], Sequence, Optional[dict]):
+        """Async version of ``_verify_images``"""
+        if state.get('additional_prompt', None):
+            if self.multi_view:
+                return await self._averify_prompt_all_views(state, rendered_images, modified_rendered_images)
+            return await self._averify_prompt(state, rendered_images, modified_rendered_images)
+        if state['critics_solutions']:
+            if self.multi_view:
+                return await self._averify_critic_all_views(state, rendered_images, modified_rendered_images)
+            return await self._averify_critic(state, rendered_images, modified_rendered_images)
+
+        return None
+
+    def _verify_summaries(
+            self,
+            state: InputT,
+            rendered_images: Sequence[str],
+            modified_rendered_images: Sequence[str]
+    ) -> (list[str], Sequence, dict, set[int]):
+        """Verify with the text model from the scene summaries before and after the change
+
+        Returns:
+            solutions, conversation, critics and solutions keyed by view index, views decided without images
+        """
+        formatted_prompt, views = self._prepare_summary_verification(state, rendered_images, modified_rendered_images)
+        if formatted_prompt is None:
+            return [], [], defaultdict(list), set()
+
+        # -----------------------------------------------
+        review, conversation = self.chat_model_call(formatted_prompt, chat_model=self.summary_chat_model)
+        # -----------------------------------------------
+        return self._collect_summary_verification(state, views, review, conversation)
+
+    async def _averify_summaries(
+            self,
+            state: InputT,
+            rendered_images: Sequence[str],
+            modified_rendered_images: Sequence[str]
+    ) -> (list[str], Sequence, dict, set[int]):
+        """Async version of ``_verify_summaries``"""
+        formatted_prompt, views = self._prepare_summary_verification(state, rendered_images, modified_rendered_images)
+        if formatted_prompt is None:
+            return [], [], defaultdict(list), set()
+
+        # -----------------------------------------------
+        review, conversation = await self.achat_model_call(formatted_prompt, chat_model=self.summary_chat_model)
+        # -----------------------------------------------
+        return self._collect_summary_verification(state, views, review, conversation)
+
+    def _prepare_summary_verification(
+            self,
+            state: InputT,
+            rendered_images: Sequence[str],
+            modified_rendered_images: Sequence[str]
+    ) -> (Optional[ChatPromptValue], list[int]):
+        """The prompt verifying the scene summaries and the views it covers, None when nothing to verify"""
+        n_views = min(len(rendered_images), len(modified_rendered_images))
+        scene_summary = self._load_scene_summary(rendered_images)
+        modified_scene_summary = self._load_scene_summary(modified_rendered_images)
+        if scene_summary is None or modified_scene_summary is None:
+            logger.warning("No scene summary, verify all views on images")
+            return None, []
+
+        # unchanged views are handled by rule
+        changed_views = [i for i in range(n_views) if not self._is_unchanged(state, i)]
+        if state.get('additional_prompt', None):
+            views = changed_views
+            chat_template = self.summary_verify_prompt_template
+            inputs = {'additional_prompt': [state['additional_prompt'], ]}
+        else:
+            views = [i for i in changed_views if state['critics_solutions'].get(i, None)]
+            chat_template = self.summary_verify_critic_template
+            inputs = {'critics_solutions': {i: state['critics_solutions'][i] for i in views}}
+        if not views:
+            return None, []
+
+        formatted_prompt = chat_template.invoke({
+            **inputs,
+            'scene_summary': scene_summary,
+            'modified_scene_summary': modified_scene_summary,
+        })
+        return formatted_prompt, views
+
+    def _collect_summary_verification(self, state: InputT, views: list[int], review: dict, conversation: Sequence) \
+            -> (list[str], Sequence, dict, set[int]):
+        escalate_views = {v for v in review['escalate_views'] if v in views}
+        # only views with an explicit answer are decided, the others are verified on images
+        answered_views = {c.get('view', None) for c in review['css_list']}
+        decided_views = {v for v in views if v in answered_views} - escalate_views
+        image_views = set(views) - decided_views
+
+        solutions = []
+        critics_solutions = defaultdict(list)
+        for c in review['css_list']:
+            view = c.get('view', None)
+            if view is None:
+                # an answer for the whole scene, only for the prompt when no view needs images
+                if image_views or not state.get('additional_prompt', None):
+                    continue
+            elif view not in decided_views:
+                continue
+            if not c['satisfied'] and c['solution'] not in solutions:
+                solutions.append(c['solution'])
+                if view is not None:
+                    critics_solutions[view].append({'critic': c['new_critic'], 'solution': c['solution']})
+        logger.info(f"Views decided from the scene summaries: {sorted(decided_views)}, "
+                    f"verified on images: {sorted(image_views)}")
+
+        return solutions, conversation, critics_solutions, decided_views
+
+    def _diff_images(self, rendered_images: Sequence[str], modified_rendered_images: Sequence[str]) \
+            -> dict[int, dict]:
+        """Compare every before/after pair by pixels and average hash
+
+        Returns: dict
+            ``{<pair index>: {"mad": <float>, "hash_distance": <int>, "unchanged": <bool>}}``
+        """
+        if not self.unchanged_threshold:
+            return dict()
+
+        diffs = dict()
+        for i, (ri, mi) in enumerate(zip(rendered_images, modified_rendered_images)):
+            diff = image_diff(ri, mi)
+            diff['unchanged'] = (
+                    diff['mad'] <= self.unchanged_threshold.get('mad', 0.)
+                    and diff['hash_distance'] <= self.unchanged_threshold.get('hash_distance', 0)
+            )
+            diffs[i] = diff
+        logger.info(f"Image diffs: {diffs}")
+
+        return diffs
+
+    @staticmethod
+    def _is_unchanged(state, i: int) -> bool:
+        return state.get('image_diffs', {}).get(i, {}).get('unchanged', False)
+
+    @staticmethod
+    def _is_decided(state, i: int) -> bool:
+        return i in state.get('summary_decided_views', ())
+
+    def _unresolved_critics(self, state, indices: Sequence[int]) -> dict[int, list[dict]]:
+        """Critics of pairs where nothing visible changed, unresolved by rule"""
+        unresolved = dict()
+        for i in indices:
+            if not self._is_unchanged(state, i):
+                continue
+            logger.info(f"image ({i + 1}): unchanged, critics unresolved without calling the model")
+            unresolved[i] = [
+                {
+                    'critic': d['critic'],
+                    'solution': d['solution'] if d['solution'].endswith(UNCHANGED_NOTE) else d['solution'] + UNCHANGED_NOTE
+                }
+                for d in state['critics_solutions'][i]
+            ]
+
+        return unresolved
+
+    def _n_in_flight(self, n_satisfied: int) -> int:
+        """Max number of calls running at the same time, no more than the satisfied pairs still missing for the
+        quorum: no call is left running once it is reached"""
+        if not self.satisfied_quorum:
+            return self.max_concurrency
+        return max(1, min(self.max_concurrency, self.satisfied_quorum - n_satisfied))
+
+    def _verify_pairs(self, verify_pair: Callable, indices: Sequence[int]) -> (dict, bool):
+        """Verify before/after pairs concurrently, at most ``max_concurrency`` calls at the same time
+
+        Args:
+            verify_pair (Callable): Function of a pair index, returning ``(satisfied, response, to_log_messages)``
+            indices (Sequence[int]): Indices of pairs to verify
+
+        Returns:
+            results by pair index (in camera order), and whether ``satisfied_quorum`` was reached
+        """
+        results = dict()
+        n_satisfied = 0
+        quorum_reached = False
+        pending = list(indices)
+        running = dict()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='verification') as executor:
+            while pending or running:
+                # pairs are submitted as calls complete, the others are never sent once the quorum is reached
+                while pending and len(running) < self._n_in_flight(n_satisfied):
+                    i = pending.pop(0)
+                    running[executor.submit(verify_pair, i)] = i
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    results[i] = future.result()
+                    n_satisfied += bool(results[i][0])
+                if self.satisfied_quorum and n_satisfied >= self.satisfied_quorum:
+                    # the decision cannot change anymore
+                    quorum_reached = True
+                    logger.info(f"{n_satisfied} pairs satisfied (quorum: {self.satisfied_quorum}), "
+                                f"skip {len(pending)} pairs")
+                    break
+
+        return dict(sorted(results.items())), quorum_reached
+
+    async def _averify_pairs(self, verify_pair: Callable, indices: Sequence[int]) -> (dict, bool):
+        """Async version of ``_verify_pairs``
+
+        Args:
+            verify_pair (Callable): Coroutine function of a pair index, returning
+                ``(satisfied, response, to_log_messages)``
+            indices (Sequence[int]): Indices of pairs to verify
+        """
+        results = dict()
+        n_satisfied = 0
+        quorum_reached = False
+        pending = list(indices)
+        running = dict()
+        try:
+            while pending or running:
+                while pending and len(running) < self._n_in_flight(n_satisfied):
+                    i = pending.pop(0)
+                    running[asyncio.create_task(verify_pair(i))] = i
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i = running.pop(task)
+                    results[i] = task.result()
+                    n_satisfied += bool(results[i][0])
+                if self.satisfied_quorum and n_satisfied >= self.satisfied_quorum:
+                    # the decision cannot change anymore
+                    quorum_reached = True
+                    logger.info(f"{n_satisfied} pairs satisfied (quorum: {self.satisfied_quorum}), "
+                                f"skip {len(pending)} pairs")
+                    break
+        finally:
+            for task in running:
+                task.cancel()
+
+        return dict(sorted(results.items())), quorum_reached
+
+    def _prepare_pair_prompt(self, chat_template, inputs: dict, image: str, modified_image: str) \
+            -> (ChatPromptValue, list):
+        """The prompt of a before/after pair, and its messages to log (image paths instead of base64 content)"""
+        formatted_prompt = chat_template.invoke({
+            'image': self._load_image(image),
+            'modified_image': self._load_image(modified_image),
+            **inputs,
+        })
+        to_log_messages = chat_template.invoke({
+            'image': image,
+            'modified_image': modified_image,
+            **inputs,
+        }).to_messages()
+        return formatted_prompt, to_log_messages
+
     def _verify_critic(
             self,
             state,
@@ -168,30 +560,75 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
         logger.info("Verify critics and fixes")
 
         chat_template = self._prepare_chat_template(human_template=self.human_verify_critic_template)
+        indices, unresolved = self._prepare_verify_critic(state, rendered_images, modified_rendered_images)
+
+        def verify_pair(i):
+            formatted_prompt, to_log_messages = self._prepare_critic_pair_prompt(
+                chat_template, state, rendered_images, modified_rendered_images, i)
+            # ---------------------------------------------------------------
+            response, _messages = self.chat_model_call(formatted_prompt)
+            # -----------------------------------------------
+            return all(c['satisfied'] for c in response), response, [*to_log_messages, _messages[-1]]
+
+        results, quorum_reached = self._verify_pairs(verify_pair, indices)
+        return self._collect_verify_critic(state, results, quorum_reached, unresolved)
+
+    async def _averify_critic(
+            self,
+            state,
+            rendered_images,
+            modified_rendered_images
+    ) -> (list[str], Sequence, dict):
+        """Async version of ``_verify_critic``"""
+        logger.info("Verify critics and fixes")
+
+        chat_template = self._prepare_chat_template(human_template=self.human_verify_critic_template)
+        indices, unresolved = self._prepare_verify_critic(state, rendered_images, modified_rendered_images)
+
+        async def verify_pair(i):
+            formatted_prompt, to_log_messages = self._prepare_critic_pair_prompt(
+                chat_template, state, rendered_images, modified_rendered_images, i)
+            # ---------------------------------------------------------------
+            response, _messages = await self.achat_model_call(formatted_prompt)
+            # -----------------------------------------------
+            return all(c['satisfied'] for c in response), response, [*to_log_messages, _messages[-1]]
+
+        results, quorum_reached = await self._averify_pairs(verify_pair, indices)
+        return self._collect_verify_critic(state, results, quorum_reached, unresolved)
+
+    def _prepare_verify_critic(self, state, rendered_images, modified_rendered_images) -> (list[int], dict):
+        """Indices of pairs verified by the model, and critics unresolved by rule"""
+        critics_solutions_dict = state['critics_solutions']
+        indices = [
+            i for i in range(min(len(rendered_images), len(modified_rendered_images)))
+            if critics_solutions_dict.get(i, None)
+        ]
+        unresolved = self._unresolved_critics(state, indices)
+        return [i for i in indices if i not in unresolved and not self._is_decided(state, i)], unresolved
+
+    def _prepare_critic_pair_prompt(self, chat_template, state, rendered_images, modified_rendered_images, i) \
+            -> (ChatPromptValue, list):
+        # ri: rendered image
+        # mi: modified rendered image
+        ri, mi = rendered_images[i], modified_rendered_images[i]
+        logger.info(f"image ({i + 1}/{len(modified_rendered_images)}): '{ri}' vs '{mi}'")
+        critics_solutions = state['critics_solutions'].get(i, None)
+        return self._prepare_pair_prompt(chat_template, {'critics_solutions': critics_solutions}, ri, mi)
+
+    def _collect_verify_critic(self, state, results: dict, quorum_reached: bool, unresolved: dict) \
+            -> (list[str], Sequence, dict):
         critics_solutions_dict = state['critics_solutions']
         new_critic_satisfied_solution_dict = defaultdict(list)
         solutions = []
         conversation = []
 
-        for i, (ri, mi) in enumerate(zip(rendered_images, modified_rendered_images)):
-            # ri: rendered image
-            # mi: modified rendered image
-            logger.info(f"image ({i + 1}/{len(modified_rendered_images)}): '{ri}' vs '{mi}'")
-            critics_solutions = critics_solutions_dict.get(i, None)
-            if not critics_solutions:
-                continue
+        for i, (_, response, to_log_messages) in results.items():
+            critics_solutions = critics_solutions_dict[i]
             previous_critics = [d['critic'] for d in critics_solutions]
             previous_solutions = [d['solution'] for d in critics_solutions]
-            # ---------------------------------------------------------------
-            formatted_prompt = chat_template.invoke({
-                'image': load_image_content(ri),
-                'modified_image': load_image_content(mi),
-                'critics_solutions': critics_solutions,
-            })
-            response, _messages = self.chat_model_call(formatted_prompt)
             # -----------------------------------------------
             for c in response:
-                if not c['satisfied']:
+                if not c['satisfied'] and not quorum_reached:
                     new_critic_satisfied_solution_dict[i].append({
                         'critic': c['new_critic'],
                         'solution': c['solution']
@@ -201,16 +638,13 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
                     logger.info(f'Same critic? {c["new_critic"] in previous_critics} & '
                                 f'Same solution?: {c["solution"] in previous_solutions}')
             # -----------------------------------------------
-            to_log_messages = [
-                *chat_template.invoke({
-                    'image': ri,
-                    'modified_image': mi,
-                    'critics_solutions': critics_solutions,
-                }).to_messages(),
-                _messages[-1]
-            ]
             conversation = self._extend_conversation(his_conversation=conversation, messages=to_log_messages)
 
+        if not quorum_reached:
+            for i, critics_solutions in unresolved.items():
+                new_critic_satisfied_solution_dict[i].extend(critics_solutions)
+                solutions.extend(d['solution'] for d in critics_solutions)
+
         return solutions, conversation, new_critic_satisfied_solution_dict
 
     def _verify_prompt(self, state, rendered_images, modified_rendered_images) \
@@ -218,37 +652,283 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
         logger.info(f"Verify additional prompt: {state['additional_prompt']}")
 
         chat_template = self._prepare_chat_template(human_template=self.human_verify_prompt_template)
-        conversation = []
-        solutions = []
+        indices = self._changed_indices(state, rendered_images, modified_rendered_images)
+        if not indices:
+            return [self._unapplied_prompt_solution(state)], [], None
 
-        for i, (ri, fi) in enumerate(zip(rendered_images, modified_rendered_images)):
-            logger.info(f"image ({i + 1}/{len(modified_rendered_images)}): '{ri}' vs '{fi}'")
+        def verify_pair(i):
+            formatted_prompt, to_log_messages = self._prepare_prompt_pair_prompt(
+                chat_template, state, rendered_images, modified_rendered_images, i)
             # -----------------------------------------------
-            formatted_prompt = chat_template.invoke({
-                'image': load_image_content(ri),
-                'modified_image': load_image_content(fi),
-                'additional_prompt': [state['additional_prompt'], ],
-            })
             response, _messages = self.chat_model_call(formatted_prompt)
             # -----------------------------------------------
-            if isinstance(response, list):
-                # expect only one (issue, solution) per image
-                response = response[0]
-            if not response['satisfied']:
+            return self._prompt_pair_result(response, [*to_log_messages, _messages[-1]])
+
+        results, quorum_reached = self._verify_pairs(
+            verify_pair, [i for i in indices if not self._is_decided(state, i)])
+        return self._collect_verify_prompt(results, quorum_reached)
+
+    async def _averify_prompt(self, state, rendered_images, modified_rendered_images) \
+            -> (list[str], Sequence, None):
+        """Async version of ``_verify_prompt``"""
+        logger.info(f"Verify additional prompt: {state['additional_prompt']}")
+
+        chat_template = self._prepare_chat_template(human_template=self.human_verify_prompt_template)
+        indices = self._changed_indices(state, rendered_images, modified_rendered_images)
+        if not indices:
+            return [self._unapplied_prompt_solution(state)], [], None
+
+        async def verify_pair(i):
+            formatted_prompt, to_log_messages = self._prepare_prompt_pair_prompt(
+                chat_template, state, rendered_images, modified_rendered_images, i)
+            # -----------------------------------------------
+            response, _messages = await self.achat_model_call(formatted_prompt)
+            # -----------------------------------------------
+            return self._prompt_pair_result(response, [*to_log_messages, _messages[-1]])
+
+        results, quorum_reached = await self._averify_pairs(
+            verify_pair, [i for i in indices if not self._is_decided(state, i)])
+        return self._collect_verify_prompt(results, quorum_reached)
+
+    def _changed_indices(self, state, rendered_images, modified_rendered_images) -> list[int]:
+        return [
+            i for i in range(min(len(rendered_images), len(modified_rendered_images)))
+            if not self._is_unchanged(state, i)
+        ]
+
+    def _prepare_prompt_pair_prompt(self, chat_template, state, rendered_images, modified_rendered_images, i) \
+            -> (ChatPromptValue, list):
+        ri, fi = rendered_images[i], modified_rendered_images[i]
+        logger.info(f"image ({i + 1}/{len(modified_rendered_images)}): '{ri}' vs '{fi}'")
+        return self._prepare_pair_prompt(chat_template, {'additional_prompt': [state['additional_prompt'], ]}, ri, fi)
+
+    @staticmethod
+    def _prompt_pair_result(response, to_log_messages: list) -> (bool, dict, list):
+        if isinstance(response, list):
+            # expect only one (issue, solution) per image
+            response = response[0]
+        return response['satisfied'], response, to_log_messages
+
+    def _collect_verify_prompt(self, results: dict, quorum_reached: bool) -> (list[str], Sequence, None):
+        solutions = []
+        conversation = []
+        for i, (satisfied, response, to_log_messages) in results.items():
+            if not satisfied and not quorum_reached:
                 solutions.append(response['solution'])
             # -----------------------------------------------
-            to_log_messages = [
-                *chat_template.invoke({
-                    'image': ri,
-                    'modified_image': fi,
-                    'additional_prompt': state['additional_prompt']
-                }).to_messages(),
-                _messages[-1]
-            ]
             conversation = self._extend_conversation(his_conversation=conversation, messages=to_log_messages)
 
         return solutions, conversation, None
 
+    @staticmethod
+    def _unapplied_prompt_solution(state) -> str:
+        """Solution by rule when no view changed after applying the additional prompt"""
+        logger.info("No view changed, the additional prompt is unapplied without calling the model")
+        return state['additional_prompt'] + UNCHANGED_NOTE
+
+    def _verify_critic_all_views(
+            self,
+            state,
+            rendered_images,
+            modified_rendered_images
+    ) -> (list[str], Sequence, dict):
+        """Verify critics and fixes of all pairs in a single request"""
+        logger.info("Verify critics and fixes of all views at once")
+
+        solutions, new_critic_satisfied_solution_dict, indices = self._prepare_verify_critic_all_views(
+            state, rendered_images, modified_rendered_images)
+        if not indices:
+            return solutions, [], new_critic_satisfied_solution_dict
+
+        text = self.human_multi_view_verify_critic_template.format(
+            n_views=len(indices),
+            critics_solutions={i: state['critics_solutions'][i] for i in indices},
+        )
+        views = self._pair_views(indices, rendered_images, modified_rendered_images)
+        # ---------------------------------------------------------------
+        response, _messages = self.chat_model_call(self._prepare_multi_view_prompt(text, views))
+        # ---------------------------------------------------------------
+        return self._collect_verify_critic_all_views(
+            state, rendered_images, modified_rendered_images, indices, solutions, new_critic_satisfied_solution_dict,
+            text, views, response, _messages)
+
+    async def _averify_critic_all_views(
+            self,
+            state,
+            rendered_images,
+            modified_rendered_images
+    ) -> (list[str], Sequence, dict):
+        """Async version of ``_verify_critic_all_views``"""
+        logger.info("Verify critics and fixes of all views at once")
+
+        solutions, new_critic_satisfied_solution_dict, indices = self._prepare_verify_critic_all_views(
+            state, rendered_images, modified_rendered_images)
+        if not indices:
+            return solutions, [], new_critic_satisfied_solution_dict
+
+        text = self.human_multi_view_verify_critic_template.format(
+            n_views=len(indices),
+            critics_solutions={i: state['critics_solutions'][i] for i in indices},
+        )
+        views = self._pair_views(indices, rendered_images, modified_rendered_images)
+        # ---------------------------------------------------------------
+        response, _messages = await self.achat_model_call(self._prepare_multi_view_prompt(text, views))
+        # ---------------------------------------------------------------
+        return self._collect_verify_critic_all_views(
+            state, rendered_images, modified_rendered_images, indices, solutions, new_critic_satisfied_solution_dict,
+            text, views, response, _messages)
+
+    def _prepare_verify_critic_all_views(self, state, rendered_images, modified_rendered_images) \
+            -> (list[str], dict, list[int]):
+        """Solutions of critics unresolved by rule, and indices of pairs verified by the model"""
+        critics_solutions_dict = state['critics_solutions']
+        new_critic_satisfied_solution_dict = defaultdict(list)
+        solutions = []
+
+        n_views = min(len(rendered_images), len(modified_rendered_images))
+        unresolved = self._unresolved_critics(
+            state, [i for i in range(n_views) if critics_solutions_dict.get(i, None)])
+        for i, critics_solutions in unresolved.items():
+            new_critic_satisfied_solution_dict[i].extend(critics_solutions)
+            solutions.extend(d['solution'] for d in critics_solutions)
+        indices = [
+            i for i in range(n_views)
+            if critics_solutions_dict.get(i, None) and i not in unresolved and not self._is_decided(state, i)
+        ]
+        return solutions, new_critic_satisfied_solution_dict, indices
+
+    @staticmethod
+    def _pair_views(indices, rendered_images, modified_rendered_images) -> list[tuple[str, str]]:
+        return [
+            view
+            for i in indices
+            for view in ((f"View {i}, the first image:", rendered_images[i]),
+                         (f"View {i}, the second image:", modified_rendered_images[i]))
+        ]
+
+    def _collect_verify_critic_all_views(
+            self,
+            state,
+            rendered_images,
+            modified_rendered_images,
+            indices: list[int],
+            solutions: list[str],
+            new_critic_satisfied_solution_dict: dict,
+            text: str,
+            views: list[tuple[str, str]],
+            response: list[dict],
+            _messages: list
+    ) -> (list[str], Sequence, dict):
+        critics_solutions_dict = state['critics_solutions']
+        n_views = min(len(rendered_images), len(modified_rendered_images))
+        responses = self._group_by_view(response, indices)
+        n_satisfied = sum(1 for i in indices if i in responses and all(c['satisfied'] for c in responses[i]))
+        quorum_reached = bool(self.satisfied_quorum) and n_satisfied >= self.satisfied_quorum
+        if quorum_reached:
+            logger.info(f"{n_satisfied} pairs satisfied (quorum: {self.satisfied_quorum})")
+            solutions = []
+            new_critic_satisfied_solution_dict = defaultdict(list)
+
+        for i in indices:
+            logger.info(f"image ({i + 1}/{n_views}): '{rendered_images[i]}' vs '{modified_rendered_images[i]}'")
+            if i not in responses:
+                # unverified, the previous critics still stand
+                logger.warning(f"No answer for view {i}, keep its critics unresolved")
+                if not quorum_reached:
+                    new_critic_satisfied_solution_dict[i].extend(critics_solutions_dict[i])
+                    solutions.extend(d['solution'] for d in critics_solutions_dict[i])
+                continue
+            previous_critics = [d['critic'] for d in critics_solutions_dict[i]]
+            previous_solutions = [d['solution'] for d in critics_solutions_dict[i]]
+            for c in responses[i]:
+                if not c['satisfied'] and not quorum_reached:
+                    new_critic_satisfied_solution_dict[i].append({
+                        'critic': c['new_critic'],
+                        'solution': c['solution']
+                    })
+                    solutions.append(c['solution'])
+                    logger.info(f'Same critic? {c["new_critic"] in previous_critics} & '
+                                f'Same solution?: {c["solution"] in previous_solutions}')
+
+        conversation = [*self._prepare_multi_view_prompt(text, views, load=False).to_messages(), _messages[-1]]
+        return solutions, conversation, new_critic_satisfied_solution_dict
+
+    def _verify_prompt_all_views(self, state, rendered_images, modified_rendered_images) \
+            -> (list[str], Sequence, None):
+        """Verify the additional prompt on all pairs in a single request"""
+        logger.info(f"Verify additional prompt on all views at once: {state['additional_prompt']}")
+
+        indices = self._changed_indices(state, rendered_images, modified_rendered_images)
+        if not indices:
+            return [self._unapplied_prompt_solution(state)], [], None
+        indices = [i for i in indices if not self._is_decided(state, i)]
+        if not indices:
+            return [], [], None
+
+        text = self.human_multi_view_verify_prompt_template.format(
+            n_views=len(indices),
+            additional_prompt=[state['additional_prompt'], ],
+        )
+        views = self._pair_views(indices, rendered_images, modified_rendered_images)
+        # -----------------------------------------------
+        response, _messages = self.chat_model_call(self._prepare_multi_view_prompt(text, views))
+        # -----------------------------------------------
+        return self._collect_verify_prompt_all_views(
+            state, rendered_images, modified_rendered_images, indices, text, views, response, _messages)
+
+    async def _averify_prompt_all_views(self, state, rendered_images, modified_rendered_images) \
+            -> (list[str], Sequence, None):
+        """Async version of ``_verify_prompt_all_views``"""
+        logger.info(f"Verify additional prompt on all views at once: {state['additional_prompt']}")
+
+        indices = self._changed_indices(state, rendered_images, modified_rendered_images)
+        if not indices:
+            return [self._unapplied_prompt_solution(state)], [], None
+        indices = [i for i in indices if not self._is_decided(state, i)]
+        if not indices:
+            return [], [], None
+
+        text = self.human_multi_view_verify_prompt_template.format(
+            n_views=len(indices),
+            additional_prompt=[state['additional_prompt'], ],
+        )
+        views = self._pair_views(indices, rendered_images, modified_rendered_images)
+        # -----------------------------------------------
+        response, _messages = await self.achat_model_call(self._prepare_multi_view_prompt(text, views))
+        # -----------------------------------------------
+        return self._collect_verify_prompt_all_views(
+            state, rendered_images, modified_rendered_images, indices, text, views, response, _messages)
+
+    def _collect_verify_prompt_all_views(
+            self,
+            state,
+            rendered_images,
+            modified_rendered_images,
+            indices: list[int],
+            text: str,
+            views: list[tuple[str, str]],
+            response,
+            _messages: list
+    ) -> (list[str], Sequence, None):
+        if isinstance(response, dict):
+            response = [response]
+        responses = self._group_by_view(response, indices)
+        n_satisfied = sum(1 for i in indices if i in responses and all(c['satisfied'] for c in responses[i]))
+        quorum_reached = bool(self.satisfied_quorum) and n_satisfied >= self.satisfied_quorum
+
+        solutions = []
+        if not quorum_reached:
+            for i in indices:
+                solutions.extend(c['solution'] for c in responses.get(i, []) if not c['satisfied'])
+            unverified = [i for i in indices if i not in responses]
+            if unverified:
+                # the additional prompt is not known to be applied on these views
+                logger.warning(f"No answer for views {unverified}, keep the additional prompt unresolved")
+                solutions.append(state['additional_prompt'])
+
+        conversation = [*self._prepare_multi_view_prompt(text, views, load=False).to_messages(), _messages[-1]]
+        return solutions, conversation, None
+
     @override
     def _prepare_message_templates(self, *args, **kwargs):
         template_dict = load_prompt_template_file(self.template_file)
@@ -264,6 +944,26 @@ class VerificationAgent(CriticAgent, AgentAsNode, node_name='Verification'):
             template=template_dict['human_verify_prompt_template'],
             template_format='f-string',
         )
+        self.human_multi_view_verify_critic_template = template_dict.get('human_multi_view_verify_critic_template')
+        self.human_multi_view_verify_prompt_template = template_dict.get('human_multi_view_verify_prompt_template')
+
+        self.summary_verify_critic_template = None
+        self.summary_verify_prompt_template = None
+        if 'summary_system_template' in template_dict:
+            summary_system_template = SystemMessagePromptTemplate.from_template(
+                template=template_dict['summary_system_template'],
+                template_format='f-string'
+            )
+            self.summary_verify_critic_template = ChatPromptTemplate([
+                summary_system_template,
+                HumanMessagePromptTemplate.from_template(
+                    template=template_dict['human_summary_verify_critic_template'], template_format='f-string')
+            ])
+            self.summary_verify_prompt_template = ChatPromptTemplate([
+                summary_system_template,
+                HumanMessagePromptTemplate.from_template(
+                    template=template_dict['human_summary_verify_prompt_template'], template_format='f-string')
+            ])
 
     def _prepare_chat_template(self, human_template=None):
         if human_template is None:
@@ -2,8 +2,12 @@
 #  Copyright (c) 2025
 #  Minh NGUYEN <vnguyen9@lakeheadu.ca>
 #
+import asyncio
+import json
 import logging
 import os
+import threading
+import time
 from typing import Union, Generic, Any, ClassVar, overload, Optional, Sequence
 
 from langchain.chat_models.base import BaseChatModel
@@ -14,18 +18,18 @@ from langchain_core.prompts import (
     SystemMessagePromptTemplate,
     HumanMessagePromptTemplate
 )
-from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_core.utils.interactive_env import is_interactive_env
-from langchain_openai import ChatOpenAI
+from langchain_core.utils.json import parse_partial_json
 from langgraph.config import RunnableConfig
-from pydantic import ConfigDict, SkipValidation
+from pydantic import BaseModel, ConfigDict, SkipValidation, ValidationError
 
 from .mapping import register, fetch_schema
+from ..llm import get_chat_model, get_response_cache, rate_limiter_stats, response_key
+from ..utils.constants import DEFAULT_REPAIR_TEMPLATE_FILE
 from ..utils.exception import (
     NotReturnStructuredOutput,
     CanNotParseJsonString,
-    BreakGraphOperation,
-    ReinvokeChat
+    StructuredOutputError
 )
 from ..utils.file import load_prompt_template_file
 from ..utils.types import StateT, InputT, OutputT, ContextT
@@ -52,6 +56,10 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
     An agent has an LLM acting as brain and tools, allowing to interact with external knowledge, environment.
     """
 
+    STRUCTURED_OUTPUT_MODES: ClassVar[tuple] = ('tool', 'native')
+
+    PARSE_COUNTERS: ClassVar[tuple] = ('calls', 'parse_failures', 'partial', 'repairs', 'repaired', 'failed')
+
     SUPPORTED_MODEL: ClassVar[list] = [
         "gpt-4o-mini",
         "gpt-4o",
@@ -104,6 +112,10 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
     output_schema_as_tool: bool = None
     """Bind `output_schema` as tool, providing more flexibility"""
 
+    structured_output_mode: str = 'tool'
+    """How the chat model returns ``output_schema``: ``tool`` (a tool call) or ``native`` (provider JSON schema output
+    in strict mode, validated by the pydantic schema)"""
+
     chat_model: BaseChatModel = None
     """The chat model, useful when it's shared across multiple nodes/places"""
 
@@ -120,10 +132,22 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
     """Volume of output tokens chat model generated"""
 
     invoke_attempts: int = 3
-    """Attempt to invoke chat mode"""
+    """Max number of repair calls of an output which does not follow the output schema"""
+
+    repair_backoff: float = 1.
+    """Seconds waited before the second repair call, doubled before every next one"""
+
+    repair_deadline: float = 120.
+    """Seconds a chat model call, with its repairs, may take. No repair starts after it"""
+
+    repair_template_file: str = None
+    """File of the repair prompt. Default to ``DEFAULT_REPAIR_TEMPLATE_FILE``"""
 
-    invoke_tries: int = 0
-    """Number of tries invoking"""
+    parse_stats: dict[str, dict[str, int]] = None
+    """Counters of parsing structured outputs per model and mode (``PARSE_COUNTERS``)"""
+
+    cache_responses: bool = True
+    """Replay responses to identical prompts from the response cache (``configs/llm.yaml``), when it is enabled"""
 
     def __init_subclass__(cls, node_name: str = None, use_model: bool = True):
         cls.name = node_name
@@ -140,11 +164,22 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
             model_provider: str = None,
             model_api_key: str = None,
             output_schema_as_tool: bool = None,
+            structured_output_mode: str = 'tool',
             chat_model: BaseChatModel = None,
             template_file: str = None,
+            cache_responses: bool = True,
+            invoke_attempts: int = 3,
+            repair_backoff: float = 1.,
+            repair_deadline: float = 120.,
+            repair_template_file: str = None,
             **kwargs,
     ):
         self.metadata = metadata
+        self.cache_responses = cache_responses
+        self.invoke_attempts = invoke_attempts
+        self.repair_backoff = repair_backoff
+        self.repair_deadline = repair_deadline
+        self.repair_template_file = repair_template_file or DEFAULT_REPAIR_TEMPLATE_FILE
         self.chat_model = chat_model
         self.model_name = model_name
         self.model_provider = model_provider
@@ -155,6 +190,7 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
         self.tool_schemas = tool_schemas
         self.output_schema = output_schema
         self.output_schema_as_tool = output_schema_as_tool
+        self.structured_output_mode = self._check_structured_output_mode(structured_output_mode)
 
         self.template_file = template_file
         self.system_template: ChatMessagePromptTemplate
@@ -169,10 +205,16 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
         self.ending_symbols = "*" * (120 + len(self.name))
 
         self._prepare_message_templates()
+        self.repair_template = self._prepare_repair_template() if self.use_model else None
 
         self.response_metadata = dict()
         self.num_input_tokens = 0
         self.num_output_tokens = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.parse_stats = dict()
+        # chat model may be called from several threads
+        self._token_lock = threading.Lock()
 
     @classmethod
     def _check_model_name(cls, model_name: str):
@@ -187,6 +229,14 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
             raise ValueError(f"Now we only accept instantiate `chat_model` from 'model_name'")
         return None
 
+    @classmethod
+    def _check_structured_output_mode(cls, mode: str):
+        mode = mode or 'tool'
+        if mode not in cls.STRUCTURED_OUTPUT_MODES:
+            raise ValueError(f"Structured output mode must be one of: {', '.join(cls.STRUCTURED_OUTPUT_MODES)}, "
+                             f"not {mode}")
+        return mode
+
     @classmethod
     def _check_model_provider(cls, model_provider):
         if model_provider not in cls.PROVIDER_TO_ENV:
@@ -198,7 +248,12 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
 
     def _initialize_model(self):
         """Use model from Openrouter"""
+        self.chat_model = self._create_chat_model(self.model_name, self.tool_schemas)
 
+    def _create_chat_model(self, model_name: str, tool_schemas: list) -> BaseChatModel:
+        """Create a chat model of the agent's provider, bound with ``tool_schemas``.
+        In ``native`` mode, the only schema is the output format of the chat model instead
+        """
         base_url = self.PROVIDER_TO_BASE_URL[self.model_provider]
 
         if self.model_api_key is None:
@@ -206,19 +261,27 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
         else:
             api_key = self.model_api_key
 
-        self.chat_model = ChatOpenAI(
-            openai_api_base=base_url,
-            model=self.model_name,
-            openai_api_key=api_key,
+        # shared by all agents using the same provider, API key and model, with its connections and rate limiter
+        chat_model = get_chat_model(
+            provider=self.model_provider,
+            base_url=base_url,
+            api_key=api_key,
+            model_name=model_name,
             temperature=0.7,
-            rate_limiter=InMemoryRateLimiter(
-                requests_per_second=0.1,
-                check_every_n_seconds=0.1,
-                max_bucket_size=10
-            )
         )
 
-        self.chat_model = self.chat_model.bind_tools(self.tool_schemas)
+        if self.structured_output_mode == 'native':
+            if len(tool_schemas) == 1 and issubclass(tool_schemas[0], BaseModel):
+                structured_chat_model = chat_model.with_structured_output(
+                    tool_schemas[0], method='json_schema', strict=True,
+                )
+                # only the bound model is invoked, to keep the message (tokens, cache, repair), the parsed output is
+                # validated by ``_parse_native``
+                return structured_chat_model.first
+            logger.warning(f"The '{self.name}' agent has tools besides the output schema, bind them as tools instead "
+                           f"of the native structured output")
+
+        return chat_model.bind_tools(tool_schemas)
 
     def validate_node(self):
         """Validate node settings"""
@@ -251,6 +314,18 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
             template_format='f-string',
         )
 
+    def _prepare_repair_template(self) -> ChatPromptTemplate:
+        """Prompt carrying only an invalid output and the output schema"""
+        templates_dict = load_prompt_template_file(self.repair_template_file)
+
+        return ChatPromptTemplate(
+            messages=[
+                SystemMessagePromptTemplate.from_template(templates_dict['system_template'], template_format='f-string'),
+                HumanMessagePromptTemplate.from_template(templates_dict['human_template'], template_format='f-string'),
+            ],
+            template_format='f-string',
+        )
+
     @overload
     def _prepare_chat_template(self) -> None:
         ...
@@ -291,36 +366,247 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
         """
         raise NotImplementedError
 
+    async def acall(
+            self,
+            state: InputT | dict,
+            runtime: RunnableConfig = None,
+            context: RunnableConfig = None,
+            config: RunnableConfig = None,
+            **kwargs
+    ):
+        """The async node function, used when the graph runs with ``ainvoke``/``astream``.
+        Default to run ``__call__`` in a worker thread, subclasses override it to await their I/O
+
+        Args:
+            Same as ``__call__``
+        Returns:
+            dict: Update state
+        """
+        return await asyncio.to_thread(self.__call__, state, runtime, context, config, **kwargs)
+
     def anchor_call(self, *args, **kwargs):
         """Use this function to generate virtual data that match output schema in reality.
         The main purpose is just test workflow but not call chat model really
         """
         raise NotImplementedError
 
-    def chat_model_call(self, formatted_prompt: Any, *args, **kwargs):
-        """This method actually calls chat model and response follow ``output_schema``"""
-        ai_message = self.chat_model.invoke(formatted_prompt)
-        self._count_tokens(ai_message)
-        while True:
-            try:
-                response = self._parse_tool_call(ai_message)
-                break
-            except BreakGraphOperation as e:
-                # Reinvoke when fail parse output
-                logger.info(ai_message)
-                logger.critical("%s. Now we don't have any handler. Stop graph operation.", e.msg)
-                exit(432)
-            except ReinvokeChat as e:
-                logger.info(ai_message)
-                self.invoke_tries += 1
-                if self.invoke_tries > self.invoke_attempts:
-                    exit(432)
+    def chat_model_call(
+            self,
+            formatted_prompt: Any,
+            *args,
+            chat_model: BaseChatModel = None,
+            return_cache_key: bool = False,
+            **kwargs
+    ):
+        """This method actually calls chat model and response follow ``output_schema``
+
+        Args:
+            formatted_prompt: The prompt
+            chat_model (BaseChatModel): Another chat model of the agent. Default to ``chat_model``
+            return_cache_key (bool): Also return the key of the response in the response cache (None when it is not
+                cached), to forget the response when it turns out to be wrong
+        """
+        chat_model = chat_model or self.chat_model
+        deadline = time.monotonic() + self.repair_deadline
+        cache_key = self._response_key(formatted_prompt, chat_model)
+        ai_message = self._cached_response(cache_key)
+        if ai_message is None:
+            ai_message = chat_model.invoke(formatted_prompt)
+            self._count_tokens(ai_message)
+            response, ai_message = self._parse_or_repair(ai_message, chat_model, deadline)
+            # only responses following the schema are replayed
+            self._cache_response(cache_key, ai_message)
+        else:
+            response = self._parse_response(ai_message, chat_model)
 
         ai_tool_message = self.create_ai_message(content=response)
         messages = [*formatted_prompt.to_messages(), ai_tool_message]
 
+        if return_cache_key:
+            return response, messages, cache_key
         return response, messages
 
+    async def achat_model_call(
+            self,
+            formatted_prompt: Any,
+            *args,
+            chat_model: BaseChatModel = None,
+            return_cache_key: bool = False,
+            **kwargs
+    ):
+        """Async version of ``chat_model_call``, the event loop is not blocked while waiting for the model
+
+        Args:
+            Same as ``chat_model_call``
+        """
+        chat_model = chat_model or self.chat_model
+        deadline = time.monotonic() + self.repair_deadline
+        cache_key = self._response_key(formatted_prompt, chat_model)
+        ai_message = self._cached_response(cache_key)
+        if ai_message is None:
+            ai_message = await chat_model.ainvoke(formatted_prompt)
+            self._count_tokens(ai_message)
+            response, ai_message = await self._aparse_or_repair(ai_message, chat_model, deadline)
+            # only responses following the schema are replayed
+            self._cache_response(cache_key, ai_message)
+        else:
+            response = self._parse_response(ai_message, chat_model)
+
+        ai_tool_message = self.create_ai_message(content=response)
+        messages = [*formatted_prompt.to_messages(), ai_tool_message]
+
+        if return_cache_key:
+            return response, messages, cache_key
+        return response, messages
+
+    def _response_key(self, formatted_prompt: Any, chat_model: BaseChatModel) -> Optional[str]:
+        """Key of the response in the response cache, None when responses are not cached"""
+        if not self.cache_responses or get_response_cache() is None:
+            return None
+        return response_key(chat_model, formatted_prompt.to_messages())
+
+    def _cached_response(self, cache_key: Optional[str]) -> Optional[AIMessage]:
+        if cache_key is None:
+            return None
+        ai_message = get_response_cache().get(cache_key)
+        with self._token_lock:
+            # hits are not charged in the token counts
+            if ai_message is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+        return ai_message
+
+    def _cache_response(self, cache_key: Optional[str], ai_message: AIMessage):
+        if cache_key is not None:
+            get_response_cache().put(cache_key, ai_message)
+
+    def _forget_response(self, cache_key: Optional[str]):
+        """Remove a cached response which turned out to be wrong, so that the prompt calls the model again"""
+        if cache_key is not None and get_response_cache() is not None:
+            get_response_cache().delete(cache_key)
+
+    def _parse_or_repair(self, ai_message: AIMessage, chat_model: BaseChatModel, deadline: float) \
+            -> tuple[Any, AIMessage]:
+        """Parse an output following the output schema. A malformed output is parsed tolerantly, otherwise it is sent
+        back to the model with the repair prompt, up to ``invoke_attempts`` times with exponential backoff
+
+        Returns:
+            The response and the message it is parsed from, to be cached
+        Raises:
+            StructuredOutputError: The output is not repaired before the deadline or within the attempts
+        """
+        try:
+            return self._parse_first(ai_message, chat_model), ai_message
+        except NotReturnStructuredOutput:
+            pass
+
+        repairs = 0
+        for attempt in range(self.invoke_attempts):
+            delay = self._repair_delay(attempt, deadline)
+            if delay is None:
+                break
+            time.sleep(delay)
+
+            repairs += 1
+            self._record_parse(chat_model, 'repairs')
+            ai_message = chat_model.invoke(self._prepare_repair_prompt(ai_message, chat_model))
+            self._count_tokens(ai_message)
+            try:
+                response = self._parse_response(ai_message, chat_model)
+            except NotReturnStructuredOutput:
+                continue
+            self._record_parse(chat_model, 'repaired')
+            return response, ai_message
+
+        raise self._repair_failed(ai_message, chat_model, repairs)
+
+    async def _aparse_or_repair(self, ai_message: AIMessage, chat_model: BaseChatModel, deadline: float) \
+            -> tuple[Any, AIMessage]:
+        """Async version of ``_parse_or_repair``"""
+        try:
+            return self._parse_first(ai_message, chat_model), ai_message
+        except NotReturnStructuredOutput:
+            pass
+
+        repairs = 0
+        for attempt in range(self.invoke_attempts):
+            delay = self._repair_delay(attempt, deadline)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+            repairs += 1
+            self._record_parse(chat_model, 'repairs')
+            ai_message = await chat_model.ainvoke(self._prepare_repair_prompt(ai_message, chat_model))
+            self._count_tokens(ai_message)
+            try:
+                response = self._parse_response(ai_message, chat_model)
+            except NotReturnStructuredOutput:
+                continue
+            self._record_parse(chat_model, 'repaired')
+            return response, ai_message
+
+        raise self._repair_failed(ai_message, chat_model, repairs)
+
+    def _parse_first(self, ai_message: AIMessage, chat_model: BaseChatModel) -> Any:
+        """Parse the first output of a call, counting how it is parsed"""
+        try:
+            response = self._parse_structured(ai_message, chat_model)
+            self._record_parse(chat_model, 'calls')
+            return response
+        except NotReturnStructuredOutput:
+            self._record_parse(chat_model, 'calls', 'parse_failures')
+
+        response = self._parse_partial_json(ai_message, first_field=self._native_schema_of(chat_model) is not None)
+        if response is None:
+            raise NotReturnStructuredOutput(f"The '{self.name}' agent does not return the output schema")
+        self._record_parse(chat_model, 'partial')
+        return response
+
+    def _parse_response(self, ai_message: AIMessage, chat_model: BaseChatModel) -> Any:
+        """Parse an output following the output schema, else tolerantly parse a malformed one
+
+        Raises:
+            NotReturnStructuredOutput: Nothing is recovered from the output
+        """
+        try:
+            return self._parse_structured(ai_message, chat_model)
+        except NotReturnStructuredOutput:
+            response = self._parse_partial_json(ai_message, first_field=self._native_schema_of(chat_model) is not None)
+            if response is None:
+                raise
+            return response
+
+    def _parse_structured(self, ai_message: AIMessage, chat_model: BaseChatModel) -> Any:
+        """Parse an output in the mode of the chat model"""
+        schema = self._native_schema_of(chat_model)
+        if schema is None:
+            return self._parse_tool_call(ai_message)
+        return self._parse_native(ai_message, schema)
+
+    @classmethod
+    def _native_schema_of(cls, chat_model: BaseChatModel) -> Optional[type[BaseModel]]:
+        """The pydantic schema of a chat model bound with a native structured output, None if it uses tools"""
+        response_format = getattr(chat_model, 'kwargs', {}).get('response_format')
+        if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+            return response_format
+        return None
+
+    def _parse_native(self, ai_message: AIMessage, schema: type[BaseModel]) -> Any:
+        # parsed by the client, or a dict when the message is replayed from the response cache
+        parsed = ai_message.additional_kwargs.get('parsed') or ai_message.content
+        try:
+            if isinstance(parsed, str):
+                output = schema.model_validate_json(parsed)
+            else:
+                output = schema.model_validate(parsed)
+        except ValidationError as e:
+            raise NotReturnStructuredOutput(f"The '{self.name}' agent does not return the output schema: {e}")
+
+        # same as the tool call, the schema has only one field
+        return next(iter(output.model_dump().values()))
+
     def _parse_tool_call(self, ai_message: AIMessage) -> Any:
         try:
             dict_output = ai_message.tool_calls[-1]['args']
@@ -331,8 +617,8 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
             try:
                 # try to parse when the content may be ```json\n{}\n```
                 return self._parse_json_string(ai_message.content)
-            except CanNotParseJsonString as e:
-                raise BreakGraphOperation(msg=e.msg)
+            except (CanNotParseJsonString, ValueError, AttributeError) as e:
+                raise NotReturnStructuredOutput(getattr(e, 'msg', None) or str(e))
 
     def _parse_json_string(self, text: str):
         import json, re
@@ -346,13 +632,98 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
 
         raise CanNotParseJsonString(f"The '{self.name}' agent cannot return formatted schema".upper())
 
+    def _parse_partial_json(self, ai_message: AIMessage, first_field: bool = False) -> Any:
+        """Tolerant parse of a truncated or malformed output (e.g. unclosed strings or brackets) of the invalid tool call,
+        else of the content. None if nothing is recovered
+
+        Args:
+            ai_message (AIMessage): The output
+            first_field (bool): The content is the output schema, e.g. in ``native`` mode, take its only field
+        """
+        candidates = []
+        if ai_message.invalid_tool_calls:
+            candidates.append((ai_message.invalid_tool_calls[-1].get('args'), True))
+        candidates.append((ai_message.content, first_field))
+
+        for text, is_output_schema in candidates:
+            if not isinstance(text, str) or '{' not in text:
+                continue
+            try:
+                output = parse_partial_json(text[text.index('{'):])
+            except ValueError:
+                continue
+            if not isinstance(output, dict) or not output:
+                continue
+            # same as the parsed tool call or JSON content
+            return next(iter(output.values())) if is_output_schema else output
+
+        return None
+
+    def _prepare_repair_prompt(self, ai_message: AIMessage, chat_model: BaseChatModel) -> Any:
+        invalid_tool_calls = ai_message.invalid_tool_calls
+        output = (invalid_tool_calls[-1].get('args') if invalid_tool_calls else None) or ai_message.content
+        # the tools bound to the chat model including the output schema, or its native output schema
+        bound_kwargs = getattr(chat_model, 'kwargs', {})
+        schema = (bound_kwargs.get('tools') or bound_kwargs.get('ls_structured_output_format', {}).get('schema')
+                  or self.output_schema)
+
+        return self.repair_template.invoke({
+            'schema': json.dumps(schema, default=str),
+            'output': output if isinstance(output, str) else json.dumps(output, default=str),
+        })
+
+    def _repair_delay(self, attempt: int, deadline: float) -> Optional[float]:
+        """Seconds to wait before a repair call, the first one is immediate. None when the deadline would pass"""
+        delay = self.repair_backoff * 2 ** (attempt - 1) if attempt else 0.
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def _repair_failed(self, ai_message: AIMessage, chat_model: BaseChatModel, repairs: int) \
+            -> StructuredOutputError:
+        self._record_parse(chat_model, 'failed')
+        logger.info(ai_message)
+        msg = (f"The '{self.name}' agent cannot return the output schema with '{self._model_name_of(chat_model)}' "
+               f"after {repairs} repairs")
+        logger.error(msg)
+        return StructuredOutputError(msg=msg)
+
+    @classmethod
+    def _model_name_of(cls, chat_model: BaseChatModel) -> Optional[str]:
+        # a chat model bound with tools is a binding of the model
+        return getattr(getattr(chat_model, 'bound', chat_model), 'model_name', None)
+
+    def _record_parse(self, chat_model: BaseChatModel, *counters: str):
+        mode = 'tool' if self._native_schema_of(chat_model) is None else 'native'
+        with self._token_lock:
+            stats = self.parse_stats.setdefault(
+                f"{self._model_name_of(chat_model)} ({mode})", dict.fromkeys(self.PARSE_COUNTERS, 0)
+            )
+            for counter in counters:
+                stats[counter] += 1
+
+    def _parse_stats_prep(self) -> dict:
+        """First try, parse failure and repair rates per model and mode"""
+        prep = dict()
+        with self._token_lock:
+            for model_mode, stats in self.parse_stats.items():
+                calls = stats['calls'] or 1
+                prep[model_mode] = {
+                    **stats,
+                    'first_try_rate': round(1 - stats['parse_failures'] / calls, 3),
+                    'failure_rate': round(stats['parse_failures'] / calls, 3),
+                    'repair_rate': round(stats['repaired'] / calls, 3),
+                }
+        return prep
+
     def _get_ai_message_metadata(self, ai_message: AIMessage):
         ...
 
     def _count_tokens(self, ai_message: AIMessage):
         usage_metadata = ai_message.usage_metadata
-        self.num_input_tokens += usage_metadata['input_tokens']
-        self.num_output_tokens += usage_metadata['output_tokens']
+        with self._token_lock:
+            self.num_input_tokens += usage_metadata['input_tokens']
+            self.num_output_tokens += usage_metadata['output_tokens']
 
     def _get_tool_call(self, ai_message):
         tool_call = {}
@@ -413,7 +784,8 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
         return his_conversation
 
     def _used_token_prep(self):
-        return f'Input tokens: {self.num_input_tokens}, Output tokens: {self.num_output_tokens}'
+        return (f'Input tokens: {self.num_input_tokens}, Output tokens: {self.num_output_tokens}, '
+                f'Cached responses: {self.cache_hits} hits, {self.cache_misses} misses')
 
     def _print_used_tokens(self, _logger):
         _logger.info(f'Input tokens: {self.num_input_tokens}, output tokens: {self.num_output_tokens}')
@@ -421,4 +793,7 @@ class AgentAsNode(BaseAgent, Generic[StateT, ContextT, InputT, OutputT]):
     def _finish_session(self, _logger, conversation):
         self.log_conversation(_logger, conversation)
         _logger.info(self._used_token_prep())
+        if self.use_model:
+            _logger.info(f"Structured outputs: {self._parse_stats_prep()}")
+            _logger.info(f"Rate limiters: {rate_limiter_stats()}")
         _logger.info(self.ending_symbols)
@@ -6,6 +6,8 @@ import logging
 
 from .graph import BaseGraph
 from .mapping import get_class
+from ..executor import configure_executor
+from ..llm import configure_llm
 
 logger = logging.getLogger(__name__)
 
@@ -26,3 +28,13 @@ class Coordinator:
     def build_graph(cls, nodes, **graph_config):
         logger.info(f"Build the graph")
         return BaseGraph(name='The entire graph', nodes=nodes, **graph_config)
+
+    @classmethod
+    def build_executor(cls, executor_config):
+        logger.info(f"Configure script executor: warm={executor_config.warm}")
+        configure_executor(**executor_config)
+
+    @classmethod
+    def build_llm(cls, llm_config):
+        logger.info(f"Configure chat model clients")
+        configure_llm(**llm_config)
@@ -5,8 +5,9 @@
 import logging
 import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import AsyncIterator, Optional, Union
 
+from langchain_core.runnables import RunnableLambda
 from langchain_core.runnables.graph import MermaidDrawMethod
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.config import RunnableConfig
@@ -125,7 +126,8 @@ class BaseGraph(Generic[StateT, ContextT, InputT, OutputT, NodeT]):
             name_node = self.standardize_name_node(node.name)
             self.graph.add_node(
                 node=name_node,
-                action=node,
+                # the async function is used when the graph runs with `ainvoke`/`astream`
+                action=RunnableLambda(node.__call__, afunc=node.acall, name=name_node),
                 metadata=node.metadata,
                 input_schema=node.input_schema
             )
@@ -170,12 +172,39 @@ class BaseGraph(Generic[StateT, ContextT, InputT, OutputT, NodeT]):
                 logger.info('Operate task')
                 self.state = self._invoke(input=task)
         except BreakGraphOperation as e:
-            self.state = e.state
+            self.state = self._state_on_break(e)
 
+        return self._prepare_result()
+
+    async def acall(self, task, prompt, *args, **kwargs):
+        """Async version of ``__call__``"""
+        try:
+            if prompt:
+                logger.info('Operate prompt')
+                self.state = await self._aresume(input=prompt)
+            else:
+                logger.info('Operate task')
+                self.state = await self._ainvoke(input=task)
+        except BreakGraphOperation as e:
+            self.state = self._state_on_break(e)
+
+        return self._prepare_result()
+
+    def _state_on_break(self, e: BreakGraphOperation, config: Optional[RunnableConfig] = None) -> dict:
+        """State to keep when the operation breaks, an error raised without state (e.g. by a chat model call)
+        keeps the latest checkpoint of the thread of ``config``"""
+        if e.state is not None:
+            return e.state
+
+        state = dict(self.complied_graph.get_state(config or self.config).values)
+        state['msg'] = e.msg
+        return state
+
+    def _prepare_result(self):
         if "__interrupt__" in self.state:
             self.state = self.state['__interrupt__'][0].value
 
-        images = self.state.get('rendered_images', None)
+        images = self.state.get('final_images', None) or self.state.get('rendered_images', None)
         if not images:
             images = [None, None, None, None]
 
@@ -203,7 +232,7 @@ class BaseGraph(Generic[StateT, ContextT, InputT, OutputT, NodeT]):
                 self.state = self._resume(additional_prompt)
 
         except BreakGraphOperation as e:
-            self.state = e.state
+            self.state = self._state_on_break(e, config)
             # AgentAsNode.log_conversation(logger, e.state['messages'])
             return self.state.get('msg', None)
 
@@ -223,12 +252,74 @@ class BaseGraph(Generic[StateT, ContextT, InputT, OutputT, NodeT]):
         inputs = self._convert_input(input)
         self.state = self.complied_graph.invoke(
             input=inputs,
-            config=self.config,
+            config=config or self.config,
             context=context,
         )
 
         return self.state
 
+    async def ainvoke(
+            self,
+            inputs: Union[StateT, InputT, str],
+            context: Optional[ContextT] = None,
+            config: Optional[RunnableConfig] = None,
+    ):
+        """Async version of ``invoke``, runs until the graph is interrupted for an additional prompt
+
+        Returns:
+            The state, or the interrupted state waiting for an additional prompt
+        """
+        try:
+            self.state = await self._ainvoke(inputs, context=context, config=config)
+        except BreakGraphOperation as e:
+            self.state = self._state_on_break(e, config)
+
+        return self.state
+
+    async def astream(
+            self,
+            inputs: Union[StateT, InputT, str],
+            context: Optional[ContextT] = None,
+            config: Optional[RunnableConfig] = None,
+            stream_mode: str = 'updates',
+    ) -> AsyncIterator:
+        """Stream the updates of every node as soon as it finishes
+
+        Args:
+            inputs (str, dict): Task or input state. A ``Command`` resumes the interrupted graph
+            context:
+            config:
+            stream_mode (str): See ``CompiledStateGraph.astream``
+        """
+        if not isinstance(inputs, Command):
+            inputs = self._convert_input(inputs)
+        async for chunk in self.complied_graph.astream(
+                input=inputs,
+                config=config or self.config,
+                context=context,
+                stream_mode=stream_mode,
+        ):
+            yield chunk
+
+    async def _ainvoke(
+            self,
+            input: Union[StateT, InputT, str, Command],
+            context: Optional[ContextT] = None,
+            config: Optional[RunnableConfig] = None,
+    ):
+        """Async version of ``_invoke``"""
+        inputs = input if isinstance(input, Command) else self._convert_input(input)
+        self.state = await self.complied_graph.ainvoke(
+            input=inputs,
+            config=config or self.config,
+            context=context,
+        )
+
+        return self.state
+
+    async def _aresume(self, input):
+        return await self._ainvoke(Command(resume=input), config=self.config)
+
     def _convert_input(self, inputs):
         if isinstance(inputs, str):
             inputs = {'task': inputs}
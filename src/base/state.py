@@ -124,6 +124,13 @@ class VerificationState(BaseState):
     additional_prompt: Annotated[str, ...]
     """Additional prompt provided by user"""
 
+    image_diffs: Annotated[dict[int, dict], ...]
+    """Pixel and average hash differences of every before/after pair
+    ``
+        {<int>: {"mad": <float>, "hash_distance": <int>, "unchanged": <bool>}}
+    ``
+    """
+
 
 @register(type='state', name='user')
 class UserPromptUpState(BaseState):
@@ -138,6 +145,9 @@ class UserPromptUpState(BaseState):
     rendered_images: Annotated[Sequence[str], ...]
     """Sequence of rendered image paths after criticising"""
 
+    final_images: Annotated[Sequence[str], ...]
+    """Sequence of image paths rendered with the full quality profile, returned to user"""
+
 
 @register(type='state', name='shared')
 class SharedState(
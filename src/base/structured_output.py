@@ -2,7 +2,7 @@
 #  Copyright (c) 2025
 #  Minh NGUYEN <vnguyen9@lakeheadu.ca>
 #
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 from typing_extensions import Sequence
@@ -13,9 +13,13 @@ __all__ = [
     "BaseOutput",
     "PlannerOutput",
     "RetrieverOutput",
+    "RetrieverBatchOutput",
     "CodingOutput",
+    "CodingEditOutput",
     "CriticOutput",
     "VerificationOutput",
+    "SummaryCriticOutput",
+    "SummaryVerificationOutput",
 ]
 
 
@@ -40,6 +44,21 @@ class RetrieverOutput(BaseOutput):
         description="Summary of query and retrieved documents.")
 
 
+class QuerySummary(BaseOutput):
+    """Summary of the retrieved documents of one query"""
+
+    index: int = Field(description="Index of the query, as given")
+
+    summary: str = Field(description="Summary of the query and its retrieved documents")
+
+
+@register(type='structured_output', name='retriever_batch')
+class RetrieverBatchOutput(BaseOutput):
+    """Always use this tool to structure your response when several queries are given"""
+
+    summaries: Sequence[QuerySummary] = Field(description="One summary for every given query, tagged by its index")
+
+
 @register(type='structured_output', name='coding')
 class CodingOutput(BaseOutput):
     """Always use this output schema to response when generating code"""
@@ -48,6 +67,24 @@ class CodingOutput(BaseOutput):
         description="Generated script. NOTE: only use 'script' as a key, no any additional prefix or/and suffix character")
 
 
+class ScriptEdit(BaseOutput):
+    """A search/replace edit of the current script"""
+
+    search: str = Field(
+        description="Lines copied exactly from the current script, with enough context to occur only once. "
+                    "Empty to append 'replace' at the end of the script")
+
+    replace: str = Field(description="Lines replacing 'search'")
+
+
+@register(type='structured_output', name='coding_edit')
+class CodingEditOutput(BaseOutput):
+    """Always use this output schema to response when editing the current script"""
+
+    edits: Sequence[ScriptEdit] = Field(
+        description="Edits applied in order to the current script. Only the changed lines, never the whole script")
+
+
 class CriticFixPair(BaseOutput):
     """The output schema for a single pair of critic and fix"""
 
@@ -56,6 +93,9 @@ class CriticFixPair(BaseOutput):
     solution: str = Field(description="A solution (action, adjustment) that used by coding agent to "
                                       "modify the script and fix the critic")
 
+    view: Optional[int] = Field(
+        default=None, description="Index of the view (image) having the critic, only when several views are given")
+
 
 @register(type='structured_output', name='critic')
 class CriticOutput(BaseOutput):
@@ -96,6 +136,9 @@ class CriticSatisfiedSolution(BaseOutput):
         description="The solution that will be applied to fix the remaining critic. Set 'None' if satisfied = True"
                     "DO NOT use the same value as 'solution' input.")
 
+    view: Optional[int] = Field(
+        default=None, description="Index of the view (pair of images) verified, only when several views are given")
+
 
 @register(type='structured_output', name='verification')
 class VerificationOutput(BaseOutput):
@@ -106,3 +149,39 @@ class VerificationOutput(BaseOutput):
                     "list of dictionary if verify user needs to verify 'critic and solutions' "
                     "OR "
                     "a dictionary if if verify user needs to verify 'prompt'")
+
+
+class SummaryCriticReview(BaseOutput):
+    """Review of a scene from its text summary"""
+
+    critic_solution_list: Sequence[CriticFixPair] = Field(
+        description="List of (critic, solution) pairs found from the scene summary, every pair tagged by view index")
+
+    escalate_views: Sequence[int] = Field(
+        description="Indices of views that must be inspected on images, because the summary is not enough to judge them")
+
+
+@register(type='structured_output', name='summary_critic')
+class SummaryCriticOutput(BaseOutput):
+    """Output schema for the critic agent reviewing a scene summary"""
+
+    review: SummaryCriticReview = Field(description="Critics found from the summary and views to inspect on images")
+
+
+class SummaryVerificationReview(BaseOutput):
+    """Verification of a change from the scene summaries before and after it"""
+
+    css_list: Sequence[CriticSatisfiedSolution] = Field(
+        description="Verification of every critic (or of the prompt) that can be judged from the summaries, "
+                    "tagged by view index")
+
+    escalate_views: Sequence[int] = Field(
+        description="Indices of views that must be verified on images, because the summaries are not enough")
+
+
+@register(type='structured_output', name='summary_verification')
+class SummaryVerificationOutput(BaseOutput):
+    """Output schema for the verification agent comparing scene summaries"""
+
+    review: SummaryVerificationReview = Field(
+        description="Verification from the summaries and views to verify on images")
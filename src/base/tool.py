@@ -3,16 +3,23 @@
 #  Minh NGUYEN <vnguyen9@lakeheadu.ca>
 #
 import os.path
-import subprocess
 from typing import Any, Optional
 
 from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import tool
+from langchain_core.tools import tool, StructuredTool
 
 
-@tool(parse_docstring=True)
-def execute_script(
+def _execute_script(
         script: str,
+        warm: bool = None,
+        timeout: float = None,
+        max_rss_mb: float = None,
+        stop_on_traceback: bool = False,
+        max_output_bytes: int = None,
+        compact_error: bool = False,
+        preflight: bool = False,
+        save_blend: str = None,
+        line_offset: int = 0,
         run_manager: Optional[CallbackManagerForToolRun] = None,
         **kwargs: Any
 ) -> Any:
@@ -20,29 +27,92 @@ def execute_script(
 
     Args:
         script (str): raw script or file of script
+        warm (bool): execute in the warm Blender worker instead of a fresh process
+        timeout (float): wall-clock limit in seconds, the process tree is killed on breach
+        max_rss_mb (float): resident memory limit in MB, the process tree is killed on breach
+        stop_on_traceback (bool): stop the script as soon as it writes a complete traceback
+        max_output_bytes (int): keep at most this tail of stdout and stderr each
+        compact_error (bool): return the parsed error (type, message, failing line, last frames) instead of stderr
+        preflight (bool): check syntax and bpy symbols statically first, the script is not executed if it fails
+        save_blend (str): save the resulting scene to this .blend file if the script does not raise
+        line_offset (int): number of lines prepended to the checked code, subtracted from the reported line numbers
         run_manager (Optional[CallbackManagerForToolRun]):
 
     Returns: Any
     """
+    from src.executor import run_script
+
+    script = _script_file(script)
+    result = _preflight(script, preflight)
+    if result is None:
+        result = run_script(
+            script,
+            warm=warm,
+            timeout=timeout,
+            max_rss_mb=max_rss_mb,
+            stop_on_traceback=stop_on_traceback,
+            max_output_bytes=max_output_bytes,
+            save_blend=save_blend
+        )
+
+    return _format_result(result, compact_error, script, line_offset)
+
+
+async def _aexecute_script(
+        script: str,
+        warm: bool = None,
+        timeout: float = None,
+        max_rss_mb: float = None,
+        stop_on_traceback: bool = False,
+        max_output_bytes: int = None,
+        compact_error: bool = False,
+        preflight: bool = False,
+        save_blend: str = None,
+        line_offset: int = 0,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any
+) -> Any:
+    # async version of `_execute_script`, awaits the shared pool instead of blocking the event loop
+    from src.executor import arun_script
+
+    script = _script_file(script)
+    result = _preflight(script, preflight)
+    if result is None:
+        result = await arun_script(
+            script,
+            warm=warm,
+            timeout=timeout,
+            max_rss_mb=max_rss_mb,
+            stop_on_traceback=stop_on_traceback,
+            max_output_bytes=max_output_bytes,
+            save_blend=save_blend
+        )
+
+    return _format_result(result, compact_error, script, line_offset)
+
+
+def _script_file(script: str) -> str:
     if not os.path.isfile(script):
         from src.utils import write_script
         script = write_script(script)
+    return script
+
+
+def _preflight(script: str, preflight: bool) -> Optional[dict]:
+    if not preflight:
+        return None
+    from src.executor import preflight_script
+    return preflight_script(script)
 
-    process = subprocess.Popen(
-        args=['python', script],
-        shell=False,
-        restore_signals=True,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        universal_newlines=True
-    )
-    stdout, stderr = process.communicate()
-    result = {"error": stderr, 'stdout': stdout, 'returncode': process.returncode}
-
-    process.terminate()
-    process.kill()
-    process.wait()
+
+def _format_result(result: dict, compact_error: bool, script: str, line_offset: int) -> str:
+    if line_offset:
+        from src.executor import shift_error_lines
+        shift_error_lines(result, script, line_offset)
+
+    if compact_error and result['exception']:
+        from src.executor import format_error
+        result['error'] = format_error(result['exception'])
 
     if len(result['error']) == 0:
         result['error'] = "❇️ ❇️ ❇️ ❇️ ❇️ 👍 👍 👍 👍 👍 NO ERROR 👍 👍 👍 👍 👍 ❇️ ❇️ ❇️ ❇️ ❇️"
@@ -50,6 +120,14 @@ def execute_script(
     return result['error']
 
 
+execute_script = StructuredTool.from_function(
+    func=_execute_script,
+    coroutine=_aexecute_script,
+    name='execute_script',
+    parse_docstring=True,
+)
+
+
 @tool(parse_docstring=True)
 def write_script(script: str, file_path: str = None,
                  run_manager: Optional[CallbackManagerForToolRun] = None) -> None | str:
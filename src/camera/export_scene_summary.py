@@ -0,0 +1,61 @@
+import json as js
+
+import bpy
+from mathutils import Vector
+
+
+def _round(values):
+    return [round(v, 4) for v in values]
+
+
+def _material_summary(material):
+    summary = {"name": material.name}
+    if material.use_nodes and material.node_tree:
+        for node in material.node_tree.nodes:
+            if node.type == 'BSDF_PRINCIPLED':
+                summary["base_color"] = _round(node.inputs["Base Color"].default_value)
+                summary["metallic"] = round(node.inputs["Metallic"].default_value, 4)
+                summary["roughness"] = round(node.inputs["Roughness"].default_value, 4)
+                break
+    else:
+        summary["base_color"] = _round(material.diffuse_color)
+    return summary
+
+
+scene_objects = []
+for obj in bpy.context.scene.objects:
+    # cameras are added to render views, they are listed in "views"
+    if obj.type == 'CAMERA':
+        continue
+
+    corners = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
+    scene_objects.append({
+        "name": obj.name,
+        "type": obj.type,
+        "parent": obj.parent.name if obj.parent else None,
+        "location": _round(obj.matrix_world.translation),
+        "bbox_min": _round([min(c[i] for c in corners) for i in range(3)]),
+        "bbox_max": _round([max(c[i] for c in corners) for i in range(3)]),
+        "dimensions": _round(obj.dimensions),
+        "visible": obj.visible_get(),
+        "materials": [_material_summary(slot.material) for slot in obj.material_slots if slot.material],
+        "modifiers": [{"name": m.name, "type": m.type} for m in obj.modifiers],
+    })
+
+# views in the same order as the rendered images
+views = sorted(cameras, key=lambda cam: cam["filepath"])
+scene_summary = {
+    "objects": scene_objects,
+    "views": [
+        {
+            "view": i,
+            "camera": cam["object"].name,
+            "location": _round(cam["object"].location),
+            "rotation_euler": _round(cam["object"].rotation_euler),
+        }
+        for i, cam in enumerate(views)
+    ],
+}
+
+with open("{{scene_summary_file}}", 'w') as f:
+    js.dump(scene_summary, f, indent=1)
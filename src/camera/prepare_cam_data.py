@@ -4,6 +4,7 @@ import bpy
 
 camera_template_file = '{{camera_template_file}}'
 save_dir = "{{save_dir}}"
+render_profile = {{render_profile}}
 
 with open(camera_template_file, 'r') as f:
     camera_data = js.load(f)
@@ -12,8 +13,46 @@ with open(camera_template_file, 'r') as f:
 scene = bpy.context.scene
 
 scene.render.image_settings.file_format = 'PNG'
-scene.render.resolution_x = 1920
-scene.render.resolution_y = 1024
+scene.render.resolution_x = render_profile.get('resolution_x', 1920)
+scene.render.resolution_y = render_profile.get('resolution_y', 1024)
+scene.render.resolution_percentage = render_profile.get('resolution_percentage', 100)
+
+# Render profile: engine, samples, denoising and image compression
+engine = render_profile.get('engine')
+if engine:
+    engine = {'EEVEE': 'BLENDER_EEVEE', 'WORKBENCH': 'BLENDER_WORKBENCH'}.get(engine.upper(), engine.upper())
+    # EEVEE is named 'BLENDER_EEVEE_NEXT' in some Blender versions
+    for name in (engine, engine + '_NEXT'):
+        try:
+            scene.render.engine = name
+            break
+        except TypeError:
+            pass
+
+samples = render_profile.get('samples')
+denoise = render_profile.get('denoise')
+if scene.render.engine == 'CYCLES':
+    if samples:
+        scene.cycles.samples = samples
+    if denoise is not None:
+        scene.cycles.use_denoising = denoise
+elif scene.render.engine.startswith('BLENDER_EEVEE'):
+    if samples:
+        scene.eevee.taa_render_samples = samples
+elif scene.render.engine == 'BLENDER_WORKBENCH':
+    if samples:
+        # nearest anti-aliasing level of Workbench
+        levels = [1, 5, 8, 11, 16, 32]
+        level = min(levels, key=lambda n: abs(n - samples))
+        scene.display.render_aa = 'FXAA' if level == 1 else str(level)
+if denoise is False and hasattr(scene.render, 'use_compositing'):
+    # skip compositor denoise nodes
+    scene.render.use_compositing = False
+
+if render_profile.get('compression') is not None:
+    scene.render.image_settings.compression = render_profile['compression']
+if render_profile.get('color_depth'):
+    scene.render.image_settings.color_depth = str(render_profile['color_depth'])
 
 cameras = []
 for data in camera_data:
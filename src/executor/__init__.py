@@ -0,0 +1,47 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+from .artifacts import OPEN_BLEND_TEMPLATE, script_hash
+from .cache import RenderCache, render_key
+from .errors import parse_error, format_error, shift_error_lines
+from .pool import ExecutorPool
+from .preflight import build_api_index, load_api_index, preflight_check
+from .runner import (
+    arun_script,
+    blend_file_for,
+    configure_executor,
+    get_api_index,
+    get_pool,
+    get_render_cache,
+    preflight_script,
+    run_script,
+    submit_script,
+    shutdown_executor
+)
+from .worker import BlenderWorker
+
+__all__ = [
+    "BlenderWorker",
+    "ExecutorPool",
+    "RenderCache",
+    "render_key",
+    "OPEN_BLEND_TEMPLATE",
+    "script_hash",
+    "blend_file_for",
+    "parse_error",
+    "format_error",
+    "shift_error_lines",
+    "build_api_index",
+    "load_api_index",
+    "preflight_check",
+    "configure_executor",
+    "get_api_index",
+    "get_pool",
+    "get_render_cache",
+    "preflight_script",
+    "run_script",
+    "arun_script",
+    "submit_script",
+    "shutdown_executor",
+]
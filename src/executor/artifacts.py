@@ -0,0 +1,49 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import glob
+import logging
+import os
+
+import xxhash
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "SAVE_BLEND_TEMPLATE",
+    "OPEN_BLEND_TEMPLATE",
+    "script_hash",
+    "prune_blend_files",
+]
+
+SAVE_BLEND_TEMPLATE = """
+
+# ---------- appended by the executor: save the error-free scene ----------
+import bpy as _bpy
+_bpy.ops.wm.save_as_mainfile(filepath=r'{blend_file}', copy=True)
+"""
+"""Appended to a script to save its resulting scene"""
+
+OPEN_BLEND_TEMPLATE = """import bpy
+
+# ---------- the scene saved by the coding agent, instead of re-executing the creation script ----------
+bpy.ops.wm.open_mainfile(filepath=r'{blend_file}')
+"""
+"""Replace a creation script by loading its saved scene"""
+
+
+def script_hash(script: str) -> str:
+    return xxhash.xxh3_128_hexdigest(script.encode())
+
+
+def prune_blend_files(blend_dir: str, max_files: int = None):
+    """Remove the least recently used .blend files beyond ``max_files``"""
+    if not max_files:
+        return
+    files = sorted(glob.glob(os.path.join(blend_dir, '*.blend')), key=os.path.getmtime, reverse=True)
+    for file in files[max_files:]:
+        try:
+            os.remove(file)
+        except OSError:
+            pass
@@ -0,0 +1,138 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Optional, Sequence
+
+import xxhash
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "RenderCache",
+    "render_key",
+]
+
+
+def render_key(script: str, camera_template: str, render_profile: dict = None) -> str:
+    """Content address of the images rendered from a script
+
+    Args:
+        script (str): The creation script
+        camera_template (str): Content of the camera template file (JSON)
+        render_profile (dict): Render settings
+    """
+    hasher = xxhash.xxh3_128()
+    for part in (script, camera_template, json.dumps(render_profile or {}, sort_keys=True)):
+        hasher.update(part.encode())
+        # separator, so that parts cannot be shifted into each other
+        hasher.update(b'\x00')
+    return hasher.hexdigest()
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class RenderCache:
+    """A size-bounded, least recently used cache of rendered images on disk
+
+    Every entry is a directory ``<cache_dir>/<key>`` holding the images, its mtime is the last use.
+    Images are hard-linked (copied across file systems) from and to the render directories,
+    so that an evicted entry never removes images referenced by a state.
+    """
+
+    def __init__(self, cache_dir: str, max_mb: float = None, **kwargs):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str, save_dir: str) -> Optional[list[str]]:
+        """Put the cached images of ``key`` into ``save_dir``
+
+        Returns: None | list[str]
+            None on a miss, otherwise sorted image paths in ``save_dir``
+        """
+        entry = os.path.join(self.cache_dir, key)
+        with self._lock:
+            try:
+                names = sorted(os.listdir(entry))
+            except FileNotFoundError:
+                names = []
+            if not names:
+                self.misses += 1
+                return None
+
+            os.makedirs(save_dir, exist_ok=True)
+            paths = []
+            for name in names:
+                path = os.path.join(save_dir, name)
+                _link_or_copy(os.path.join(entry, name), path)
+                paths.append(path)
+            # keep it as recently used
+            os.utime(entry)
+            self.hits += 1
+
+        return paths
+
+    def put(self, key: str, image_paths: Sequence[str]):
+        """Store rendered images under ``key`` then evict the least recently used entries"""
+        if not image_paths:
+            return
+        entry = os.path.join(self.cache_dir, key)
+        # fill a temporary directory, then rename it, so that a partial entry is never read
+        tmp_entry = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}")
+        os.makedirs(tmp_entry)
+        for path in image_paths:
+            _link_or_copy(path, os.path.join(tmp_entry, os.path.basename(path)))
+
+        with self._lock:
+            try:
+                os.rename(tmp_entry, entry)
+            except OSError:
+                # stored concurrently
+                shutil.rmtree(tmp_entry, ignore_errors=True)
+            self._evict()
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate(), 3),
+        }
+
+    def _evict(self):
+        if not self.max_bytes:
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if name.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(entry) if f.is_file())
+            entries.append((os.path.getmtime(entry), size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        # the oldest first
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info(f"Evict render cache entry '{entry}'")
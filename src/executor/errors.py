@@ -0,0 +1,147 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import os
+import re
+from typing import Optional
+
+__all__ = [
+    "parse_error",
+    "format_error",
+    "shift_error_lines",
+]
+
+TRACEBACK_HEADER = 'Traceback (most recent call last):'
+
+FRAME_PATTERN = re.compile(r'^  File "(?P<file>.+)", line (?P<line>\d+)(?:, in (?P<function>.+))?$')
+
+EXCEPTION_PATTERN = re.compile(r'^(?P<type>[A-Za-z_][\w.]*): ?(?P<message>.*)$')
+
+CHAIN_MARKERS = ('During handling of the above exception', 'The above exception was the direct cause')
+
+
+def _exception_message(lines: list[str], start: int, max_lines: int = 5) -> str:
+    message = [EXCEPTION_PATTERN.match(lines[start])['message'], ]
+    for line in lines[start + 1:start + max_lines]:
+        if not line.strip() or line.startswith(CHAIN_MARKERS) or line.startswith(TRACEBACK_HEADER):
+            break
+        message.append(line.strip())
+
+    return '\n'.join(message)
+
+
+def parse_error(error: str, script_path: str = None, n_frames: int = 3) -> Optional[dict]:
+    """Parse stderr of a script into a compact structured error
+
+    The last traceback is used when tracebacks are chained. Without traceback (e.g. the job was killed by a limit),
+    the last exception-like line is used.
+
+    Args:
+        error (str): stderr of the script
+        script_path (str): File of script, used to find the failing line of the script itself
+        n_frames (int): Number of last frames to keep
+
+    Returns: None | dict
+        ``{"type", "message", "line", "code", "frames"}``, where ``line``/``code`` is the failing line of the script
+        (None if not found) and ``frames`` are dicts ``{"file", "line", "function", "code"}``
+    """
+    if not error or not error.strip():
+        return None
+
+    lines = error.splitlines()
+    headers = [i for i, line in enumerate(lines) if line.startswith(TRACEBACK_HEADER)]
+    start = headers[-1] if headers else 0
+
+    frames = []
+    exception_at = None
+    for i in range(start, len(lines)):
+        line = lines[i]
+        match = FRAME_PATTERN.match(line)
+        if match:
+            code = lines[i + 1].strip() if i + 1 < len(lines) and lines[i + 1].startswith('    ') else ''
+            frames.append({
+                'file': match['file'],
+                'line': int(match['line']),
+                'function': match['function'],
+                'code': code,
+            })
+            continue
+        if not line.strip() or line[0].isspace():
+            continue
+        # the exception line only follows frames, e.g. not noise of Blender before a SyntaxError
+        if (headers or frames) and EXCEPTION_PATTERN.match(line):
+            exception_at = i
+            break
+
+    if exception_at is None and not headers:
+        for i in range(len(lines) - 1, -1, -1):
+            if lines[i].strip() and not lines[i][0].isspace() and EXCEPTION_PATTERN.match(lines[i]):
+                exception_at = i
+                break
+
+    if exception_at is None:
+        return None
+
+    script_frame = dict()
+    if script_path:
+        name = os.path.basename(script_path)
+        script_frames = [f for f in frames if os.path.basename(f['file']) == name]
+        script_frame = script_frames[-1] if script_frames else dict()
+
+    return {
+        'type': EXCEPTION_PATTERN.match(lines[exception_at])['type'],
+        'message': _exception_message(lines, exception_at),
+        'line': script_frame.get('line', None),
+        'code': script_frame.get('code', None),
+        'frames': frames[-n_frames:],
+    }
+
+
+def format_error(exception: dict) -> str:
+    """Format a structured error (see ``parse_error``) as a short text for prompts and retrieval queries"""
+    text = f"{exception['type']}: {exception['message']}"
+    if exception['line'] is not None:
+        text += f"\n  at line {exception['line']} of the script: {exception['code']}"
+    if exception['frames']:
+        text += "\n  last frames:"
+        for frame in exception['frames']:
+            function = f", in {frame['function']}" if frame['function'] else ''
+            text += f"\n    {os.path.basename(frame['file'])}, line {frame['line']}{function}: {frame['code']}"
+
+    return text
+
+
+def shift_error_lines(result: dict, script_path: str, n_lines: int) -> dict:
+    """Report the error of a script against the code following its first ``n_lines`` lines
+
+    Used when a prefix (e.g. loading a saved scene) is prepended to the code, so that line numbers point into the
+    code itself. Lines within the prefix are left as they are.
+
+    Args:
+        result (dict): Result of ``run_script``, its ``error`` and ``exception`` are updated in place
+        script_path (str): File of script
+        n_lines (int): Number of lines of the prefix
+    """
+    if not n_lines:
+        return result
+
+    def shift(line: int) -> int:
+        return line - n_lines if line > n_lines else line
+
+    name = os.path.basename(script_path)
+    if result.get('error'):
+        result['error'] = re.sub(
+            rf'(File "[^"]*{re.escape(name)}", line )(\d+)',
+            lambda match: match[1] + str(shift(int(match[2]))),
+            result['error']
+        )
+    exception = result.get('exception')
+    if exception:
+        if exception['line'] is not None:
+            exception['line'] = shift(exception['line'])
+        for frame in exception['frames']:
+            if os.path.basename(frame['file']) == name:
+                frame['line'] = shift(frame['line'])
+
+    return result
@@ -0,0 +1,45 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+"""Dump the installed bpy API into a JSON index, used by the pre-flight check
+
+``{{index_file}}`` is replaced before execution, see ``build_api_index``.
+"""
+import json as js
+
+import bpy
+
+index_file = '{{index_file}}'
+
+
+def public(obj):
+    return sorted(name for name in dir(obj) if not name.startswith('_'))
+
+
+def operator_properties(module, name):
+    try:
+        rna = getattr(getattr(bpy.ops, module), name).get_rna_type()
+        return [p.identifier for p in rna.properties if p.identifier != 'rna_type']
+    except (AttributeError, KeyError, RuntimeError):
+        # unknown properties, keywords are not checked
+        return None
+
+
+api_index = {
+    'version': bpy.app.version_string,
+    'modules': public(bpy),
+    'ops': {
+        module: {name: operator_properties(module, name) for name in public(getattr(bpy.ops, module))}
+        for module in public(bpy.ops)
+    },
+    'types': public(bpy.types),
+    'data': public(bpy.data),
+    'app': public(bpy.app),
+    'path': public(bpy.path),
+    'props': public(bpy.props),
+    'utils': public(bpy.utils),
+}
+
+with open(index_file, 'w') as f:
+    js.dump(obj=api_index, fp=f)
@@ -0,0 +1,218 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import itertools
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from .artifacts import SAVE_BLEND_TEMPLATE
+from .errors import parse_error
+from .worker import BlenderWorker
+from ..utils.exception import WorkerNotAvailable
+from ..utils.file import execute_file
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorPool:
+    """The Executor Pool class
+
+    A fixed number of executors (warm ``BlenderWorker`` or fresh ``python`` processes) that run submitted
+    script files in parallel. The script is read when it is submitted, so the caller can overwrite its script file
+    right after submitting. Every job runs a snapshot of it in its own directory, created when the job starts.
+    """
+
+    def __init__(
+            self,
+            n_workers: int = None,
+            warm: bool = None,
+            python: str = None,
+            reset_scene: bool = None,
+            startup_timeout: float = None,
+            jobs_dir: str = None,
+            keep_job_dirs: bool = None,
+            **kwargs
+    ):
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.warm = bool(warm)
+        self.python = python or 'python'
+        self.jobs_dir = jobs_dir or 'assets/executor/jobs'
+        self.keep_job_dirs = bool(keep_job_dirs)
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+        self._workers = queue.SimpleQueue()
+        for _ in range(self.n_workers):
+            self._workers.put(BlenderWorker(python=python, reset_scene=reset_scene, startup_timeout=startup_timeout))
+        self._executor = ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix='blender-executor')
+
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'queued': 0,
+            'running': 0,
+            'completed': 0,
+            'failed': 0,
+            'killed': 0,
+            'total_wait_seconds': 0.,
+            'total_run_seconds': 0.,
+        }
+
+    def submit(
+            self,
+            script_path: str,
+            cwd: str = None,
+            warm: bool = None,
+            timeout: float = None,
+            max_rss_mb: float = None,
+            stop_on_traceback: bool = False,
+            max_output_bytes: int = None,
+            save_blend: str = None,
+    ) -> Future:
+        """Submit a script file to be executed
+
+        Args:
+            script_path (str): File of script
+            cwd (str): Working directory of the job. Default to current working directory
+            warm (bool): Use a warm worker. Default to the ``warm`` setting of the pool
+            timeout (float): Wall-clock limit of the job in seconds (excluding queueing), no limit if None
+            max_rss_mb (float): Resident memory limit of the job in MB, no limit if None
+            stop_on_traceback (bool): Stop the job as soon as a complete traceback is written
+            max_output_bytes (int): Keep at most this tail of stdout and stderr each, no limit if None
+            save_blend (str): Save the resulting scene to this .blend file if the script does not raise
+
+        Returns: Future
+            Resolved to ``{"error", "stdout", "returncode", "killed", "exception", "elapsed", "wait"}``,
+            ``exception`` is the parsed error (see ``parse_error``) or None
+        """
+        job_id = next(self._job_ids)
+        with open(script_path) as f:
+            script = f.read()
+        if save_blend:
+            os.makedirs(os.path.dirname(os.path.abspath(save_blend)), exist_ok=True)
+            script += SAVE_BLEND_TEMPLATE.format(blend_file=os.path.abspath(save_blend))
+
+        with self._lock:
+            self._stats['submitted'] += 1
+            self._stats['queued'] += 1
+
+        return self._executor.submit(
+            self._run_job,
+            job_id=job_id,
+            script=script,
+            source_path=script_path,
+            cwd=os.path.abspath(cwd or os.getcwd()),
+            warm=self.warm if warm is None else warm,
+            options={
+                'timeout': timeout,
+                'max_rss_mb': max_rss_mb,
+                'stop_on_traceback': stop_on_traceback,
+                'max_output_bytes': max_output_bytes
+            },
+            submitted_at=time.perf_counter(),
+        )
+
+    def _run_job(
+            self,
+            job_id: int,
+            script: str,
+            source_path: str,
+            cwd: str,
+            warm: bool,
+            options: dict,
+            submitted_at: float
+    ) -> dict:
+        start = time.perf_counter()
+        with self._lock:
+            self._stats['queued'] -= 1
+            self._stats['running'] += 1
+
+        # the directory is created here, a job cancelled before it starts leaves nothing behind
+        # unique across pools and processes sharing 'jobs_dir'
+        job_dir = tempfile.mkdtemp(prefix=f"{job_id}-", dir=self.jobs_dir)
+        worker = self._workers.get()
+        try:
+            script_path = os.path.join(job_dir, os.path.basename(source_path))
+            with open(script_path, mode='w') as f:
+                f.write(script)
+            result = self._execute(worker, script_path, cwd, warm, options)
+            # the snapshot is removed with the job directory, report the script of the caller instead
+            for key in ('error', 'stdout'):
+                result[key] = self._restore_script_path(result[key], script_path, source_path)
+            result['exception'] = parse_error(result['error'], source_path)
+            result['wait'] = start - submitted_at
+            logger.info(f"Executed '{source_path}' in {result['elapsed']:.2f}s "
+                        f"({'warm' if result.pop('warm') else 'cold'}, waited {result['wait']:.2f}s)")
+            if result['killed']:
+                logger.warning(f"Killed '{source_path}': exceeded {result['killed']} limit "
+                               f"(timeout: {options['timeout']}, max_rss_mb: {options['max_rss_mb']})")
+        finally:
+            self._workers.put(worker)
+            if not self.keep_job_dirs:
+                shutil.rmtree(job_dir, ignore_errors=True)
+
+            with self._lock:
+                self._stats['running'] -= 1
+                self._stats['completed'] += 1
+                self._stats['total_wait_seconds'] += start - submitted_at
+                self._stats['total_run_seconds'] += time.perf_counter() - start
+
+        if result['returncode'] != 0:
+            with self._lock:
+                self._stats['failed'] += 1
+                self._stats['killed'] += bool(result['killed'])
+
+        return result
+
+    @staticmethod
+    def _restore_script_path(text: Optional[str], snapshot_path: str, script_path: str) -> Optional[str]:
+        """Replace the path of the snapshot of a job with the path of the submitted script"""
+        if not text:
+            return text
+        # absolute first, the relative path may be a part of it
+        for path in dict.fromkeys((os.path.abspath(snapshot_path), snapshot_path)):
+            text = text.replace(path, script_path)
+        return text
+
+    def _execute(self, worker: BlenderWorker, script_path: str, cwd: str, warm: bool, options: dict) -> dict:
+        if warm:
+            try:
+                result = worker.execute(script_path, cwd=cwd, **options)
+                result['warm'] = True
+                return result
+            except WorkerNotAvailable as e:
+                logger.warning(f"{e}. Fall back to a fresh process")
+
+        start = time.perf_counter()
+        result = execute_file(script_path, cwd=cwd, python=self.python, **options)
+        result['elapsed'] = time.perf_counter() - start
+        result['warm'] = False
+
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        completed = stats['completed'] or 1
+        stats['mean_wait_seconds'] = stats.pop('total_wait_seconds') / completed
+        stats['mean_run_seconds'] = stats.pop('total_run_seconds') / completed
+        stats['n_workers'] = self.n_workers
+
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        while True:
+            try:
+                worker: Optional[BlenderWorker] = self._workers.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
@@ -0,0 +1,227 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import ast
+import json as js
+import logging
+import os
+import tempfile
+import time
+import traceback
+from typing import Optional, Callable
+
+from .errors import parse_error
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "INTROSPECT_FILE",
+    "build_api_index",
+    "load_api_index",
+    "preflight_check",
+]
+
+INTROSPECT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'introspect_bpy.py')
+
+# sub-modules of bpy whose first-level attributes are indexed
+INDEXED_MODULES = ('data', 'app', 'path', 'props', 'utils')
+
+
+def build_api_index(index_file: str, run: Callable[[str], dict]) -> dict:
+    """Generate the index of the installed bpy API by introspection, and store it on disk
+
+    Args:
+        index_file (str): Destination of the index (JSON)
+        run (Callable): Function executing a script file with ``bpy``, e.g. ``run_script``
+
+    Returns: dict
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(index_file)), exist_ok=True)
+    with open(INTROSPECT_FILE, mode='r') as f:
+        script = f.read().replace("{{index_file}}", os.path.abspath(index_file))
+
+    fd, script_path = tempfile.mkstemp(suffix='.py', prefix='introspect_bpy_')
+    with os.fdopen(fd, mode='w') as f:
+        f.write(script)
+    try:
+        result = run(script_path)
+    finally:
+        os.remove(script_path)
+
+    if result['returncode'] != 0:
+        raise RuntimeError(f"Cannot build bpy API index: {result['error']}")
+    logger.info(f"Write bpy API index to '{index_file}'")
+
+    return load_api_index(index_file)
+
+
+def load_api_index(index_file: str) -> Optional[dict]:
+    if not os.path.isfile(index_file):
+        return None
+    with open(index_file, mode='r') as f:
+        return js.load(f)
+
+
+def _aliases(tree: ast.Module) -> dict[str, str]:
+    """Names bound to bpy or its sub-modules, e.g. ``{"bpy": "bpy", "O": "bpy.ops"}``"""
+    aliases = dict()
+    for node in _walk_imports(tree):
+        if isinstance(node, ast.Import):
+            for name in node.names:
+                if name.name == 'bpy' or name.name.startswith('bpy.'):
+                    if name.asname:
+                        aliases[name.asname] = name.name
+                    else:
+                        aliases['bpy'] = 'bpy'
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            if node.module == 'bpy' or node.module.startswith('bpy.'):
+                for name in node.names:
+                    aliases[name.asname or name.name] = f"{node.module}.{name.name}"
+
+    return aliases
+
+
+def _walk_imports(tree: ast.Module):
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+
+
+def _imported_chains(tree: ast.Module) -> list[tuple[int, list[str]]]:
+    """Chains imported with ``from bpy... import ...``, e.g. ``from bpy.types import Operator``"""
+    chains = []
+    for node in _walk_imports(tree):
+        if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            if node.module == 'bpy' or node.module.startswith('bpy.'):
+                chains.extend((node.lineno, f"{node.module}.{name.name}".split('.')) for name in node.names)
+
+    return chains
+
+
+def _dotted(node: ast.AST, aliases: dict[str, str]) -> Optional[list[str]]:
+    """Resolve ``b.ops.mesh.foo`` into ``['bpy', 'ops', 'mesh', 'foo']``"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name) or node.id not in aliases:
+        return None
+
+    return aliases[node.id].split('.') + parts[::-1]
+
+
+def _check_chain(chain: list[str], index: dict) -> Optional[tuple[str, str]]:
+    """Check an attribute chain rooted at bpy, return ``(exception_type, message)`` of the first unknown symbol"""
+    if len(chain) < 2:
+        return None
+
+    module = chain[1]
+    if module not in index['modules']:
+        return 'AttributeError', f"module 'bpy' has no attribute '{module}'"
+    if len(chain) < 3:
+        return None
+
+    name = chain[2]
+    if module == 'ops':
+        if name not in index['ops']:
+            return 'AttributeError', f"module 'bpy.ops' has no attribute '{name}'"
+        if len(chain) > 3 and chain[3] not in index['ops'][name]:
+            return 'AttributeError', f"Calling operator \"bpy.ops.{name}.{chain[3]}\" error, could not be found"
+    elif module == 'types':
+        if name not in index['types']:
+            return 'AttributeError', f"module 'bpy.types' has no attribute '{name}'"
+    elif module in INDEXED_MODULES:
+        if name not in index[module]:
+            return 'AttributeError', f"module 'bpy.{module}' has no attribute '{name}'"
+
+    return None
+
+
+def _check_keywords(chain: list[str], call: ast.Call, index: dict) -> Optional[tuple[str, str]]:
+    if len(chain) != 4 or chain[1] != 'ops':
+        return None
+    properties = index['ops'].get(chain[2], {}).get(chain[3], None)
+    if properties is None:
+        return None
+
+    for keyword in call.keywords:
+        # '**kwargs' has no name
+        if keyword.arg is not None and keyword.arg not in properties:
+            return 'TypeError', f"Converting py args to operator properties:: keyword \"{keyword.arg}\" unrecognized"
+
+    return None
+
+
+def _format_problem(script_path: str, lines: list[str], lineno: int, problem: tuple[str, str]) -> str:
+    code = lines[lineno - 1].strip() if 0 < lineno <= len(lines) else ''
+    return (f"Traceback (most recent call last):\n"
+            f"  File \"{script_path}\", line {lineno}, in <module>\n"
+            f"    {code}\n"
+            f"{problem[0]}: {problem[1]}\n")
+
+
+def preflight_check(script_path: str, index: Optional[dict]) -> Optional[dict]:
+    """Check a script without executing it: compile it, then check every ``bpy.*`` attribute chain
+    and operator keyword against the bpy API index. ``bpy.context`` is dynamic and not checked.
+
+    Args:
+        script_path (str): File of script
+        index (dict): The bpy API index, only the syntax is checked if None
+
+    Returns: None | dict
+        None if no problem found, otherwise the same result as ``run_script`` for the first problem
+    """
+    start = time.perf_counter()
+    with open(script_path, mode='r') as f:
+        source = f.read()
+
+    error = None
+    try:
+        tree = ast.parse(source, filename=script_path)
+        compile(tree, script_path, 'exec')
+    except SyntaxError as e:
+        error = ''.join(traceback.format_exception_only(type(e), e))
+        tree = None
+
+    if tree is not None and index is not None:
+        aliases = _aliases(tree)
+        lines = source.splitlines()
+        # only the outermost attribute of every chain, e.g. 'a.b.c' but not 'a.b'
+        inner = {id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Attribute)}
+        calls = {id(node.func): node for node in ast.walk(tree) if isinstance(node, ast.Call)}
+
+        problems = []
+        for lineno, chain in _imported_chains(tree):
+            problem = _check_chain(chain, index)
+            if problem is not None:
+                problems.append((lineno, problem))
+
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Attribute) or id(node) in inner:
+                continue
+            chain = _dotted(node, aliases)
+            if chain is None or chain[0] != 'bpy':
+                continue
+            problem = _check_chain(chain, index)
+            if problem is None and id(node) in calls:
+                problem = _check_keywords(chain, calls[id(node)], index)
+            if problem is not None:
+                problems.append((node.lineno, problem))
+
+        if problems:
+            lineno, problem = min(problems, key=lambda p: p[0])
+            error = _format_problem(script_path, lines, lineno, problem)
+
+    if error is None:
+        return None
+
+    return {
+        'error': error,
+        'stdout': '',
+        'returncode': 1,
+        'killed': None,
+        'exception': parse_error(error, script_path),
+        'elapsed': time.perf_counter() - start,
+        'wait': 0.,
+    }
@@ -0,0 +1,156 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import asyncio
+import atexit
+import logging
+import os
+from concurrent.futures import Future
+from typing import Optional
+
+from .artifacts import script_hash, prune_blend_files
+from .cache import RenderCache
+from .pool import ExecutorPool
+from .preflight import build_api_index, load_api_index, preflight_check
+
+logger = logging.getLogger(__name__)
+
+_CONFIG = {
+    'warm': False,
+    'n_workers': 1,
+    'python': 'python',
+    'reset_scene': True,
+    'startup_timeout': 120.,
+    'jobs_dir': 'assets/executor/jobs',
+    'keep_job_dirs': False,
+    'bpy_index_file': 'assets/bpy_api_index.json',
+    'blend_dir': 'assets/blend_files',
+    'max_blend_files': 50,
+    'render_cache_dir': None,
+    'render_cache_max_mb': None,
+}
+
+_POOL: Optional[ExecutorPool] = None
+
+_API_INDEX: Optional[dict] = None
+
+_RENDER_CACHE: Optional[RenderCache] = None
+
+
+def configure_executor(**kwargs):
+    """Update the settings of script execution, see ``configs/executor.yaml``"""
+    global _API_INDEX, _RENDER_CACHE
+
+    _CONFIG.update({k: v for k, v in kwargs.items() if k in _CONFIG and v is not None})
+    # settings of the pool could change, relaunch lazily
+    shutdown_executor()
+    _API_INDEX = None
+    _RENDER_CACHE = None
+
+
+def get_pool() -> ExecutorPool:
+    """Get the pool shared by all agents and sessions in this process"""
+    global _POOL
+
+    if _POOL is None:
+        _POOL = ExecutorPool(**_CONFIG)
+    return _POOL
+
+
+def get_api_index() -> Optional[dict]:
+    """Get the bpy API index, generated once by introspection if the index file does not exist"""
+    global _API_INDEX
+
+    if _API_INDEX is None:
+        _API_INDEX = load_api_index(_CONFIG['bpy_index_file'])
+    if _API_INDEX is None:
+        try:
+            _API_INDEX = build_api_index(_CONFIG['bpy_index_file'], run=run_script)
+        except RuntimeError as e:
+            logger.warning(f"{e}. The pre-flight check only checks the syntax")
+            # do not retry for every script
+            _API_INDEX = dict()
+
+    return _API_INDEX or None
+
+
+def preflight_script(script_path: str) -> Optional[dict]:
+    """Check a script statically before starting any process
+
+    Returns: None | dict
+        None if no problem found, otherwise the same result as ``run_script``
+    """
+    result = preflight_check(script_path, get_api_index())
+    if result is not None:
+        logger.info(f"Pre-flight check of '{script_path}' found {result['exception']['type']} "
+                    f"in {result['elapsed'] * 1000:.1f}ms")
+
+    return result
+
+
+def blend_file_for(script: str) -> str:
+    """The .blend file holding the scene built by a script, keyed by the hash of the script"""
+    os.makedirs(_CONFIG['blend_dir'], exist_ok=True)
+    prune_blend_files(_CONFIG['blend_dir'], _CONFIG['max_blend_files'])
+    return os.path.join(_CONFIG['blend_dir'], f"{script_hash(script)}.blend")
+
+
+def get_render_cache() -> Optional[RenderCache]:
+    """Get the render cache shared by all agents, None if it is disabled"""
+    global _RENDER_CACHE
+
+    if _RENDER_CACHE is None and _CONFIG['render_cache_dir']:
+        _RENDER_CACHE = RenderCache(_CONFIG['render_cache_dir'], max_mb=_CONFIG['render_cache_max_mb'])
+    return _RENDER_CACHE
+
+
+def submit_script(script_path: str, warm: bool = None, **options) -> Future:
+    """Submit a script file to the shared pool without waiting for it
+
+    Args:
+        script_path (str): File of script
+        warm (bool): Use a warm worker. Default to the ``warm`` setting
+        **options: ``timeout``, ``max_rss_mb``, ``stop_on_traceback``, ``max_output_bytes``, ``save_blend``,
+            see ``ExecutorPool.submit``
+
+    Returns: Future
+    """
+    return get_pool().submit(script_path, warm=warm, **options)
+
+
+def run_script(script_path: str, warm: bool = None, **options) -> dict:
+    """Execute a script file and wait for the result
+
+    Args:
+        script_path (str): File of script
+        warm (bool): Use a warm worker. Default to the ``warm`` setting
+        **options: ``timeout``, ``max_rss_mb``, ``stop_on_traceback``, ``max_output_bytes``, ``save_blend``,
+            see ``ExecutorPool.submit``
+
+    Returns: dict
+        ``{"error": <stderr>, "stdout": <stdout>, "returncode": <int>, "killed": None | 'timeout' | 'memory',
+        "exception": None | dict, "elapsed": <seconds>, "wait": <seconds>}``
+    """
+    return submit_script(script_path, warm=warm, **options).result()
+
+
+async def arun_script(script_path: str, warm: bool = None, **options) -> dict:
+    """Async version of ``run_script``, the event loop is not blocked while the script runs in the pool
+
+    Returns: dict
+        Same as ``run_script``
+    """
+    return await asyncio.wrap_future(submit_script(script_path, warm=warm, **options))
+
+
+def shutdown_executor():
+    global _POOL
+
+    if _POOL is not None:
+        logger.info(f"Shutdown executor pool: {_POOL.stats()}")
+        _POOL.shutdown()
+        _POOL = None
+
+
+atexit.register(shutdown_executor)
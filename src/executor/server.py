@@ -0,0 +1,147 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+"""The Blender worker server
+
+This file is executed as a standalone script by ``BlenderWorker``. It imports ``bpy`` once, listens for
+the parent process and executes jobs (script files) one by one, each on a factory-reset scene.
+It MUST NOT import anything from ``src``.
+"""
+import io
+import os
+import sys
+import time
+import traceback
+from argparse import ArgumentParser
+from contextlib import redirect_stdout, redirect_stderr
+from multiprocessing.connection import Listener
+
+import bpy
+
+TRACEBACK_HEADER = 'Traceback (most recent call last):'
+
+
+class TracebackWritten(BaseException):
+    """Raised inside the script once it has written a complete traceback"""
+
+
+class TracebackGuard(io.StringIO):
+    """Capture stderr and, if enabled, stop the script as soon as it writes a complete traceback
+    (e.g. ``traceback.print_exc()`` in an ``except`` block that lets the script go on)"""
+
+    def __init__(self, enabled: bool = False):
+        super().__init__()
+        self.enabled = enabled
+        self._line = ''
+        self._in_traceback = False
+
+    def write(self, s):
+        n = super().write(s)
+        if not self.enabled:
+            return n
+
+        self._line += s
+        *lines, self._line = self._line.split('\n')
+        for line in lines:
+            if line.startswith(TRACEBACK_HEADER):
+                self._in_traceback = True
+            elif self._in_traceback and line.strip() and not line[0].isspace():
+                self.enabled = False
+                raise TracebackWritten
+
+        return n
+
+
+def get_args():
+    parser = ArgumentParser()
+    parser.add_argument('--host', required=False, default='127.0.0.1')
+    parser.add_argument('--port', required=True, type=int)
+    parser.add_argument('--authkey', required=True, help='Hex-encoded authentication key')
+
+    return parser.parse_args()
+
+
+def reset_scene():
+    """Load factory settings, i.e. the same scene as a fresh ``import bpy``"""
+    bpy.ops.wm.read_factory_settings(use_empty=False)
+
+
+def exec_script(script_path: str, stderr: TracebackGuard):
+    """Execute a script as ``__main__`` and return its returncode"""
+    try:
+        with open(script_path, mode='r') as f:
+            code = compile(f.read(), script_path, 'exec')
+    except SyntaxError as e:
+        # the same output as 'python <script>'
+        traceback.print_exception(type(e), e, None)
+        return 1
+
+    try:
+        exec(code, {'__name__': '__main__', '__file__': script_path})
+    except TracebackWritten:
+        return 1
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        stderr.enabled = False
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException as e:
+        # skip the frame of this function
+        stderr.enabled = False
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        return 1
+
+    return 0
+
+
+def run_job(job: dict):
+    script_path = job['script']
+    stdout, stderr = io.StringIO(), TracebackGuard(enabled=job.get('stop_on_traceback', False))
+    cwd, argv = os.getcwd(), sys.argv
+
+    start = time.perf_counter()
+    try:
+        if job.get('reset', True):
+            reset_scene()
+        os.chdir(job.get('cwd') or cwd)
+        sys.argv = [script_path, ]
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            returncode = exec_script(script_path, stderr)
+    except BaseException:
+        stderr.write(traceback.format_exc())
+        returncode = 1
+    finally:
+        os.chdir(cwd)
+        sys.argv = argv
+
+    return {
+        'error': stderr.getvalue(),
+        'stdout': stdout.getvalue(),
+        'returncode': returncode,
+        'job_seconds': time.perf_counter() - start,
+    }
+
+
+def main(args):
+    listener = Listener((args.host, args.port), authkey=bytes.fromhex(args.authkey))
+    conn = listener.accept()
+    conn.send({'pid': os.getpid(), 'version': bpy.app.version_string})
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        conn.send(run_job(job))
+
+    conn.close()
+    listener.close()
+
+
+if __name__ == '__main__':
+    args = get_args()
+    main(args)
@@ -0,0 +1,193 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import logging
+import os
+import secrets
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Connection
+from typing import Optional
+
+from ..utils.exception import WorkerNotAvailable
+from ..utils.process import POLL_INTERVAL, cap_output, exceeded_limits, kill_process_tree, limit_error
+
+logger = logging.getLogger(__name__)
+
+SERVER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+
+
+class BlenderWorker:
+    """The Blender Worker class
+
+    A long-lived Python process with ``bpy`` already imported, so a script check does not pay for
+    the ``bpy`` import. Jobs are sent over a local authenticated connection and each job runs on a
+    factory-reset scene, returning the same ``error``/``stdout``/``returncode`` as ``execute_file``.
+    """
+
+    def __init__(
+            self,
+            python: str = None,
+            reset_scene: bool = None,
+            startup_timeout: float = None,
+    ):
+        self.python = python or 'python'
+        self.reset_scene = True if reset_scene is None else reset_scene
+        self.startup_timeout = startup_timeout or 120.
+
+        self.process: Optional[subprocess.Popen] = None
+        self.conn: Optional[Connection] = None
+        self._stderr_file = None
+        self._lock = threading.Lock()
+
+        self.cold_start_seconds: float = 0.
+        """Time to launch the process and import ``bpy``"""
+
+        self.n_jobs: int = 0
+        """Number of executed jobs"""
+
+        self.total_job_seconds: float = 0.
+        """Total round-trip time of executed jobs"""
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None and self.conn is not None
+
+    def start(self):
+        """Launch the worker process and wait until ``bpy`` is imported"""
+        authkey = secrets.token_bytes(16)
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+
+        start = time.perf_counter()
+        self._stderr_file = tempfile.TemporaryFile(mode='w+')
+        self.process = subprocess.Popen(
+            args=[self.python, SERVER_FILE, '--port', str(port), '--authkey', authkey.hex()],
+            shell=False,
+            start_new_session=True,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr_file,
+        )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while self.conn is None:
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self._stderr_file.seek(0)
+                error = self._stderr_file.read()
+                self.close()
+                raise WorkerNotAvailable(f"Cannot start Blender worker. {error}".strip())
+            try:
+                self.conn = Client(('127.0.0.1', port), authkey=authkey)
+            except ConnectionRefusedError:
+                time.sleep(0.1)
+
+        info = self.conn.recv()
+        self.cold_start_seconds = time.perf_counter() - start
+        logger.info(f"Blender worker (pid: {info['pid']}, bpy: {info['version']}) "
+                    f"is ready after {self.cold_start_seconds:.2f}s")
+
+    def execute(
+            self,
+            script_path: str,
+            cwd: str = None,
+            timeout: float = None,
+            max_rss_mb: float = None,
+            stop_on_traceback: bool = False,
+            max_output_bytes: int = None,
+    ) -> dict:
+        """Execute a script file in the warm process
+
+        The whole worker is killed when the job exceeds a limit, and relaunched by the next job.
+
+        Args:
+            script_path (str): File of script
+            cwd (str): Working directory of the job. Default to current working directory
+            timeout (float): Wall-clock limit in seconds, no limit if None
+            max_rss_mb (float): Resident memory limit of the worker in MB, no limit if None
+            stop_on_traceback (bool): Stop the script as soon as it writes a complete traceback
+            max_output_bytes (int): Keep at most this tail of stdout and stderr each, no limit if None
+
+        Returns: dict
+        """
+        with self._lock:
+            if not self.is_alive():
+                self.close()
+                self.start()
+
+            job = {
+                'script': os.path.abspath(script_path),
+                'cwd': os.path.abspath(cwd or os.getcwd()),
+                'reset': self.reset_scene,
+                'stop_on_traceback': stop_on_traceback,
+            }
+
+            start = time.perf_counter()
+            killed = None
+            try:
+                self.conn.send(job)
+                while not self.conn.poll(POLL_INTERVAL):
+                    killed = exceeded_limits(self.process.pid, start, timeout=timeout, max_rss_mb=max_rss_mb)
+                    if killed or self.process.poll() is not None:
+                        break
+
+                if killed:
+                    kill_process_tree(self.process)
+                    self.close()
+                    result = {
+                        'error': limit_error(killed, timeout=timeout, max_rss_mb=max_rss_mb),
+                        'stdout': '',
+                        'returncode': -9,
+                    }
+                else:
+                    result = self.conn.recv()
+            except (EOFError, OSError):
+                # the script crashed the whole process (e.g. segmentation fault in Blender)
+                returncode = self.process.wait()
+                self.close()
+                result = {
+                    'error': f"Blender worker died while executing '{script_path}' (returncode: {returncode})",
+                    'stdout': '',
+                    'returncode': returncode or 1,
+                }
+            result['killed'] = killed
+            result['error'] = cap_output(result['error'], max_output_bytes)
+            result['stdout'] = cap_output(result['stdout'], max_output_bytes)
+            result['elapsed'] = time.perf_counter() - start
+
+            self.n_jobs += 1
+            self.total_job_seconds += result['elapsed']
+
+        return result
+
+    def stats(self) -> dict:
+        return {
+            'cold_start_seconds': self.cold_start_seconds,
+            'n_jobs': self.n_jobs,
+            'mean_job_seconds': self.total_job_seconds / self.n_jobs if self.n_jobs else 0.,
+        }
+
+    def close(self):
+        """Stop the worker process"""
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.conn.close()
+            self.conn = None
+
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+        if self._stderr_file is not None:
+            self._stderr_file.close()
+            self._stderr_file = None
@@ -0,0 +1,29 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+from .cache import ResponseCache, response_key
+from .rate_limiter import AdaptiveRateLimiter, retry_after
+from .registry import (
+    configure_llm,
+    get_chat_model,
+    get_http_clients,
+    get_rate_limiter,
+    get_response_cache,
+    key_label,
+    rate_limiter_stats
+)
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "ResponseCache",
+    "response_key",
+    "retry_after",
+    "configure_llm",
+    "get_chat_model",
+    "get_http_clients",
+    "get_rate_limiter",
+    "get_response_cache",
+    "key_label",
+    "rate_limiter_stats",
+]
@@ -0,0 +1,146 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+import xxhash
+import zstandard
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict, messages_to_dict
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ResponseCache",
+    "response_key",
+]
+
+
+def response_key(chat_model: Any, messages: Sequence[BaseMessage]) -> str:
+    """Content address of the response of a chat model to messages
+
+    Args:
+        chat_model: The chat model, its bound tools (e.g. the output schema) are part of the key
+        messages (Sequence[BaseMessage]): The formatted prompt
+    """
+    # a chat model bound with tools is a binding of the model
+    model = getattr(chat_model, 'bound', chat_model)
+    parts = {
+        'model_name': getattr(model, 'model_name', None),
+        'base_url': getattr(model, 'openai_api_base', None),
+        'temperature': getattr(model, 'temperature', None),
+        'bound': getattr(chat_model, 'kwargs', None),
+        'messages': messages_to_dict(messages),
+    }
+    return xxhash.xxh3_128_hexdigest(json.dumps(parts, sort_keys=True, default=str).encode())
+
+
+def _to_json(obj: Any) -> Any:
+    # e.g. the output parsed by the client in a native structured output, replayed as a dict
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    return str(obj)
+
+
+class ResponseCache:
+    """A persistent cache of chat model responses, in a SQLite file
+
+    Responses are stored zstd-compressed. Entries older than ``ttl_seconds`` expire, the least recently used entries
+    are evicted beyond ``max_mb``.
+    """
+
+    def __init__(self, cache_file: str, ttl_seconds: float = None, max_mb: float = None, level: int = 3, **kwargs):
+        self.cache_file = cache_file
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        self.level = level
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(cache_file):
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        # shared by the threads of the process, every access holds the lock
+        self._connection = sqlite3.connect(cache_file, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, created REAL NOT NULL, "
+            "accessed REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[BaseMessage]:
+        """The cached response of ``key``, None on a miss or if it expired"""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            # keep it as recently used
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+
+        content = zstandard.ZstdDecompressor().decompress(row[0])
+        return messages_from_dict([json.loads(content)])[0]
+
+    def put(self, key: str, message: BaseMessage):
+        """Store a response under ``key`` then evict expired and least recently used entries"""
+        content = json.dumps(message_to_dict(message), default=_to_json)
+        value = zstandard.ZstdCompressor(level=self.level).compress(content.encode())
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            self._evict(now)
+
+    def delete(self, key: str):
+        """Forget a response, e.g. one that turned out to be wrong"""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate(), 3),
+            'entries': entries,
+            'size_mb': round(size / 1024 / 1024, 3),
+        }
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._connection.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        if not self.max_bytes:
+            return
+
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # the least recently used first
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.info(f"Evict {len(evicted)} cached responses")
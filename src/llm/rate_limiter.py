@@ -0,0 +1,160 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import asyncio
+import email.utils
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+from langchain_core.rate_limiters import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "retry_after",
+]
+
+
+def retry_after(headers: httpx.Headers) -> Optional[float]:
+    """Seconds to wait before the next request, from ``retry-after-ms`` or ``retry-after`` (seconds or HTTP date)"""
+    if 'retry-after-ms' in headers:
+        try:
+            return float(headers['retry-after-ms']) / 1000.
+        except ValueError:
+            pass
+    if 'retry-after' in headers:
+        value = headers['retry-after']
+        try:
+            return float(value)
+        except ValueError:
+            date = email.utils.parsedate_to_datetime(value) if value else None
+            if date is not None:
+                return max(0., date.timestamp() - time.time())
+
+    return None
+
+
+class AdaptiveRateLimiter(BaseRateLimiter):
+    """A token bucket whose rate follows what the provider allows (additive increase, multiplicative decrease)
+
+    The rate grows by ``additive_increase`` after every successful response and is multiplied by
+    ``multiplicative_decrease`` on every 429 response. A ``Retry-After`` header blocks all requests until it passes.
+    Responses are observed with ``on_response``/``aon_response``, hooks of the HTTP clients of the chat models.
+    """
+
+    def __init__(
+            self,
+            requests_per_second: float = 1.,
+            min_requests_per_second: float = 0.05,
+            max_requests_per_second: float = None,
+            additive_increase: float = 0.05,
+            multiplicative_decrease: float = 0.5,
+            max_bucket_size: float = 1,
+            check_every_n_seconds: float = 0.1,
+            name: str = None,
+            **kwargs
+    ):
+        self.rate = requests_per_second
+        self.min_rate = min_requests_per_second
+        self.max_rate = max_requests_per_second
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.max_bucket_size = max_bucket_size
+        self.check_every_n_seconds = check_every_n_seconds
+        self.name = name
+
+        # the first request is not delayed
+        self.available_tokens = float(max_bucket_size)
+        self.last = time.monotonic()
+        self.blocked_until = 0.
+        self.queue_depth = 0
+        self.successes = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._consume()
+
+        self._enter_queue(1)
+        try:
+            while not self._consume():
+                time.sleep(self.check_every_n_seconds)
+        finally:
+            self._enter_queue(-1)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._consume()
+
+        self._enter_queue(1)
+        try:
+            while not self._consume():
+                await asyncio.sleep(self.check_every_n_seconds)
+        finally:
+            self._enter_queue(-1)
+        return True
+
+    def on_response(self, response: httpx.Response):
+        """Adapt the rate to a response of the provider"""
+        if response.status_code == 429:
+            self.on_rate_limited(retry_after(response.headers))
+        elif response.status_code < 400:
+            self.on_success()
+
+    async def aon_response(self, response: httpx.Response):
+        self.on_response(response)
+
+    def on_success(self):
+        with self._lock:
+            self.successes += 1
+            self.rate += self.additive_increase
+            if self.max_rate:
+                self.rate = min(self.rate, self.max_rate)
+
+    def on_rate_limited(self, wait: float = None):
+        with self._lock:
+            self.rate_limited += 1
+            self.rate = max(self.rate * self.multiplicative_decrease, self.min_rate)
+            self.available_tokens = 0.
+            if wait:
+                now = time.monotonic()
+                self.blocked_until = max(self.blocked_until, now + wait)
+                # no token accumulates while blocked
+                self.last = max(self.last, self.blocked_until)
+        logger.warning(f"Rate limited by the provider ({self.name}), retry after: {wait}s. {self.stats()}")
+
+    def stats(self) -> dict:
+        return {
+            'rate': round(self.rate, 3),
+            'queue_depth': self.queue_depth,
+            'successes': self.successes,
+            'rate_limited': self.rate_limited,
+            'blocked_for': round(max(0., self.blocked_until - time.monotonic()), 3),
+        }
+
+    def _enter_queue(self, n: int):
+        with self._lock:
+            self.queue_depth += n
+
+    def _consume(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return False
+
+            elapsed = now - self.last
+            if elapsed > 0:
+                self.available_tokens = min(self.available_tokens + elapsed * self.rate, self.max_bucket_size)
+                self.last = now
+            if self.available_tokens >= 1:
+                self.available_tokens -= 1
+                return True
+
+        return False
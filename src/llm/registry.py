@@ -0,0 +1,180 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+import httpx
+import xxhash
+from langchain_openai import ChatOpenAI
+
+from .cache import ResponseCache
+from .rate_limiter import AdaptiveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+_CONFIG = {
+    'rate_limiter': {
+        'requests_per_second': 1.,
+        'min_requests_per_second': 0.05,
+        'max_requests_per_second': None,
+        'additive_increase': 0.05,
+        'multiplicative_decrease': 0.5,
+        'max_bucket_size': 1,
+        'check_every_n_seconds': 0.1,
+    },
+    'providers': {},
+    'http_pool': {
+        'max_connections': 20,
+        'max_keepalive_connections': 10,
+        'keepalive_expiry': 60.,
+    },
+    'response_cache': {
+        'cache_file': None,
+        'ttl_seconds': None,
+        'max_mb': None,
+    },
+}
+
+_RATE_LIMITERS: dict[tuple, AdaptiveRateLimiter] = dict()
+
+_HTTP_CLIENTS: dict[tuple, tuple[httpx.Client, httpx.AsyncClient]] = dict()
+
+_CHAT_MODELS: dict[tuple, ChatOpenAI] = dict()
+
+_RESPONSE_CACHE: Optional[ResponseCache] = None
+
+_LOCK = threading.RLock()
+
+
+def configure_llm(
+        rate_limiter: dict = None,
+        providers: dict = None,
+        http_pool: dict = None,
+        response_cache: dict = None,
+        **kwargs
+):
+    """Update the settings of chat model clients, see ``configs/llm.yaml``
+
+    Clients, connections and rate limiters survive a rebuild of the system, only those whose settings change
+    are created again. Clients are replaced with their rate limiters and the replaced ones are closed.
+    """
+    settings = {
+        'rate_limiter': {**_CONFIG['rate_limiter'], **(rate_limiter or {})},
+        'providers': {name: dict(overrides) for name, overrides in (providers or {}).items()},
+        'http_pool': {**_CONFIG['http_pool'], **(http_pool or {})},
+        'response_cache': {**_CONFIG['response_cache'], **(response_cache or {})},
+    }
+    global _RESPONSE_CACHE
+    replaced_clients = []
+    with _LOCK:
+        if settings['response_cache'] != _CONFIG['response_cache']:
+            _RESPONSE_CACHE = None
+        limiters_changed = (
+                (settings['rate_limiter'], settings['providers']) != (_CONFIG['rate_limiter'], _CONFIG['providers'])
+        )
+        if settings['http_pool'] != _CONFIG['http_pool'] or limiters_changed:
+            # the response hooks of the clients feed the rate limiters, they are replaced together
+            replaced_clients = list(_HTTP_CLIENTS.values())
+            _HTTP_CLIENTS.clear()
+            _CHAT_MODELS.clear()
+        if limiters_changed:
+            # otherwise, limiters keep what they learned from the provider
+            _RATE_LIMITERS.clear()
+        _CONFIG.update(settings)
+
+    for clients in replaced_clients:
+        _close_http_clients(*clients)
+
+
+def _close_http_clients(http_client: httpx.Client, http_async_client: httpx.AsyncClient):
+    """Release the connection pools of replaced clients"""
+    http_client.close()
+    try:
+        # the async client is closed on the running loop, if any
+        asyncio.get_running_loop().create_task(http_async_client.aclose())
+    except RuntimeError:
+        try:
+            asyncio.run(http_async_client.aclose())
+        except RuntimeError as e:
+            # e.g. its connections are bound to a loop which is closed
+            logger.warning(f"Cannot close an async HTTP client: {e}")
+
+
+def key_label(provider: str, api_key: str) -> str:
+    """Printable identity of a (provider, API key) pair, the key itself is never logged"""
+    return f"{provider or 'openrouter'}:{xxhash.xxh3_64_hexdigest((api_key or '').encode())[:8]}"
+
+
+def get_rate_limiter(provider: str, api_key: str) -> AdaptiveRateLimiter:
+    """Get the rate limiter of a (provider, API key) pair, shared by all agents and sessions in this process"""
+    key = (provider, api_key)
+    with _LOCK:
+        if key not in _RATE_LIMITERS:
+            settings = {**_CONFIG['rate_limiter'], **_CONFIG['providers'].get(provider or 'openrouter', {})}
+            _RATE_LIMITERS[key] = AdaptiveRateLimiter(name=key_label(provider, api_key), **settings)
+            logger.info(f"Create rate limiter '{key_label(provider, api_key)}': {settings}")
+
+        return _RATE_LIMITERS[key]
+
+
+def rate_limiter_stats() -> dict[str, dict]:
+    """Current rate and queue depth of every rate limiter"""
+    with _LOCK:
+        return {limiter.name: limiter.stats() for limiter in _RATE_LIMITERS.values()}
+
+
+def get_http_clients(provider: str, base_url: str, api_key: str) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Get the sync and async HTTP clients of a (provider, base URL, API key) triple.
+    Their keep-alive connection pools are shared by all chat models of the triple, the responses feed its rate limiter.
+
+    The async client is bound to the event loop of its first request, i.e. one loop per process.
+    """
+    key = (provider, base_url, api_key)
+    with _LOCK:
+        if key not in _HTTP_CLIENTS:
+            rate_limiter = get_rate_limiter(provider, api_key)
+            limits = httpx.Limits(**_CONFIG['http_pool'])
+            _HTTP_CLIENTS[key] = (
+                httpx.Client(limits=limits, event_hooks={'response': [rate_limiter.on_response]}),
+                httpx.AsyncClient(limits=limits, event_hooks={'response': [rate_limiter.aon_response]}),
+            )
+            logger.info(f"Create HTTP clients of '{key_label(provider, api_key)}' ({base_url}): {limits}")
+
+        return _HTTP_CLIENTS[key]
+
+
+def get_chat_model(provider: str, base_url: str, api_key: str, model_name: str, temperature: float = None) \
+        -> ChatOpenAI:
+    """Get the chat model of a (provider, base URL, API key, model) key, shared by all agents, sessions and rebuilds.
+    Agents bind their own tools to it.
+    """
+    key = (provider, base_url, api_key, model_name, temperature)
+    with _LOCK:
+        if key not in _CHAT_MODELS:
+            http_client, http_async_client = get_http_clients(provider, base_url, api_key)
+            _CHAT_MODELS[key] = ChatOpenAI(
+                openai_api_base=base_url,
+                model=model_name,
+                openai_api_key=api_key,
+                temperature=temperature,
+                rate_limiter=get_rate_limiter(provider, api_key),
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+            logger.info(f"Create chat model '{model_name}' of '{key_label(provider, api_key)}'")
+
+        return _CHAT_MODELS[key]
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the response cache shared by all agents, None if it is disabled"""
+    global _RESPONSE_CACHE
+
+    with _LOCK:
+        if _RESPONSE_CACHE is None and _CONFIG['response_cache']['cache_file']:
+            _RESPONSE_CACHE = ResponseCache(**_CONFIG['response_cache'])
+        return _RESPONSE_CACHE
@@ -7,6 +7,9 @@ import glob
 from .constants import *
 from .exception import *
 from .file import *
+from .image import *
+from .patch import *
+from .process import *
 from .types import *
 
 
@@ -18,9 +18,21 @@ DEFAULT_CAMERA_SETTING_FILE = 'src/camera/prepare_cam_data.py'
 DEFAULT_CAPTURE_IMAGE_FILE = 'src/camera/capture_image.py'
 """"""
 
+DEFAULT_SCENE_SUMMARY_SCRIPT_FILE = 'src/camera/export_scene_summary.py'
+""""""
+
+SCENE_SUMMARY_FILE = 'scene_summary.json'
+"""Name of the scene summary written next to the rendered images"""
+
+DEFAULT_REPAIR_TEMPLATE_FILE = 'templates/prompt/repair.yaml'
+"""Prompt repairing an output which does not follow the output schema"""
+
 ANCHOR_FILE = 'assets/blender_script/anchor.py'
 """"""
 
+DEFAULT_RENDER_PROFILE = {'resolution_x': 1920, 'resolution_y': 1024}
+"""Render settings filled in the camera setting file, the engine of the scene is kept"""
+
 __all__ = [
     "ASSETS_DIR",
     "SAVE_CRITIC_DIR",
@@ -28,5 +40,9 @@ __all__ = [
     "DEFAULT_CAMERA_SETTING_FILE",
     "DEFAULT_CAMERA_TEMPLATE_FILE",
     "DEFAULT_CAPTURE_IMAGE_FILE",
-    "ANCHOR_FILE"
+    "DEFAULT_SCENE_SUMMARY_SCRIPT_FILE",
+    "SCENE_SUMMARY_FILE",
+    "DEFAULT_REPAIR_TEMPLATE_FILE",
+    "ANCHOR_FILE",
+    "DEFAULT_RENDER_PROFILE"
 ]
@@ -14,7 +14,12 @@ __all__ = [
     "UserTerminated",
     "NotReturnStructuredOutput",
     "ReinvokeChat",
-    "CanNotParseJsonString"
+    "CanNotParseJsonString",
+    "StructuredOutputError",
+    "PatchNotApplied",
+    "InvalidEdit",
+    "ExecutorError",
+    "WorkerNotAvailable"
 ]
 
 
@@ -58,9 +63,29 @@ class CanNotParseJsonString(BreakGraphOperation):
     ...
 
 
+class StructuredOutputError(BreakGraphOperation):
+    ...
+
+
 class ReinvokeChat(KeyError, ValueError):
     ...
 
 
 class NotReturnStructuredOutput(ReinvokeChat):
     ...
+
+
+class PatchNotApplied(ValueError):
+    ...
+
+
+class InvalidEdit(ValueError):
+    ...
+
+
+class ExecutorError(Exception):
+    ...
+
+
+class WorkerNotAvailable(ExecutorError):
+    ...
@@ -5,11 +5,22 @@
 import os
 import subprocess
 import base64
+import time
 import yaml
 from pathlib import Path
 
+from .process import (
+    POLL_INTERVAL,
+    TRACEBACK_GRACE,
+    OutputCapture,
+    exceeded_limits,
+    kill_process_tree,
+    limit_error
+)
+
 __all__ = [
     "load_image_content",
+    "is_image_complete",
     "load_prompt_template_file",
     "execute_file",
     "write_script"
@@ -21,18 +32,82 @@ def load_image_content(image_path: str):
         return base64.b64encode(f.read()).decode("utf-8")
 
 
-def execute_file(script_path: str):
+def is_image_complete(image_path: str) -> bool:
+    """Whether a PNG file has been written completely, i.e. it ends with the IEND chunk"""
+    try:
+        with open(image_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < 12:
+                return False
+            f.seek(-12, os.SEEK_END)
+            return f.read() == b'\x00\x00\x00\x00IEND\xaeB`\x82'
+    except OSError:
+        return False
+
+
+def execute_file(
+        script_path: str,
+        cwd: str = None,
+        python: str = None,
+        timeout: float = None,
+        max_rss_mb: float = None,
+        stop_on_traceback: bool = False,
+        max_output_bytes: int = None,
+):
+    """Execute a script file in a fresh process
+
+    stdout and stderr are read incrementally while the process runs.
+
+    Args:
+        script_path (str): File of script
+        cwd (str): Working directory of the process
+        python (str): The interpreter. Default to ``python``
+        timeout (float): Wall-clock limit in seconds, no limit if None
+        max_rss_mb (float): Resident memory limit of the process tree in MB, no limit if None
+        stop_on_traceback (bool): Stop the process as soon as a complete traceback is written to stderr
+        max_output_bytes (int): Keep at most this tail of stdout and stderr each, no limit if None
+
+    Returns: dict
+        ``{"error": <stderr>, "stdout": <stdout>, "returncode": <int>, "killed": None | 'timeout' | 'memory'}``
+    """
     process = subprocess.Popen(
-        args=['python', script_path],
+        args=[python or 'python', os.path.abspath(script_path)],
+        cwd=cwd,
         shell=False,
         restore_signals=True,
+        start_new_session=True,
         text=True,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         universal_newlines=True
     )
-    stdout, stderr = process.communicate()
-    result = {"error": stderr, 'stdout': stdout, 'returncode': process.returncode}
+
+    stdout_capture = OutputCapture(process.stdout, max_bytes=max_output_bytes)
+    stderr_capture = OutputCapture(process.stderr, max_bytes=max_output_bytes, detect_traceback=stop_on_traceback)
+
+    start = time.perf_counter()
+    killed = None
+    traceback_at = None
+    while True:
+        try:
+            process.wait(timeout=POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            killed = exceeded_limits(process.pid, start, timeout=timeout, max_rss_mb=max_rss_mb)
+            if killed:
+                kill_process_tree(process)
+                break
+            if stderr_capture.traceback_done.is_set():
+                traceback_at = traceback_at or time.perf_counter()
+                if time.perf_counter() - traceback_at > TRACEBACK_GRACE:
+                    kill_process_tree(process)
+                    break
+    process.wait()
+
+    stdout, stderr = stdout_capture.value(), stderr_capture.value()
+    if killed:
+        stderr += limit_error(killed, timeout=timeout, max_rss_mb=max_rss_mb)
+    result = {"error": stderr, 'stdout': stdout, 'returncode': process.returncode, 'killed': killed}
 
     process.terminate()
     process.kill()
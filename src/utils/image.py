@@ -0,0 +1,111 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import base64
+import io
+import os
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+__all__ = [
+    "IMAGE_PAYLOAD_CACHE_SIZE",
+    "load_image_payload",
+    "image_diff",
+]
+
+IMAGE_PAYLOAD_CACHE_SIZE = 64
+"""Number of encoded images kept in memory"""
+
+_MIME_TYPES = {
+    'PNG': 'image/png',
+    'JPEG': 'image/jpeg',
+    'WEBP': 'image/webp',
+}
+
+
+def load_image_payload(
+        image_path: str,
+        max_side: int = None,
+        format: str = None,
+        quality: int = None,
+) -> str:
+    """Prepare an image to send to a vision model, as a data URL
+
+    The image is downscaled to ``max_side`` and re-encoded to ``format``. The payload is memoized by
+    (path, mtime, settings), the same image is encoded only once across calls and attempts.
+
+    Args:
+        image_path (str): Image file
+        max_side (int): Max width/height in pixels, keep the aspect ratio. None keeps the size
+        format (str): ``PNG``, ``JPEG`` or ``WEBP``. None sends the file as it is
+        quality (int): Quality of ``JPEG``/``WEBP`` (1-100)
+
+    Returns: str
+        ``data:<mime type>;base64,<content>``
+    """
+    image_path = os.path.abspath(image_path)
+    stat = os.stat(image_path)
+    return _encode_image(image_path, stat.st_mtime_ns, stat.st_size, max_side, format and format.upper(), quality)
+
+
+@lru_cache(maxsize=IMAGE_PAYLOAD_CACHE_SIZE)
+def _encode_image(image_path: str, mtime_ns: int, size: int, max_side: int, format: str, quality: int) -> str:
+    # ``mtime_ns`` and ``size`` are only part of the key, a rewritten file is encoded again
+    if not max_side and not format:
+        with open(image_path, 'rb') as f:
+            content = f.read()
+        return f"data:{_mime_type(image_path)};base64,{base64.b64encode(content).decode('utf-8')}"
+
+    with Image.open(image_path) as image:
+        format = format or image.format or 'PNG'
+        if max_side and max(image.size) > max_side:
+            image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        if format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            # no alpha channel in JPEG
+            image = image.convert('RGB')
+
+        options = {'quality': quality} if quality and format in ('JPEG', 'WEBP') else {}
+        buffer = io.BytesIO()
+        image.save(buffer, format=format, **options)
+
+    return f"data:{_MIME_TYPES.get(format, 'image/png')};base64,{base64.b64encode(buffer.getvalue()).decode('utf-8')}"
+
+
+def image_diff(image_path: str, other_image_path: str, size: int = 256) -> dict:
+    """Compare two images without any model
+
+    Args:
+        image_path (str): Image file
+        other_image_path (str): The other image file
+        size (int): Both images are compared at ``size`` x ``size`` pixels
+
+    Returns: dict
+        ``{"mad": <mean absolute difference of gray levels, 0-1>, "hash_distance": <bits differing in 64-bit
+        average hashes>}``
+    """
+    pixels = _gray_pixels(image_path, size)
+    other_pixels = _gray_pixels(other_image_path, size)
+    mad = float(np.abs(pixels - other_pixels).mean() / 255.)
+    hash_distance = int(np.count_nonzero(_average_hash(pixels) != _average_hash(other_pixels)))
+
+    return {'mad': round(mad, 6), 'hash_distance': hash_distance}
+
+
+def _gray_pixels(image_path: str, size: int) -> np.ndarray:
+    with Image.open(image_path) as image:
+        return np.asarray(image.convert('L').resize((size, size), Image.Resampling.BILINEAR), dtype=np.float32)
+
+
+def _average_hash(pixels: np.ndarray, hash_size: int = 8) -> np.ndarray:
+    # mean of blocks, ``pixels`` is a square whose side is a multiple of ``hash_size``
+    side = pixels.shape[0] // hash_size * hash_size
+    blocks = pixels[:side, :side].reshape(hash_size, side // hash_size, hash_size, side // hash_size).mean(axis=(1, 3))
+    return blocks > blocks.mean()
+
+
+def _mime_type(image_path: str) -> str:
+    extension = os.path.splitext(image_path)[1].lstrip('.').upper()
+    return _MIME_TYPES.get({'JPG': 'JPEG'}.get(extension, extension), 'image/png')
@@ -0,0 +1,121 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import difflib
+from typing import Mapping, Sequence
+
+from .exception import InvalidEdit, PatchNotApplied
+
+__all__ = [
+    "apply_edits",
+]
+
+
+def apply_edits(script: str, edits: Sequence[dict], min_similarity: float = 0.85) -> tuple[str, int]:
+    """Apply search/replace edits to a script, in order
+
+    The ``search`` block of an edit is replaced where it occurs exactly, otherwise where the lines of the script are the
+    most similar to it (ignoring indentation), if their similarity reaches ``min_similarity``. The ``replace`` block is
+    re-indented to the matched lines. An empty ``search`` block appends ``replace`` to the script.
+
+    Args:
+        script (str): The script to edit
+        edits (Sequence[dict]): Edits, ``{'search': ..., 'replace': ...}``
+        min_similarity (float): Min similarity (``difflib`` ratio) of fuzzy matched lines
+
+    Returns:
+        The edited script and the number of fuzzy matched edits
+    Raises:
+        InvalidEdit: Edits are not a sequence of search/replace pairs of strings
+        PatchNotApplied: An edit matches nowhere, or several places equally
+    """
+    _check_edits(edits)
+    n_fuzzy = 0
+    for i, edit in enumerate(edits):
+        search, replace = edit.get('search') or '', edit.get('replace') or ''
+        if not search.strip():
+            script = script.rstrip('\n') + '\n' + replace
+            continue
+
+        n_occurrences = script.count(search)
+        if n_occurrences == 1:
+            script = script.replace(search, replace)
+            continue
+        if n_occurrences > 1:
+            raise PatchNotApplied(f"Edit {i} matches {n_occurrences} places of the script")
+
+        script = _replace_similar_lines(script, search, replace, min_similarity, i)
+        n_fuzzy += 1
+
+    return script, n_fuzzy
+
+
+def _check_edits(edits: Sequence[dict]):
+    if isinstance(edits, (str, bytes)) or not isinstance(edits, Sequence):
+        raise InvalidEdit(f"Edits must be a list, not {type(edits).__name__}")
+    for i, edit in enumerate(edits):
+        if not isinstance(edit, Mapping):
+            raise InvalidEdit(f"Edit {i} must be a search/replace pair, not {type(edit).__name__}")
+        for key in ('search', 'replace'):
+            if not isinstance(edit.get(key) or '', str):
+                raise InvalidEdit(f"'{key}' of edit {i} must be a string, not {type(edit[key]).__name__}")
+
+
+def _replace_similar_lines(script: str, search: str, replace: str, min_similarity: float, i: int) -> str:
+    lines = script.splitlines(keepends=True)
+    search_lines = search.strip('\n').splitlines()
+    n = len(search_lines)
+    target = _normalize(search_lines)
+
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2(target)
+    best, best_starts = 0., []
+    for start in range(len(lines) - n + 1):
+        matcher.set_seq1(_normalize(lines[start:start + n]))
+        # cheap upper bounds first
+        if matcher.real_quick_ratio() < max(best, min_similarity) or matcher.quick_ratio() < max(best, min_similarity):
+            continue
+        ratio = matcher.ratio()
+        if ratio > best:
+            best, best_starts = ratio, [start]
+        elif ratio == best:
+            best_starts.append(start)
+
+    if not best_starts:
+        raise PatchNotApplied(f"Edit {i} matches no lines of the script (similarity < {min_similarity})")
+    # overlapping windows around the same place are not ambiguous
+    if best_starts[-1] - best_starts[0] >= n:
+        raise PatchNotApplied(f"Edit {i} matches {len(best_starts)} places of the script equally")
+
+    start = best_starts[0]
+    matched = lines[start:start + n]
+    replace = _reindent(replace, _indent(search_lines), _indent(matched))
+    if replace and matched[-1].endswith('\n') and not replace.endswith('\n'):
+        replace += '\n'
+
+    return ''.join(lines[:start]) + replace + ''.join(lines[start + n:])
+
+
+def _normalize(lines: Sequence[str]) -> str:
+    return '\n'.join(line.strip() for line in lines)
+
+
+def _indent(lines: Sequence[str]) -> str:
+    """Indentation of the first non-blank line"""
+    for line in lines:
+        if line.strip():
+            return line[:len(line) - len(line.lstrip())]
+    return ''
+
+
+def _reindent(text: str, old_indent: str, new_indent: str) -> str:
+    if old_indent == new_indent:
+        return text
+
+    reindented = []
+    for line in text.splitlines(keepends=True):
+        if line.strip():
+            line = new_indent + (line[len(old_indent):] if line.startswith(old_indent) else line.lstrip())
+        reindented.append(line)
+    return ''.join(reindented)
@@ -0,0 +1,169 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Optional, IO
+
+__all__ = [
+    "POLL_INTERVAL",
+    "TRACEBACK_GRACE",
+    "OutputCapture",
+    "cap_output",
+    "process_tree_rss",
+    "exceeded_limits",
+    "kill_process_tree",
+    "limit_error",
+]
+
+POLL_INTERVAL = 0.2
+"""Seconds between two checks of running limits"""
+
+TRACEBACK_GRACE = 0.5
+"""Seconds to wait after a complete traceback before stopping the process, letting chained tracebacks be written"""
+
+TRACEBACK_HEADER = 'Traceback (most recent call last):'
+
+
+def cap_output(text: str, max_bytes: int = None) -> str:
+    """Keep at most ``max_bytes`` of the tail of an output, where errors are"""
+    if not max_bytes or len(text.encode()) <= max_bytes:
+        return text
+    tail = text.encode()[-max_bytes:].decode(errors='ignore')
+    return f"[... {len(text.encode()) - max_bytes} bytes truncated ...]\n{tail}"
+
+
+class OutputCapture:
+    """The Output Capture class
+
+    Read a stream of a running process incrementally in a background thread, keeping at most
+    ``max_bytes`` of the tail. When ``detect_traceback`` is set, ``traceback_done`` is set as soon as
+    a complete Python traceback (up to the exception line) has been written.
+    """
+
+    def __init__(self, stream: IO[str], max_bytes: int = None, detect_traceback: bool = False):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.detect_traceback = detect_traceback
+        self.traceback_done = threading.Event()
+
+        self._chunks = deque()
+        self._size = 0
+        self._truncated = 0
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        in_traceback = False
+        # bounded reads, a line without newline could be huge
+        for chunk in iter(lambda: self.stream.readline(8192), ''):
+            self._append(chunk)
+            if not self.detect_traceback:
+                continue
+            if chunk.startswith(TRACEBACK_HEADER):
+                in_traceback = True
+            elif in_traceback and chunk.strip() and not chunk[0].isspace():
+                # the exception line, e.g. "TypeError: ..."
+                in_traceback = False
+                self.traceback_done.set()
+        self.stream.close()
+
+    def _append(self, chunk: str):
+        size = len(chunk.encode())
+        self._chunks.append((chunk, size))
+        self._size += size
+        while self.max_bytes and self._size > self.max_bytes and len(self._chunks) > 1:
+            _, dropped = self._chunks.popleft()
+            self._size -= dropped
+            self._truncated += dropped
+
+    def value(self) -> str:
+        """Wait for the end of the stream and return the kept output"""
+        self._thread.join()
+        text = ''.join(chunk for chunk, _ in self._chunks)
+        if self._truncated:
+            text = f"[... {self._truncated} bytes truncated ...]\n{text}"
+        return text
+
+
+def _children_map() -> dict[int, list[int]]:
+    children = dict()
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', mode='r') as f:
+                # the name of command could contain spaces, so split after its closing bracket
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    return children
+
+
+def _rss(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status', mode='r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def process_tree_rss(pid: int) -> int:
+    """Resident memory (bytes) of a process and all its descendants. Always 0 where ``/proc`` is missing"""
+    if not os.path.isdir('/proc'):
+        return 0
+
+    children = _children_map()
+    total, stack = 0, [pid, ]
+    while stack:
+        p = stack.pop()
+        total += _rss(p)
+        stack.extend(children.get(p, []))
+
+    return total
+
+
+def exceeded_limits(pid: int, start: float, timeout: float = None, max_rss_mb: float = None) -> Optional[str]:
+    """Check limits of a running process
+
+    Args:
+        pid (int): ID of the process
+        start (float): ``time.perf_counter()`` when the job started
+        timeout (float): Wall-clock limit in seconds
+        max_rss_mb (float): Resident memory limit of the process tree in MB
+
+    Returns: None | str
+        ``'timeout'`` or ``'memory'`` if the respective limit is exceeded
+    """
+    if timeout and time.perf_counter() - start > timeout:
+        return 'timeout'
+    if max_rss_mb and process_tree_rss(pid) > max_rss_mb * 1024 ** 2:
+        return 'memory'
+    return None
+
+
+def kill_process_tree(process: subprocess.Popen):
+    """Kill a process started with ``start_new_session=True`` together with its descendants"""
+    try:
+        os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        process.kill()
+
+
+def limit_error(killed: str, timeout: float = None, max_rss_mb: float = None) -> str:
+    """Error message of a killed job, readable by both the retriever and the coding agent"""
+    if killed == 'timeout':
+        return (f"ExecutionTimeout: the script was killed after exceeding the wall-clock limit of {timeout}s. "
+                f"Look for infinite loops, or too heavy geometry (e.g. huge subdivision levels, array counts)")
+    return (f"ExecutionMemoryExceeded: the script was killed after exceeding the memory limit of {max_rss_mb}MB. "
+            f"Look for too heavy geometry (e.g. huge subdivision levels, array counts, vertex counts)")
@@ -0,0 +1,85 @@
+#
+#  Copyright (c) 2025
+#  Minh NGUYEN <vnguyen9@lakeheadu.ca>
+#
+import pytest
+
+from src.utils.exception import InvalidEdit, PatchNotApplied
+from src.utils.patch import apply_edits
+
+SCRIPT = '''import bpy
+
+
+def create_model():
+    """Create the body"""
+    bpy.ops.mesh.primitive_cube_add(size=2)
+    body = bpy.context.active_object
+    body.name = "Body"
+    return body
+
+
+def setup_lighting():
+    bpy.ops.object.light_add(type='AREA', location=(4, -4, 6))
+'''
+
+
+def test_exact_match():
+    script, n_fuzzy = apply_edits(SCRIPT, [{
+        'search': "    bpy.ops.mesh.primitive_cube_add(size=2)\n",
+        'replace': "    bpy.ops.mesh.primitive_cube_add(size=3)\n",
+    }])
+
+    assert n_fuzzy == 0
+    assert "primitive_cube_add(size=3)" in script
+    assert "primitive_cube_add(size=2)" not in script
+
+
+def test_fuzzy_match_reindents_replace():
+    # the model dropped the indentation of the function body and changed a comment
+    script, n_fuzzy = apply_edits(SCRIPT, [{
+        'search': 'bpy.ops.mesh.primitive_cube_add(size=2)\nbody = bpy.context.active_object\nbody.name = "body"',
+        'replace': 'bpy.ops.mesh.primitive_uv_sphere_add(radius=1)\nbody = bpy.context.active_object\n'
+                   'body.name = "Body"',
+    }])
+
+    assert n_fuzzy == 1
+    assert ('    bpy.ops.mesh.primitive_uv_sphere_add(radius=1)\n'
+            '    body = bpy.context.active_object\n'
+            '    body.name = "Body"\n'
+            '    return body\n') in script
+    assert "primitive_cube_add" not in script
+
+
+def test_search_occurring_twice_is_rejected():
+    script = SCRIPT + "\n\ndef create_ground_plane():\n    bpy.ops.mesh.primitive_cube_add(size=2)\n"
+
+    with pytest.raises(PatchNotApplied, match="2 places"):
+        apply_edits(script, [{
+            'search': "    bpy.ops.mesh.primitive_cube_add(size=2)\n",
+            'replace': "    bpy.ops.mesh.primitive_cube_add(size=3)\n",
+        }])
+
+
+def test_search_matching_nowhere_is_rejected():
+    with pytest.raises(PatchNotApplied, match="no lines"):
+        apply_edits(SCRIPT, [{
+            'search': "camera = bpy.data.cameras.new('Camera')\nscene.camera = camera",
+            'replace': "",
+        }])
+
+
+@pytest.mark.parametrize('edits', [
+    "search: x\nreplace: y",
+    ["bpy.ops.mesh.primitive_cube_add(size=2)"],
+    [{'search': ["bpy.ops.mesh.primitive_cube_add(size=2)"], 'replace': ""}],
+])
+def test_malformed_edits_are_rejected(edits):
+    with pytest.raises(InvalidEdit):
+        apply_edits(SCRIPT, edits)
+
+
+def test_empty_search_appends():
+    script, n_fuzzy = apply_edits(SCRIPT, [{'search': '', 'replace': 'setup_lighting()\n'}])
+
+    assert n_fuzzy == 0
+    assert script.endswith("location=(4, -4, 6))\nsetup_lighting()\n")